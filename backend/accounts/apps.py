@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from core.metrics import registry
+        from .cache import user_cache
+        from .history import login_recorder
+        from .revocation import revocations
+
+        registry.register_collector(user_cache.metrics)
+        registry.register_collector(revocations.metrics)
+        registry.register_collector(login_recorder.metrics)
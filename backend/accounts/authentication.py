@@ -0,0 +1,53 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import auth_versions, user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that serves the user from ``user_cache``.
+
+    A cached user is only used while the user's auth version is unchanged,
+    so password changes, profile updates and deactivation are seen on the
+    next request; in the steady state authentication makes no queries.
+    Without a shared cache for the versions another process's change would
+    go unseen, so the user is read from the database on every request.
+    Tokens issued before the user's ``sessions_revoked_at`` are rejected.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+        if auth_versions.shared:
+            version = auth_versions.get(user_id)
+            user = user_cache.get(user_id, version)
+        else:
+            # Another process's bump would go unseen, so always read the row
+            version = user = None
+        if user is None:
+            # Loads the row and runs simplejwt's checks; failures aren't cached
+            user = super().get_user(validated_token)
+            if version is not None:
+                user_cache.set(user_id, version, user)
+        else:
+            # The checks again, against the cached row
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+            if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        # Tokens issued before "log out everywhere"; iat has whole seconds,
+        # so one issued in that same second is rejected too
+        if user.sessions_revoked_at is not None and validated_token.get('iat', 0) <= int(
+            user.sessions_revoked_at.timestamp()
+        ):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+        return user
@@ -0,0 +1,102 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class AuthVersions:
+    """Per-user auth versions, kept in a shared cache.
+
+    A version is an opaque timestamp replaced whenever the user row
+    changes (``User.save``/``delete`` call ``bump``), so cached copies of
+    the user stop matching. A missing key -- never set, expired or evicted
+    -- just starts a new version, which costs one reload from the database.
+    With a per-process backend a bump is only seen by the process that made
+    it, so ``CachedJWTAuthentication`` doesn't use cached users then.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def shared(self):
+        """Whether every process sees the versions (as ``VersionedCache.shared``)."""
+        return not isinstance(self.backend, LocMemCache)
+
+    def get(self, user_id):
+        key = f'auth_version:{user_id}'
+        version = self.backend.get(key)
+        if version is None:
+            version = time.time_ns()
+            # add(), not set(): a concurrent bump wins
+            self.backend.add(key, version)
+        return version
+
+    def bump(self, user_id):
+        self.backend.set(f'auth_version:{user_id}', time.time_ns())
+
+
+class UserCache:
+    """Per-process LRU of authenticated users.
+
+    Holds at most ``max_size`` users, each for at most ``ttl`` seconds, and
+    only returns one while the user's auth version is still the one it
+    was stored under. Callers get their own copy of the instance.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0}
+
+    def get(self, user_id, version):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version or entry[1] <= now:
+                self._counts['misses'] += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._counts['hits'] += 1
+            user = entry[2]
+        return copy.copy(user)
+
+    def set(self, user_id, version, user):
+        entry = (version, time.monotonic() + self.ttl, copy.copy(user))
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counts = {'hits': 0, 'misses': 0}
+
+    def metrics(self):
+        """Hit/miss counts as a collector for ``core.metrics.registry``."""
+        with self._lock:
+            samples = [({'outcome': outcome}, count) for outcome, count in self._counts.items()]
+            size = len(self._entries)
+        return [
+            ('auth_user_cache_requests_total', 'counter', 'Authenticated user cache lookups by outcome', samples),
+            ('auth_user_cache_size', 'gauge', 'Users held in the authenticated user cache', [({}, size)]),
+        ]
+
+
+auth_versions = AuthVersions(getattr(settings, 'API_CACHE_ALIAS', 'default'))
+user_cache = UserCache(
+    getattr(settings, 'AUTH_USER_CACHE_SIZE', 10000),
+    getattr(settings, 'AUTH_USER_CACHE_TTL', 300),
+)
@@ -0,0 +1,132 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import LoginHistory
+
+logger = logging.getLogger(__name__)
+
+
+class LoginRecorder:
+    """Buffers login and refresh attempts and writes them to
+    ``LoginHistory`` in batches.
+
+    ``record`` only appends to an in-memory list; a background thread
+    flushes it with one ``bulk_create`` once ``batch_size`` attempts are
+    waiting or ``flush_interval`` seconds after the first one, and again at
+    exit. Attempts are named by user id or, for failed logins, by the
+    submitted username; a flush resolves both in one query and skips
+    attempts that match no user. When ``max_buffer`` attempts are already
+    waiting (the database is down or slow) new ones are dropped and counted
+    rather than holding memory or the request.
+    """
+
+    def __init__(self, batch_size, flush_interval, max_buffer):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._counts = {'recorded': 0, 'written': 0, 'unmatched': 0, 'dropped': 0}
+
+    def record(self, request, event, success, user_id=None, username=None):
+        entry = {
+            'user_id': user_id,
+            'username': username,
+            'timestamp': timezone.now(),
+            'event': event,
+            'success': success,
+            'ip_address': request.META.get('REMOTE_ADDR') or None,
+            'user_agent': request.headers.get('User-Agent', ''),
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self._counts['dropped'] += 1
+                return
+            self._buffer.append(entry)
+            self._counts['recorded'] += 1
+            full = len(self._buffer) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='login-history', daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # _write handles database errors; anything else must not end the thread
+                logger.exception('Could not flush login history')
+            finally:
+                # This thread's connection sits idle until the next flush
+                connection.close()
+
+    def flush(self):
+        """Write every buffered attempt now; returns the number of rows."""
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        written = 0
+        for start in range(0, len(entries), self.batch_size):
+            written += self._write(entries[start:start + self.batch_size])
+        return written
+
+    def _write(self, entries):
+        User = get_user_model()
+        username_field = User.USERNAME_FIELD
+        user_ids = {entry['user_id'] for entry in entries if entry['user_id'] is not None}
+        usernames = {entry['username'] for entry in entries if entry['user_id'] is None and entry['username']}
+        try:
+            # One query both resolves usernames and drops users deleted since
+            users = User.objects.filter(Q(pk__in=user_ids) | Q(**{f'{username_field}__in': usernames}))
+            known = {}
+            for pk, username in users.values_list('pk', username_field):
+                known[str(pk)] = pk
+                known[username] = pk
+            rows = []
+            for entry in entries:
+                pk = known.get(str(entry['user_id']) if entry['user_id'] is not None else entry['username'])
+                if pk is not None:
+                    rows.append(LoginHistory(
+                        user_id=pk, timestamp=entry['timestamp'], event=entry['event'], success=entry['success'],
+                        ip_address=entry['ip_address'], user_agent=entry['user_agent'],
+                    ))
+            LoginHistory.objects.bulk_create(rows)
+        except DatabaseError:
+            logger.exception('Could not write %d login history entries', len(entries))
+            with self._lock:
+                self._counts['dropped'] += len(entries)
+            return 0
+        with self._lock:
+            self._counts['written'] += len(rows)
+            self._counts['unmatched'] += len(entries) - len(rows)
+        return len(rows)
+
+    def metrics(self):
+        """Attempt counts as a collector for ``core.metrics.registry``."""
+        with self._lock:
+            samples = [({'outcome': outcome}, count) for outcome, count in self._counts.items()]
+            size = len(self._buffer)
+        return [
+            ('login_history_entries_total', 'counter', 'Login history entries by outcome', samples),
+            ('login_history_buffer_size', 'gauge', 'Login history entries waiting to be written', [({}, size)]),
+        ]
+
+
+login_recorder = LoginRecorder(
+    batch_size=getattr(settings, 'LOGIN_HISTORY_BATCH_SIZE', 100),
+    flush_interval=getattr(settings, 'LOGIN_HISTORY_FLUSH_INTERVAL', 5),
+    max_buffer=getattr(settings, 'LOGIN_HISTORY_MAX_BUFFER', 10000),
+)
+atexit.register(login_recorder.flush)
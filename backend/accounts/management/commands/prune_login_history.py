@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import LoginHistory
+
+
+class Command(BaseCommand):
+    help = 'Delete login history entries older than the retention period, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'LOGIN_HISTORY_RETENTION_DAYS', 90),
+            help='Keep entries this many days'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per query')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted = 0
+        while True:
+            # Short deletes keep locks brief on a large table
+            batch = list(LoginHistory.objects.filter(timestamp__lt=cutoff)
+                         .order_by('pk').values_list('pk', flat=True)[:options['batch_size']])
+            if not batch:
+                break
+            deleted += LoginHistory.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} login history entries older than {cutoff.isoformat()}'))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.revocation import revocations
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked refresh tokens that have expired; they can no longer be used anyway'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'TOKEN_REVOCATION_PURGE_BATCH_SIZE', 1000),
+            help='Rows deleted per query'
+        )
+
+    def handle(self, *args, **options):
+        deleted = revocations.purge_expired(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired revoked token(s)'))
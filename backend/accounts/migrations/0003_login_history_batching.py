@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_token_revocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loginhistory',
+            name='event',
+            field=models.CharField(choices=[('login', 'Login'), ('refresh', 'Token refresh')], default='login', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='loginhistory',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='loginhistory',
+            index=models.Index(fields=['user', 'timestamp'], name='loginhistory_user_time_idx'),
+        ),
+    ]
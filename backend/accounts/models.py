@@ -1,7 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .cache import auth_versions
+
 class User(AbstractUser):
     """Custom user model for authentication"""
     email = models.EmailField(_('email address'), unique=True)
@@ -9,6 +12,8 @@ class User(AbstractUser):
     verification_token = models.CharField(max_length=100, blank=True, null=True)
     reset_password_token = models.CharField(max_length=100, blank=True, null=True)
     token_expiry = models.DateTimeField(null=True, blank=True)
+    # Tokens issued at or before this time are revoked ("log out everywhere")
+    sessions_revoked_at = models.DateTimeField(null=True, blank=True)
     
     # Make email the required field for login instead of username
     USERNAME_FIELD = 'email'
@@ -21,10 +26,34 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Authentication caches users by auth version; any change to the
+        # row (password, is_active, profile) must reach the next request.
+        # QuerySet.update() skips this, so bump after bulk changes too.
+        self.bump_auth_version()
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(lambda: auth_versions.bump(user_id))
+        return result
+
+    def bump_auth_version(self):
+        user_id = self.pk
+        transaction.on_commit(lambda: auth_versions.bump(user_id))
+
 class LoginHistory(models.Model):
-    """Track user login attempts"""
+    """Track user login attempts (written in batches by accounts.history)"""
+    EVENT_CHOICES = [
+        ('login', 'Login'),
+        ('refresh', 'Token refresh'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='login_history')
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: buffered rows keep the time of the attempt
+    timestamp = models.DateTimeField(default=timezone.now)
+    event = models.CharField(max_length=10, choices=EVENT_CHOICES, default='login')
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     success = models.BooleanField(default=False)
@@ -33,6 +62,27 @@ class LoginHistory(models.Model):
         app_label = 'accounts'
         verbose_name_plural = "Login Histories"
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['user', 'timestamp'], name='loginhistory_user_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.timestamp}"
+
+class RevokedToken(models.Model):
+    """A refresh token that may no longer be used, kept until it expires.
+    Checked through ``accounts.revocation.revocations``."""
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='revoked_tokens')
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = 'accounts'
+        indexes = [
+            models.Index(fields=['expires_at'], name='revokedtoken_expires_idx'),
+            models.Index(fields=['revoked_at'], name='revokedtoken_revoked_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.jti} (expires {self.expires_at})"
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Rows committed up to this long after their revoked_at are still picked up
+# by an incremental sync
+SYNC_MARGIN = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Fixed-size set membership with false positives but no false negatives.
+
+    Sized for ``capacity`` members at ``error_rate`` false positives; past
+    that the rate climbs, so the owner rebuilds it bigger.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, value):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        new = False
+        for position in self.positions(value):
+            byte, bit = position >> 3, 1 << (position & 7)
+            new = new or not self.bits[byte] & bit
+            self.bits[byte] |= bit
+        # Re-adding a member (or a false positive) doesn't count
+        self.count += new
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(value))
+
+
+class RevocationStore:
+    """Revoked refresh tokens: ``RevokedToken`` rows behind a per-process
+    Bloom filter of their JTIs.
+
+    ``is_revoked`` answers the common case -- a token that was never
+    revoked -- from memory; only a filter hit is confirmed in the database.
+    ``revoke`` adds to this process's filter directly and, on commit,
+    increments a generation counter in the cache. At most every
+    ``sync_interval`` seconds each process checks that counter and loads
+    the rows revoked since its last load if it moved past the value the
+    process published itself; with a per-process cache backend the counter
+    isn't visible to other processes, so they load every interval instead.
+    Either way another process sees a revocation within ``sync_interval``.
+    A background thread purges expired rows every ``purge_interval``
+    seconds and rebuilds the filter without them.
+    """
+
+    def __init__(self, alias, capacity, error_rate, sync_interval, purge_interval, purge_batch_size):
+        self.alias = alias
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.purge_interval = purge_interval
+        self.purge_batch_size = purge_batch_size
+        self._lock = threading.Lock()
+        self._filter = None
+        self._generation = None
+        self._loaded_until = None
+        self._next_sync = 0
+        self._purger = None
+        self._counts = {'clear': 0, 'maybe': 0, 'revoked': 0}
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def shared(self):
+        """Whether other processes see the generation counter."""
+        return not isinstance(self.backend, LocMemCache)
+
+    def generation(self):
+        return self.backend.get('revocation_generation')
+
+    def bump(self):
+        if not self.shared:
+            return
+        try:
+            generation = self.backend.incr('revocation_generation')
+            previous = generation - 1
+        except ValueError:
+            # Missing or evicted; restart from a value no process has seen
+            generation, previous = time.time_ns(), None
+            if not self.backend.add('revocation_generation', generation, None):
+                generation = self.backend.incr('revocation_generation')
+                previous = generation - 1
+        with self._lock:
+            if self._filter is not None and self._generation == previous:
+                # Nothing but this process's own revocation, already in the filter
+                self._generation = generation
+
+    # Filter
+
+    def sync(self):
+        """Bring the filter up to date with the database if it may be stale."""
+        with self._lock:
+            if self._filter is not None and time.monotonic() < self._next_sync:
+                return
+        shared = self.shared
+        generation = self.generation() if shared else None
+        with self._lock:
+            rebuild = self._filter is None or self._filter.count > self._filter.capacity
+            if not rebuild and shared and generation == self._generation:
+                self._next_sync = time.monotonic() + self.sync_interval
+                return
+            since = None if rebuild else self._loaded_until - SYNC_MARGIN
+            self._load(since)
+            self._generation = generation
+
+    def _load(self, since=None):
+        """Add rows revoked since ``since`` to the filter, or rebuild it from
+        every unexpired row. Called with the lock held."""
+        started = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=started)
+        if since is not None:
+            rows = rows.filter(revoked_at__gte=since)
+        jtis = list(rows.values_list('jti', flat=True))
+        if since is None:
+            self._filter = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            self._filter.add(jti)
+        self._loaded_until = started
+        self._next_sync = time.monotonic() + self.sync_interval
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+    # Queries
+
+    def is_revoked(self, jti):
+        self.sync()
+        with self._lock:
+            maybe = jti in self._filter
+            if not maybe:
+                self._counts['clear'] += 1
+                return False
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        with self._lock:
+            self._counts['revoked' if revoked else 'maybe'] += 1
+        return revoked
+
+    # Writes
+
+    def revoke(self, jti, expires_at, user_id=None):
+        """Revoke one token. Returns False if it already was, so of two
+        concurrent uses of a single-use token only one succeeds."""
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at, user_id=user_id)
+        except IntegrityError:
+            return False
+        self.sync()
+        with self._lock:
+            self._filter.add(jti)
+            if self._purger is None:
+                self._purger = threading.Thread(target=self._run_purger, name='token-revocation-purge', daemon=True)
+                self._purger.start()
+        transaction.on_commit(self.bump)
+        return True
+
+    def revoke_all(self, user):
+        """Revoke every token issued to ``user`` so far ("log out everywhere").
+
+        Nothing is stored per token: ``CachedJWTAuthentication`` rejects
+        access and refresh tokens issued before ``sessions_revoked_at``, and
+        saving the user invalidates its cached copy everywhere.
+        """
+        user.sessions_revoked_at = timezone.now()
+        user.save(update_fields=['sessions_revoked_at'])
+
+    def _run_purger(self):
+        while True:
+            time.sleep(self.purge_interval)
+            try:
+                self.purge_expired()
+            except Exception:
+                logger.exception('Could not purge expired revoked tokens')
+            finally:
+                connection.close()
+
+    def purge_expired(self, batch_size=None):
+        """Delete expired rows in primary-key batches; returns the count."""
+        batch_size = batch_size or self.purge_batch_size
+        now = timezone.now()
+        deleted = 0
+        while True:
+            batch = list(RevokedToken.objects.filter(expires_at__lte=now)
+                         .order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                break
+            deleted += RevokedToken.objects.filter(pk__in=batch).delete()[0]
+        if deleted:
+            # Rebuild without the purged JTIs here rather than on a request
+            with self._lock:
+                self._load()
+        return deleted
+
+    def metrics(self):
+        """Lookup counts as a collector for ``core.metrics.registry``."""
+        with self._lock:
+            samples = [({'outcome': outcome}, count) for outcome, count in self._counts.items()]
+            size = self._filter.count if self._filter is not None else 0
+        return [
+            ('token_revocation_checks_total', 'counter',
+             'Refresh token revocation checks by outcome (maybe = filter false positive)', samples),
+            ('token_revocation_filter_size', 'gauge', 'Revoked JTIs held in the revocation filter', [({}, size)]),
+        ]
+
+
+revocations = RevocationStore(
+    getattr(settings, 'API_CACHE_ALIAS', 'default'),
+    capacity=getattr(settings, 'TOKEN_REVOCATION_FILTER_CAPACITY', 100000),
+    error_rate=getattr(settings, 'TOKEN_REVOCATION_FILTER_ERROR_RATE', 0.001),
+    sync_interval=getattr(settings, 'TOKEN_REVOCATION_SYNC_INTERVAL', 5),
+    purge_interval=getattr(settings, 'TOKEN_REVOCATION_PURGE_INTERVAL', 3600),
+    purge_batch_size=getattr(settings, 'TOKEN_REVOCATION_PURGE_BATCH_SIZE', 1000),
+)
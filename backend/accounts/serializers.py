@@ -1,6 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import CachedJWTAuthentication
 from .models import LoginHistory
+from .tokens import RevocableRefreshToken
 
 User = get_user_model()
 
@@ -32,7 +37,7 @@ class UserSerializer(serializers.ModelSerializer):
 class LoginHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = LoginHistory
-        fields = ['id', 'user', 'timestamp', 'ip_address', 'user_agent', 'success']
+        fields = ['id', 'user', 'timestamp', 'event', 'ip_address', 'user_agent', 'success']
         read_only_fields = ['user', 'timestamp']
 
 class UserUpdateSerializer(serializers.ModelSerializer):
@@ -40,3 +45,26 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         model = User
         fields = ['first_name', 'last_name', 'email']
         read_only_fields = ['email']  # Make email read-only for updates
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """``TokenRefreshSerializer`` whose rotation revokes the old token in
+    ``accounts.revocation`` and whose user check is served by the
+    authenticated user cache, so a refresh normally reads nothing from the
+    database."""
+    token_class = RevocableRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        # Inactive, deleted and logged-out-everywhere users are rejected here
+        self.user = CachedJWTAuthentication().get_user(refresh)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
@@ -1,3 +1,255 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .cache import AuthVersions, user_cache
+from .history import LoginRecorder
+from .models import LoginHistory, RevokedToken
+from .revocation import RevocationStore, revocations
+
+User = get_user_model()
+
+
+def revocation_reads(queries):
+    return [query['sql'] for query in queries
+            if 'accounts_revokedtoken' in query['sql'] and not query['sql'].startswith('INSERT')]
+
+
+class AccountsTestCase(TestCase):
+    """A user and an unauthenticated client; login history is not recorded."""
+
+    def setUp(self):
+        caches['api'].clear()
+        user_cache.clear()
+        revocations.reset()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.client = APIClient()
+        patcher = mock.patch('accounts.views.login_recorder')
+        self.recorder = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        response = self.client.post('/api/accounts/token/', {'email': 'owner@example.com', 'password': 'pw'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def refresh(self, token):
+        return self.client.post('/api/accounts/token/refresh/', {'refresh': token}, format='json')
+
+
+class RevocationTests(AccountsTestCase):
+    def test_rotation_revokes_the_old_refresh_token(self):
+        tokens = self.login()
+        response = self.refresh(tokens['refresh'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()['refresh'], tokens['refresh'])
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+        self.assertEqual(self.refresh(response.json()['refresh']).status_code, 200)
+
+    def test_logout_revokes_the_token(self):
+        tokens = self.login()
+        response = self.client.post('/api/accounts/logout/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+        response = self.client.post('/api/accounts/logout/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_logout_without_a_token_is_rejected(self):
+        for data in ({}, {'refresh': ''}, {'refresh': None}, {'refresh': 123}, {'refresh': ['x']}, []):
+            response = self.client.post('/api/accounts/logout/', data, format='json')
+            self.assertEqual(response.status_code, 400, data)
+        response = self.client.post('/api/accounts/logout/', {'refresh': 'not-a-token'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_logout_all_rejects_earlier_tokens(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get('/api/accounts/profile/').status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post('/api/accounts/logout-all/').status_code, 200)
+        self.assertEqual(self.client.get('/api/accounts/profile/').status_code, 401)
+        self.client.credentials()
+        self.assertEqual(self.refresh(tokens['refresh']).status_code, 401)
+
+    def test_steady_state_refresh_does_not_read_revocations(self):
+        token = self.login()['refresh']
+        token = self.refresh(token).json()['refresh']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(revocation_reads(queries), [])
+
+    def test_purge_deletes_only_expired_rows(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti='expired', expires_at=now - timedelta(minutes=1))
+        RevokedToken.objects.create(jti='live', expires_at=now + timedelta(days=1))
+        out = StringIO()
+        call_command('purge_revoked_tokens', '--batch-size', '1', stdout=out)
+        self.assertIn('Deleted 1', out.getvalue())
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertTrue(revocations.is_revoked('live'))
+        self.assertFalse(revocations.is_revoked('expired'))
+
+
+@mock.patch.object(RevocationStore, 'shared', new_callable=mock.PropertyMock, return_value=True)
+class SharedRevocationStoreTests(TestCase):
+    """The generation counter, as seen with a cache shared between processes."""
+
+    def setUp(self):
+        caches['api'].clear()
+        self.expires_at = timezone.now() + timedelta(days=1)
+
+    def store(self, sync_interval):
+        store = RevocationStore('api', 100, 0.01, sync_interval, purge_interval=3600, purge_batch_size=10)
+        store.sync()
+        return store
+
+    def test_own_revocations_do_not_reload_the_filter(self, shared):
+        store = self.store(sync_interval=0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(store.revoke('first', self.expires_at))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(store.is_revoked('other'))
+        self.assertEqual(revocation_reads(queries), [])
+        self.assertTrue(store.is_revoked('first'))
+
+    def test_other_processes_revocations_are_loaded(self, shared):
+        store = self.store(sync_interval=0)
+        # Another process revokes a token and bumps the generation
+        RevokedToken.objects.create(jti='elsewhere', expires_at=self.expires_at)
+        caches['api'].set('revocation_generation', 1, None)
+        self.assertTrue(store.is_revoked('elsewhere'))
+
+    def test_reloads_at_most_once_per_sync_interval(self, shared):
+        store = self.store(sync_interval=3600)
+        RevokedToken.objects.create(jti='elsewhere', expires_at=self.expires_at)
+        caches['api'].set('revocation_generation', 1, None)
+        with CaptureQueriesContext(connection) as queries:
+            store.is_revoked('elsewhere')
+        self.assertEqual(revocation_reads(queries), [])
+
+
+class AuthenticationCacheTests(AccountsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+
+    def profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/accounts/profile/')
+        user_reads = [query['sql'] for query in queries if 'FROM "accounts_user"' in query['sql']]
+        return response.status_code, len(user_reads)
+
+    def test_unshared_versions_read_the_user_row(self):
+        self.assertEqual(self.profile(), (200, 1))
+        # Another process deactivates the user; its bump lands in its own cache
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.profile(), (401, 1))
+
+    @mock.patch.object(AuthVersions, 'shared', new_callable=mock.PropertyMock, return_value=True)
+    def test_shared_versions_use_the_cached_user_until_bumped(self, shared):
+        self.assertEqual(self.profile(), (200, 1))
+        self.assertEqual(self.profile(), (200, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.profile(), (401, 1))
+
+
+class LoginHistoryTests(AccountsTestCase):
+    def setUp(self):
+        super().setUp()
+        # Flushed explicitly by the tests rather than by the thread
+        self.recorder = LoginRecorder(batch_size=2, flush_interval=3600, max_buffer=5)
+        for patcher in (mock.patch('accounts.views.login_recorder', self.recorder),
+                        mock.patch('accounts.history.threading.Thread')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT='tests')
+
+    def counts(self):
+        return {labels['outcome']: count for labels, count in self.recorder.metrics()[0][3]}
+
+    def test_attempts_are_written_on_flush(self):
+        self.login()
+        self.client.post('/api/accounts/token/', {'email': 'owner@example.com', 'password': 'wrong'})
+        self.assertFalse(LoginHistory.objects.exists())
+        self.assertEqual(self.recorder.flush(), 2)
+        entries = LoginHistory.objects.filter(user=self.user).order_by('timestamp')
+        self.assertEqual([(entry.event, entry.success) for entry in entries], [('login', True), ('login', False)])
+
+    def test_flush_resolves_users_in_one_query_and_skips_unknown_ones(self):
+        self.recorder.record(self.request, 'login', True, user_id=self.user.id)
+        self.recorder.record(self.request, 'login', False, username='owner@example.com')
+        self.recorder.record(self.request, 'login', False, username='nobody@example.com')
+        self.recorder.record(self.request, 'refresh', True, user_id=self.user.id + 100)
+        with self.assertNumQueries(3):
+            # One user lookup per batch of two; the second matches nobody, so has no insert
+            self.assertEqual(self.recorder.flush(), 2)
+        entry = LoginHistory.objects.filter(user=self.user).first()
+        self.assertEqual((entry.ip_address, entry.user_agent), ('10.0.0.1', 'tests'))
+        self.assertEqual(self.counts(), {'recorded': 4, 'written': 2, 'unmatched': 2, 'dropped': 0})
+
+    def test_a_full_buffer_drops_new_attempts(self):
+        for _ in range(7):
+            self.recorder.record(self.request, 'login', True, user_id=self.user.id)
+        self.assertEqual(self.recorder.flush(), 5)
+        self.assertEqual(self.counts()['dropped'], 2)
+
+    def test_history_endpoint_lists_own_entries_newest_first(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        now = timezone.now()
+        LoginHistory.objects.create(user=self.user, event='login', success=True, timestamp=now - timedelta(hours=1))
+        LoginHistory.objects.create(user=self.user, event='refresh', success=True, timestamp=now)
+        LoginHistory.objects.create(user=other, event='login', success=True, timestamp=now)
+        self.client.force_authenticate(self.user)
+        data = self.client.get('/api/accounts/login-history/').json()
+        self.assertEqual([entry['event'] for entry in data['results']], ['refresh', 'login'])
+
+    def test_prune_deletes_entries_past_retention(self):
+        LoginHistory.objects.create(user=self.user, timestamp=timezone.now() - timedelta(days=100))
+        LoginHistory.objects.create(user=self.user, timestamp=timezone.now() - timedelta(days=100))
+        recent = LoginHistory.objects.create(user=self.user)
+        out = StringIO()
+        call_command('prune_login_history', '--days', '90', '--batch-size', '1', stdout=out)
+        self.assertIn('Deleted 2', out.getvalue())
+        self.assertEqual(list(LoginHistory.objects.values_list('pk', flat=True)), [recent.pk])
+
+
+class LoginRecorderThreadTests(SimpleTestCase):
+    def test_a_failing_flush_does_not_stop_later_batches(self):
+        recorder = LoginRecorder(batch_size=1, flush_interval=3600, max_buffer=10)
+        written = threading.Event()
+
+        def write(entries):
+            if not write.failed:
+                write.failed = True
+                raise RuntimeError('boom')
+            written.set()
+            return len(entries)
+        write.failed = False
+
+        request = RequestFactory().post('/')
+        with mock.patch.object(recorder, '_write', side_effect=write), \
+                mock.patch('accounts.history.connection'), \
+                self.assertLogs('accounts.history', 'ERROR'):
+            recorder.record(request, 'login', True, user_id=1)
+            for _ in range(50):
+                if write.failed and not recorder._buffer:
+                    break
+                time.sleep(0.01)
+            recorder.record(request, 'login', True, user_id=1)
+            self.assertTrue(written.wait(5))
+        self.assertTrue(recorder._thread.is_alive())
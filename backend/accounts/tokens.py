@@ -0,0 +1,28 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .revocation import revocations
+
+
+class RevocableRefreshToken(RefreshToken):
+    """``RefreshToken`` checked against and revoked in ``revocations``
+    instead of simplejwt's blacklist app."""
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if revocations.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        """Revoke this token; a token already revoked (e.g. by a concurrent
+        refresh) raises ``TokenError``."""
+        revoked = revocations.revoke(
+            self.payload[api_settings.JTI_CLAIM],
+            datetime_from_epoch(self.payload['exp']),
+            self.payload.get(api_settings.USER_ID_CLAIM),
+        )
+        if not revoked:
+            raise TokenError(_('Token is blacklisted'))
@@ -1,19 +1,21 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from . import views
 
 app_name = 'accounts'
 
 urlpatterns = [
     # Authentication endpoints
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/', views.LoginView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', views.RefreshTokenView.as_view(), name='token_refresh'),
+    path('logout/', views.LogoutView.as_view(), name='logout'),
+    path('logout-all/', views.LogoutAllView.as_view(), name='logout_all'),
     
     # User management endpoints
     path('register/', views.UserRegistrationView.as_view(), name='register'),
     path('verify-email/<str:token>/', views.VerifyEmailView.as_view(), name='verify_email'),
     path('profile/', views.UserProfileView.as_view(), name='profile'),
     path('profile/update/', views.UpdateProfileView.as_view(), name='update_profile'),
+    path('login-history/', views.LoginHistoryView.as_view(), name='login_history'),
     path('change-password/', views.ChangePasswordView.as_view(), name='change_password'),
     path('reset-password/', views.ResetPasswordRequestView.as_view(), name='reset_password_request'),
     path('reset-password/<str:token>/', views.ResetPasswordView.as_view(), name='reset_password'),
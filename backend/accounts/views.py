@@ -1,21 +1,79 @@
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.conf import settings
 import uuid
+from rest_framework_simplejwt.exceptions import TokenBackendError, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.state import token_backend
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from .serializers import (
     UserSerializer,
     LoginHistorySerializer,
     UserUpdateSerializer
 )
+from .history import login_recorder
 from .models import LoginHistory
+from .revocation import revocations
+from .tokens import RevocableRefreshToken
 
 User = get_user_model()
 
+class LoginHistoryMixin:
+    """Record each attempt at a token view in ``login_recorder``, which
+    writes them in batches off the request path. Requests rejected as
+    malformed (400) aren't attempts and aren't recorded."""
+    history_event = None
+
+    def get_serializer(self, *args, **kwargs):
+        self.serializer = super().get_serializer(*args, **kwargs)
+        return self.serializer
+
+    def post(self, request, *args, **kwargs):
+        self.serializer = None
+        try:
+            response = super().post(request, *args, **kwargs)
+        except AuthenticationFailed:
+            self.record_attempt(request, False)
+            raise
+        self.record_attempt(request, True)
+        return response
+
+    def record_attempt(self, request, success):
+        user = getattr(self.serializer, 'user', None)
+        if user is not None:
+            login_recorder.record(request, self.history_event, success, user_id=user.pk)
+        else:
+            login_recorder.record(request, self.history_event, success, **self.attempted_identity(request))
+
+    def attempted_identity(self, request):
+        """Who a failed attempt was for, when no user was loaded."""
+        return {}
+
+class LoginView(LoginHistoryMixin, TokenObtainPairView):
+    history_event = 'login'
+
+    def attempted_identity(self, request):
+        username = request.data.get(User.USERNAME_FIELD)
+        return {'username': str(username)} if username else {}
+
+class RefreshTokenView(LoginHistoryMixin, TokenRefreshView):
+    history_event = 'refresh'
+
+    def attempted_identity(self, request):
+        # Only a validly signed token names its user; a forged one must not
+        # add entries to someone else's history
+        try:
+            payload = token_backend.decode(str(request.data.get('refresh', '')))
+        except TokenBackendError:
+            return {}
+        return {'user_id': payload.get(api_settings.USER_ID_CLAIM)}
+
 class UserRegistrationView(generics.CreateAPIView):
     permission_classes = (permissions.AllowAny,)
     serializer_class = UserSerializer
@@ -124,3 +182,41 @@ class ResetPasswordView(APIView):
                 {'detail': 'Invalid reset token'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+class LogoutView(APIView):
+    """Revoke the posted refresh token; its access token lapses on its own."""
+    permission_classes = (permissions.AllowAny,)
+
+    def post(self, request):
+        refresh = request.data.get('refresh') if isinstance(request.data, dict) else None
+        if not refresh or not isinstance(refresh, str):
+            # RefreshToken(None) would mint a fresh token rather than fail
+            return Response(
+                {'detail': 'A refresh token is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            RevocableRefreshToken(refresh).blacklist()
+        except TokenError:
+            return Response(
+                {'detail': 'Invalid or expired refresh token'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'detail': 'Logged out successfully'})
+
+class LogoutAllView(APIView):
+    """Revoke every access and refresh token issued to the user so far."""
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request):
+        revocations.revoke_all(request.user)
+        return Response({'detail': 'Logged out of all sessions'})
+
+class LoginHistoryView(generics.ListAPIView):
+    """The user's login and refresh attempts, newest first. Attempts reach
+    it once the recorder flushes (LOGIN_HISTORY_FLUSH_INTERVAL)."""
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = LoginHistorySerializer
+
+    def get_queryset(self):
+        return LoginHistory.objects.filter(user=self.request.user)
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Route the task API's hot read endpoints to tasks.async_views
+os.environ.setdefault('DJANGO_ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,108 @@
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, any
+    ``extra`` fields and the formatted traceback, if there is one."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Let through a ``rate`` share of records below ``level``; records at
+    or above ``level`` always pass."""
+
+    def __init__(self, rate=1.0, level='WARNING'):
+        super().__init__()
+        self.rate = float(rate)
+        self.level = logging.getLevelName(level) if isinstance(level, str) else level
+
+    def filter(self, record):
+        return record.levelno >= self.level or random.random() < self.rate
+
+
+class DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room: the sentinel must not be dropped on a full queue
+        self.queue.put(self._sentinel)
+
+
+class QueueListenerHandler(QueueHandler):
+    """Hand records to a background thread that writes them to ``handlers``.
+
+    The calling thread only formats the message and puts it on a bounded
+    queue without waiting: when the queue is full the record is dropped and
+    counted rather than blocking the request. Usable from ``dictConfig``
+    with ``'handlers': ['cfg://handlers.<name>', ...]``; closing the handler
+    (as ``logging.shutdown`` does at exit) drains the queue.
+    """
+
+    def __init__(self, handlers, queue_size=10000, respect_handler_level=True):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        # Index rather than iterate: dictConfig resolves cfg:// items on access
+        handlers = [handlers[index] for index in range(len(handlers))]
+        for handler in handlers:
+            if not isinstance(handler, logging.Handler):
+                raise ValueError(f'Expected a configured handler, got {handler!r}')
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = DrainingQueueListener(self.queue, *handlers, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        self._listening = True
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def prepare(self, record):
+        # Unlike QueueHandler.prepare, keep the traceback out of the message
+        # so formatters downstream can still place it themselves.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+        super().close()
@@ -0,0 +1,174 @@
+import hmac
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+PREFIX = 'lifescope'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name: (help, buckets)
+REQUEST_HISTOGRAMS = {
+    'http_request_duration_seconds': ('Total time spent handling the request', DURATION_BUCKETS),
+    'http_request_db_seconds': ('Time spent executing SQL', DURATION_BUCKETS),
+    'http_request_serialize_seconds': ('Time spent rendering the response body', DURATION_BUCKETS),
+    'http_request_queries': ('SQL queries executed', QUERY_BUCKETS),
+}
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, labels):
+        """``(suffix, labels, value)`` for each line of the exposition."""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield '_bucket', labels + (('le', format_value(float(bound))),), cumulative
+        yield '_bucket', labels + (('le', '+Inf'),), self.count
+        yield '_sum', labels, self.sum
+        yield '_count', labels, self.count
+
+
+class MetricsRegistry:
+    """Per-process request metrics, rendered in the Prometheus text format.
+
+    Histograms are labelled by view name and method; ``http_requests_total``
+    also by status. Each worker process keeps its own registry, so scrape
+    every process (or run one per host) when serving with several workers.
+    Apps add their own counters with ``register_collector``: a callable
+    returning ``(name, type, help, [(labels, value), ...])`` tuples.
+    """
+
+    def __init__(self, prefix=PREFIX):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {name: {} for name in REQUEST_HISTOGRAMS}
+        self._requests = {}
+        self._collectors = []
+
+    def register_collector(self, collector):
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def observe_request(self, view, method, status, duration, db_time, serialize_time, queries):
+        labels = (('view', view), ('method', method))
+        values = {
+            'http_request_duration_seconds': duration,
+            'http_request_db_seconds': db_time,
+            'http_request_serialize_seconds': serialize_time,
+            'http_request_queries': queries,
+        }
+        with self._lock:
+            for name, value in values.items():
+                series = self._histograms[name]
+                if labels not in series:
+                    series[labels] = Histogram(REQUEST_HISTOGRAMS[name][1])
+                series[labels].observe(value)
+            key = labels + (('status', str(status)),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            for series in self._histograms.values():
+                series.clear()
+            self._requests.clear()
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            name = f'{self.prefix}_{name}'
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for suffix, labels, value in samples:
+                lines.append(f'{name}{suffix}{format_labels(labels)} {format_value(value)}')
+
+        with self._lock:
+            family('http_requests_total', 'counter', 'Requests handled by API views', [
+                ('', labels, count) for labels, count in sorted(self._requests.items())
+            ])
+            for metric, (help_text, _) in REQUEST_HISTOGRAMS.items():
+                family(metric, 'histogram', help_text, [
+                    sample
+                    for labels, histogram in sorted(self._histograms[metric].items())
+                    for sample in histogram.samples(labels)
+                ])
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                family(name, kind, help_text, [
+                    ('', tuple(sorted(labels.items())), value) for labels, value in samples
+                ])
+        return '\n'.join(lines) + '\n'
+
+
+# psycopg_pool statistics that describe the current state; the rest are running totals
+POOL_GAUGES = {'pool_min', 'pool_max', 'pool_size', 'pool_available', 'requests_waiting'}
+
+
+def database_pool_metrics():
+    """psycopg3 pool statistics for every database alias using a pool."""
+    from django.db import connections
+
+    families = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        for key, value in pool.get_stats().items():
+            kind = 'gauge' if key in POOL_GAUGES else 'counter'
+            name = f'db_pool_{key}' if kind == 'gauge' else f'db_pool_{key}_total'
+            family = families.setdefault(name, (name, kind, f'psycopg_pool {key}', []))
+            family[3].append(({'alias': alias}, value))
+    return list(families.values())
+
+
+registry = MetricsRegistry()
+registry.register_collector(database_pool_metrics)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>`` when a token is
+    configured; without one it is only served with ``DEBUG`` on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            raise Http404
+    elif not settings.DEBUG:
+        raise Http404
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
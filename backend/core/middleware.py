@@ -0,0 +1,259 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.text import compress_string
+from rest_framework.views import APIView
+
+from .metrics import registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger('core.access')
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts, ignoring those sent with ``q=0``."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """Compress API responses with brotli (when installed) or gzip.
+
+    Only paths under ``RESPONSE_COMPRESSION_PATHS`` whose body is at least
+    ``RESPONSE_COMPRESSION_MIN_SIZE`` bytes are compressed; small bodies
+    aren't worth the CPU or the framing overhead. Like Django's
+    ``GZipMiddleware``, strong ETags are weakened since the bytes change.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.paths = tuple(getattr(settings, 'RESPONSE_COMPRESSION_PATHS', ['/api/']))
+        self.min_size = getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+        self.brotli_quality = getattr(settings, 'RESPONSE_COMPRESSION_BROTLI_QUALITY', 4)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if not request.path.startswith(self.paths):
+            return response
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in accepted:
+            encoding, compressed = 'br', brotli.compress(response.content, quality=self.brotli_quality)
+        elif 'gzip' in accepted:
+            encoding, compressed = 'gzip', compress_string(response.content, max_random_bytes=100)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(response.content))
+        response.headers['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+
+def api_view_name(request):
+    """The URL name of the DRF view (or async view of one) that handled
+    ``request``, or ``None`` for anything else."""
+    match = getattr(request, 'resolver_match', None)
+    view_class = getattr(match.func, 'cls', None) if match is not None else None
+    if isinstance(view_class, type) and issubclass(view_class, APIView):
+        return match.view_name
+    return None
+
+
+class RequestProfile:
+    """Timings collected for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_started = None
+        self.serialize_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Called by profile_queries for each query of the request
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def rendered(self, response):
+        self.serialize_time += time.perf_counter() - self.render_started
+
+
+# The profile of the request being handled. Context variables follow the
+# request into the threads sync_to_async runs queries in, which per-thread
+# connection.execute_wrapper() blocks would not.
+current_profile = ContextVar('current_profile', default=None)
+
+
+def profile_queries(execute, sql, params, many, context):
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_query_profiler(connection, **kwargs):
+    # First in the list: execute_wrapper() blocks pop the last one on exit
+    if profile_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, profile_queries)
+
+
+connection_created.connect(install_query_profiler)
+
+
+class ProfilingMiddleware:
+    """Record query count, DB time, serialization (response rendering) time
+    and total time for every DRF view.
+
+    Measurements feed the per-view histograms in ``core.metrics.registry``.
+    With ``SERVER_TIMING`` on they are also returned in a ``Server-Timing``
+    header, and requests slower than ``SLOW_REQUEST_MS`` are logged. Every
+    request gets a structured line on the ``core.access`` logger (sampled
+    by the logging config; 4xx/5xx are logged as warnings).
+    Place it first in ``MIDDLEWARE`` so the total covers the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.server_timing = getattr(settings, 'SERVER_TIMING', False)
+        self.slow_request = getattr(settings, 'SLOW_REQUEST_MS', 1000) / 1000
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = self.start(request)
+        token = current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = self.start(request)
+        token = current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        return self.finish(request, response, profile)
+
+    def start(self, request):
+        # Connections opened before this module was imported missed the signal
+        for connection in connections.all(initialized_only=True):
+            install_query_profiler(connection)
+        profile = RequestProfile()
+        request._request_profile = profile
+        return profile
+
+    def finish(self, request, response, profile):
+        total = time.perf_counter() - profile.started
+        profile.view = profile.view or api_view_name(request)
+        self.log_access(request, response, profile, total)
+        if profile.view is None:
+            return response
+
+        registry.observe_request(
+            profile.view, request.method, response.status_code,
+            total, profile.db_time, profile.serialize_time, profile.queries
+        )
+        if self.server_timing:
+            app = max(total - profile.db_time - profile.serialize_time, 0)
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+                f'serialize;dur={profile.serialize_time * 1000:.1f}',
+                f'app;dur={app * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+        if self.slow_request and total >= self.slow_request:
+            logger.warning(
+                'Slow request %s %s (%s): %.0f ms, %d queries, %.0f ms in the database',
+                request.method, request.get_full_path(), profile.view,
+                total * 1000, profile.queries, profile.db_time * 1000
+            )
+        return response
+
+    def log_access(self, request, response, profile, total):
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            # No view needed the session user; don't query for it here
+            # (which an async request couldn't do on the event loop anyway)
+            user = None
+        access_logger.log(
+            logging.WARNING if response.status_code >= 400 else logging.INFO,
+            '%s %s %s', request.method, request.path, response.status_code,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'view': profile.view,
+                'duration_ms': round(total * 1000, 2),
+                'queries': profile.queries,
+                'db_ms': round(profile.db_time * 1000, 2),
+                'user_id': user.pk if user is not None and user.is_authenticated else None,
+            }
+        )
+
+    def process_template_response(self, request, response):
+        # DRF responses render after the view returns; time that step
+        profile = getattr(request, '_request_profile', None)
+        if profile is not None and api_view_name(request) is not None:
+            profile.render_started = time.perf_counter()
+            response.add_post_render_callback(profile.rendered)
+        return response
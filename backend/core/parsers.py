@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stock parser
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` backed by orjson for UTF-8 bodies."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,29 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stock renderer
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` backed by orjson, falling back to the stdlib encoder
+    when orjson isn't installed.
+
+    Dates, times, ``Decimal`` and anything else orjson doesn't handle
+    natively are passed to DRF's ``JSONEncoder``, so the output matches
+    the stock renderer value for value.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=option)
+
+        # Same escaping as JSONRenderer: U+2028/U+2029 are invalid in JavaScript strings
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
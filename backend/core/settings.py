@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -49,7 +51,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,7 +63,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'core.urls'
+# Serve the hot task read endpoints from async views (tasks.async_views).
+# core/asgi.py turns this on by default; under WSGI the sync views are faster.
+ASYNC_READ_VIEWS = os.environ.get('DJANGO_ASYNC_READ_VIEWS', 'False') == 'True'
+ROOT_URLCONF = 'core.urls_async' if ASYNC_READ_VIEWS else 'core.urls'
 
 TEMPLATES = [
     {
@@ -81,19 +88,10 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Configured from DATABASE_URL or DB_* variables; see core/database.py
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'lifescope',
-        'USER': 'postgres',
-        'PASSWORD': 'tikArab73',
-        'HOST': 'localhost',
-        'PORT': '5432',
-        'OPTIONS': {
-            'sslmode': 'disable',
-        },
-    }
+    'default': database_config(),
 }
 
 # Password validation
@@ -120,23 +118,95 @@ AUTH_USER_MODEL = 'accounts.User'
 # Rest Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# Caches. The 'api' alias backs tasks.cache.api_cache; point it at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) in production
+# so every worker sees the same entries and versions. With the per-process
+# LocMemCache default, data versions are read from the database instead.
+# TIMEOUT and MAX_ENTRIES bound how long and how many entries are kept.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': os.environ.get('API_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('API_CACHE_LOCATION', 'lifescope-api'),
+        'TIMEOUT': int(os.environ.get('API_CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('API_CACHE_MAX_ENTRIES', 5000)),
+        },
+    },
+}
+API_CACHE_ALIAS = 'api'
+
+# Authenticated users are kept per process (accounts.cache.user_cache) and
+# checked against a per-user auth version in the 'api' cache on each request;
+# without a shared 'api' cache every request reads the user row instead
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', 10000))
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 300))
+
+# Delta sync (/api/tasks/sync/): how long deletions are remembered. Clients
+# whose cursor is older get a full resync; see the prune_tombstones command.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Response compression (core.middleware.CompressionMiddleware); brotli is
+# used when the package is installed and the client accepts it
+RESPONSE_COMPRESSION_PATHS = ['/api/']
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+
+# Request profiling: Server-Timing headers (opt-in), slow request logging
+# and the Prometheus endpoint at /metrics/ (bearer token, or DEBUG only)
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'False') == 'True'
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 1000))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    # Rotation revokes the old token in accounts.revocation
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.RevocableTokenRefreshSerializer',
 }
 
+# Refresh token revocation (accounts.revocation): a per-process Bloom filter
+# of revoked JTIs in front of the RevokedToken table. Other processes pick up
+# a revocation within the sync interval, checking a counter in the 'api'
+# cache if it is shared and the table otherwise. A background thread purges
+# expired rows every purge interval; see also the purge_revoked_tokens command.
+TOKEN_REVOCATION_FILTER_CAPACITY = int(os.environ.get('TOKEN_REVOCATION_FILTER_CAPACITY', 100000))
+TOKEN_REVOCATION_FILTER_ERROR_RATE = float(os.environ.get('TOKEN_REVOCATION_FILTER_ERROR_RATE', 0.001))
+TOKEN_REVOCATION_SYNC_INTERVAL = int(os.environ.get('TOKEN_REVOCATION_SYNC_INTERVAL', 5))
+TOKEN_REVOCATION_PURGE_INTERVAL = int(os.environ.get('TOKEN_REVOCATION_PURGE_INTERVAL', 3600))
+TOKEN_REVOCATION_PURGE_BATCH_SIZE = int(os.environ.get('TOKEN_REVOCATION_PURGE_BATCH_SIZE', 1000))
+
+# Login history (accounts.history): attempts at token/ and token/refresh/
+# are buffered per process and written with bulk_create when the batch is
+# full or the flush interval has passed. The prune_login_history command
+# deletes entries older than the retention period.
+LOGIN_HISTORY_BATCH_SIZE = int(os.environ.get('LOGIN_HISTORY_BATCH_SIZE', 100))
+LOGIN_HISTORY_FLUSH_INTERVAL = float(os.environ.get('LOGIN_HISTORY_FLUSH_INTERVAL', 5))
+LOGIN_HISTORY_MAX_BUFFER = int(os.environ.get('LOGIN_HISTORY_MAX_BUFFER', 10000))
+LOGIN_HISTORY_RETENTION_DAYS = int(os.environ.get('LOGIN_HISTORY_RETENTION_DAYS', 90))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -198,24 +268,89 @@ EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 
-# Logging configuration
+# Logging configuration. Handlers write from a background thread
+# (core.log.QueueListenerHandler), so request threads never wait on disk
+# or console I/O. Log files are JSON lines.
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+# Share of successful requests written to the access log; 4xx/5xx are always kept
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', 0.1))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '{asctime} {levelname} {name}: {message}',
+            'style': '{',
+        },
+        'json': {
+            '()': 'core.log.JSONFormatter',
+        },
+    },
+    'filters': {
+        'access_sample': {
+            '()': 'core.log.SamplingFilter',
+            'rate': ACCESS_LOG_SAMPLE_RATE,
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
+            'formatter': 'plain',
         },
         'file': {
-            'class': 'logging.FileHandler',
-            'filename': os.path.join(BASE_DIR, 'logs', 'debug.log'),
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': os.path.join(LOG_DIR, 'lifescope.log'),
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'json',
+        },
+        'access_file': {
+            'class': 'logging.handlers.TimedRotatingFileHandler',
+            'filename': os.path.join(LOG_DIR, 'access.log'),
+            'when': 'midnight',
+            'backupCount': 7,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'json',
+        },
+        'queue': {
+            '()': 'core.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
+        },
+        'access_queue': {
+            '()': 'core.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.access_file'],
+            # Sampled out before queueing, so dropped records cost nothing
+            'filters': ['access_sample'],
         },
     },
     'root': {
-        'handlers': ['console', 'file'],
-        'level': 'INFO',
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        'django': {
+            'level': 'INFO',
+        },
+        'django.utils.autoreload': {
+            'level': 'WARNING',
+        },
+        'django.db.backends': {
+            'level': 'WARNING',
+        },
+        'core.access': {
+            'handlers': ['access_queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
 # Ensure the logs directory exists
-os.makedirs(os.path.join(BASE_DIR, 'logs'), exist_ok=True)
+os.makedirs(LOG_DIR, exist_ok=True)
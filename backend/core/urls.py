@@ -19,8 +19,11 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/tasks/', include('tasks.urls')),
     path('api/accounts/', include('accounts.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,12 @@
+"""
+URL configuration used under ASGI (settings.ASYNC_READ_VIEWS): core.urls
+with the task API's hot read endpoints served by tasks.async_views.
+"""
+from django.urls import path, include
+
+from . import urls
+
+urlpatterns = [
+    path('api/tasks/', include('tasks.urls_async')),
+    *[pattern for pattern in urls.urlpatterns if getattr(pattern, 'app_name', None) != 'tasks'],
+]
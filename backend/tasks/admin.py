@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Role, EisenhowerMatrix, TaskCategory, Task, TaskComment
+from .models import Role, EisenhowerMatrix, TaskCategory, Task, TaskComment, TaskStats, RecurrenceRule, DataVersion, Tombstone
 
 @admin.register(Role)
 class RoleAdmin(admin.ModelAdmin):
@@ -29,3 +29,25 @@ class TaskCommentAdmin(admin.ModelAdmin):
     list_display = ('task', 'author', 'created_at')
     search_fields = ('content',)
     list_filter = ('created_at',)
+
+@admin.register(TaskStats)
+class TaskStatsAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'role', 'total', 'completed', 'overdue', 'updated_at')
+    list_filter = ('role',)
+
+@admin.register(RecurrenceRule)
+class RecurrenceRuleAdmin(admin.ModelAdmin):
+    list_display = ('title', 'frequency', 'owner', 'role', 'start_date', 'materialized_through', 'is_active')
+    search_fields = ('title',)
+    list_filter = ('frequency', 'is_active')
+
+@admin.register(DataVersion)
+class DataVersionAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'version', 'changed_at')
+    search_fields = ('owner__email',)
+    readonly_fields = ('owner', 'version', 'changed_at')
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'owner', 'deleted_at')
+    list_filter = ('kind',)
@@ -0,0 +1,190 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+PRIORITY_KEYS = {
+    1: 'high',
+    2: 'medium',
+    3: 'low'
+}
+
+QUADRANT_KEYS = ['q1', 'q2', 'q3', 'q4']
+
+# Analytics keys whose values can change when a task is (un)completed
+TOGGLE_ANALYTICS_FIELDS = [
+    'total_tasks', 'completed_tasks', 'in_progress_tasks', 'overdue_tasks',
+    'completion_rate', 'completed_by_priority', 'by_role', 'due_today_by_role'
+]
+
+
+def task_counter_aggregates(now):
+    """Conditional ``Count`` expressions keyed by analytics counter name."""
+    aggregates = {
+        'total': Count('id'),
+        'completed': Count('id', filter=Q(is_completed=True)),
+        'not_started': Count('id', filter=Q(status='not_started')),
+        'in_progress': Count('id', filter=Q(status='in_progress')),
+        'overdue': Count('id', filter=Q(due_date__lt=now, is_completed=False)),
+    }
+    for value, key in PRIORITY_KEYS.items():
+        aggregates[f'priority_{key}'] = Count('id', filter=Q(priority=value))
+        aggregates[f'completed_priority_{key}'] = Count('id', filter=Q(priority=value, is_completed=True))
+    for quadrant in QUADRANT_KEYS:
+        aggregates[f'quadrant_{quadrant}'] = Count('id', filter=Q(quadrant=quadrant))
+    return aggregates
+
+
+COUNTER_FIELDS = list(task_counter_aggregates(None))
+
+
+def aggregate_task_counters(tasks, now=None):
+    """Compute every analytics counter for ``tasks`` in a single query."""
+    now = now or timezone.now()
+    return tasks.order_by().aggregate(**task_counter_aggregates(now))
+
+
+def collect_task_stats(tasks, now=None):
+    """Recompute rollup counters for ``tasks`` grouped by (owner, role).
+
+    ``overdue_horizon`` is the earliest future due date of an open task,
+    i.e. the moment the stored ``overdue`` counter stops being exact.
+    """
+    now = now or timezone.now()
+    return (tasks.order_by()
+            .values('owner_id', 'role_id')
+            .annotate(
+                overdue_horizon=Min('due_date', filter=Q(due_date__gte=now, is_completed=False)),
+                **task_counter_aggregates(now)
+            ))
+
+
+def today_range(now=None):
+    """Aware ``(start, end)`` bounds of the current day in ``TIME_ZONE``."""
+    today = timezone.localdate(now)
+    start = timezone.make_aware(datetime.combine(today, time.min))
+    return start, start + timedelta(days=1)
+
+
+def role_entry(role_id, role_name):
+    return {
+        'role_id': role_id,
+        'role__name': role_name,
+        'count': 0,
+        'completed': 0,
+        'in_progress': 0,
+        'not_started': 0
+    }
+
+
+def aggregate_task_breakdowns(tasks, now=None):
+    """Return ``(by_role, by_category, due_today_by_role)`` from one grouped query."""
+    start, end = today_range(now)
+    due_today = Q(due_date__gte=start, due_date__lt=end)
+    rows = (tasks.order_by()
+            .values('role_id', 'role__name', 'category_id', 'category__name')
+            .annotate(
+                count=Count('id'),
+                completed=Count('id', filter=Q(is_completed=True)),
+                in_progress=Count('id', filter=Q(status='in_progress')),
+                not_started=Count('id', filter=Q(status='not_started')),
+                due_today=Count('id', filter=due_today),
+                due_today_completed=Count('id', filter=due_today & Q(is_completed=True)),
+            ))
+
+    by_role = {}
+    by_category = {}
+    due_today_by_role = {}
+    for row in rows:
+        if row['role__name'] is not None:
+            entry = by_role.setdefault(row['role_id'], role_entry(row['role_id'], row['role__name']))
+            for field in ('count', 'completed', 'in_progress', 'not_started'):
+                entry[field] += row[field]
+            if row['due_today']:
+                entry = due_today_by_role.setdefault(row['role_id'], {
+                    'role_id': row['role_id'],
+                    'role__name': row['role__name'],
+                    'total': 0,
+                    'completed': 0
+                })
+                entry['total'] += row['due_today']
+                entry['completed'] += row['due_today_completed']
+        if row['category_id'] is not None:
+            entry = by_category.setdefault(row['category_id'], {
+                'category_id': row['category_id'],
+                'category__name': row['category__name'],
+                'count': 0
+            })
+            entry['count'] += row['count']
+
+    return list(by_role.values()), list(by_category.values()), list(due_today_by_role.values())
+
+
+def aggregate_due_today_by_role(tasks, now=None):
+    """Total and completed tasks due today, per role."""
+    start, end = today_range(now)
+    return list(tasks.order_by()
+                .filter(due_date__gte=start, due_date__lt=end)
+                .values('role_id', 'role__name')
+                .annotate(total=Count('id'), completed=Count('id', filter=Q(is_completed=True))))
+
+
+def build_analytics(counters, by_role, by_category, due_today_by_role):
+    """Shape raw counters into the analytics response payload."""
+    total_tasks = counters['total'] or 1
+    completed_tasks = counters['completed']
+
+    quadrant_counts = {
+        quadrant: counters[f'quadrant_{quadrant}']
+        for quadrant in QUADRANT_KEYS
+    }
+    total_quadrant = sum(quadrant_counts.values()) or 1
+
+    return {
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'in_progress_tasks': counters['in_progress'],
+        'overdue_tasks': counters['overdue'],
+        'completion_rate': round((completed_tasks / total_tasks * 100), 1),
+        'by_priority': {
+            key: counters[f'priority_{key}']
+            for key in PRIORITY_KEYS.values()
+        },
+        'completed_by_priority': {
+            key: counters[f'completed_priority_{key}']
+            for key in PRIORITY_KEYS.values()
+        },
+        'by_role': by_role,
+        'by_category': by_category,
+        'due_today_by_role': due_today_by_role,
+        'by_quadrant': quadrant_counts,
+        'quadrant_percentages': {
+            k: round((v / total_quadrant * 100), 1)
+            for k, v in quadrant_counts.items()
+        },
+    }
+
+
+def compute_task_analytics(tasks, now=None):
+    """Analytics for ``tasks`` using at most two queries."""
+    counters = aggregate_task_counters(tasks, now=now)
+    return build_analytics(counters, *aggregate_task_breakdowns(tasks, now=now))
+
+
+def compute_rollup_analytics(stats, by_category, due_today_by_role):
+    """Analytics from pre-aggregated ``TaskStats`` rows."""
+    counters = dict.fromkeys(COUNTER_FIELDS, 0)
+    by_role = []
+    for row in stats:
+        for field in COUNTER_FIELDS:
+            counters[field] += getattr(row, field)
+        if row.total:
+            entry = role_entry(row.role_id, row.role.name)
+            entry.update(
+                count=row.total,
+                completed=row.completed,
+                in_progress=row.in_progress,
+                not_started=row.not_started
+            )
+            by_role.append(entry)
+    return build_analytics(counters, by_role, by_category, due_today_by_role)
@@ -1,6 +1,26 @@
+import logging
+
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+logger = logging.getLogger(__name__)
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from core.metrics import registry
+        from .cache import api_cache
+
+        registry.register_collector(api_cache.metrics)
+        post_migrate.connect(repair_search_triggers, sender=self)
+
+
+def repair_search_triggers(using, **kwargs):
+    # Table rebuilds in SQLite migrations drop the FTS5 triggers of 0013
+    from .search import repair_sqlite_fts
+
+    for table in repair_sqlite_fts(using):
+        logger.warning('Recreated the full-text search triggers of %s and reindexed it', table)
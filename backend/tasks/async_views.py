@@ -0,0 +1,195 @@
+"""Async versions of the busiest task read endpoints, for ASGI servers.
+
+Each view answers ``GET`` for one viewset action -- the task list and
+detail, analytics, roles and categories -- reusing the viewset's queryset,
+validators, cache key and serializer, so URLs, JSON, ETags and cache
+entries are the same as the sync views'. Authentication plus the
+conditional/cache check take one hop into a thread and queries run
+through the async ORM; a 304 or cache hit never waits on a worker thread
+for the rest of the request. Requests they don't serve identically (other
+methods, the browsable API, missing or bad credentials, errors) are handed
+to the sync view.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re, get_conditional_response, patch_vary_headers
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from accounts.authentication import CachedJWTAuthentication
+from core.renderers import ORJSONRenderer
+
+from .cache import api_cache
+from .conditional import stamp_validators
+from .pagination import apaginate_page_number
+from .serializers import FastTaskListSerializer
+
+JSON = 'application/json'
+# Accept values the default renderer answers, so content negotiation would pick it
+JSON_MEDIA_RANGES = ('*/*', 'application/*', JSON)
+
+authentication = CachedJWTAuthentication()
+renderer = ORJSONRenderer()
+
+
+def wants_json(request):
+    if 'format' in request.GET:
+        return False
+    accept = request.headers.get('Accept', '*/*')
+    if 'indent=' in accept:
+        return False
+    media_ranges = [item.split(';')[0].strip() for item in accept.split(',')]
+    return 'text/html' not in media_ranges and any(item in JSON_MEDIA_RANGES for item in media_ranges)
+
+
+def access_token(request):
+    """The validated bearer token, or ``None`` if there isn't a usable one."""
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = authentication.get_raw_token(header)
+        return authentication.get_validated_token(raw_token) if raw_token is not None else None
+    except APIException:
+        return None
+
+
+def prepare(view, request, token, cache_namespace):
+    """The sync part of the request, run in one thread hop: load the user,
+    then answer from the client's copy (304) or the cache if possible.
+
+    Returns ``(response, validators, cache_key)``.
+    """
+    request.user = authentication.get_user(token)
+    validators = view.conditional_validators(request)
+    if validators is not None:
+        not_modified = get_conditional_response(request, etag=validators[0], last_modified=validators[1])
+        if not_modified is not None:
+            stamp_validators(not_modified, *validators)
+            return finalize(view, not_modified), validators, None
+
+    key = view.cache_key(request, cache_namespace) if cache_namespace else None
+    if key is not None:
+        data = api_cache.get(cache_namespace, *key)
+        if data is not None:
+            response = render(request, data)
+            response['X-Cache'] = 'HIT'
+            if validators is not None:
+                stamp_validators(response, *validators)
+            return finalize(view, response), validators, key
+    return None, validators, key
+
+
+def store(view, request, cache_namespace, key, data, validators):
+    """Cache a freshly loaded 200 response; returns its validators."""
+    if key is not None:
+        api_cache.set(cache_namespace, *key, data)
+    # As in conditional_get: validators unusable up front may be valid now
+    return validators or view.conditional_validators(request)
+
+
+def render(request, data, status=200):
+    started = time.perf_counter()
+    response = HttpResponse(renderer.render(data, JSON), status=status, content_type=JSON)
+    profile = getattr(request, '_request_profile', None)
+    if profile is not None:
+        profile.serialize_time += time.perf_counter() - started
+    return response
+
+
+def finalize(view, response):
+    """Add the headers ``APIView.finalize_response`` would (Allow, Vary)."""
+    headers = view.default_response_headers
+    vary = headers.pop('Vary', None)
+    if vary is not None:
+        patch_vary_headers(response, cc_delim_re.split(vary))
+    for key, value in headers.items():
+        response[key] = value
+    return response
+
+
+def read_view(fallback, load, cache_namespace=None):
+    """An async view for the ``GET`` action of ``fallback``, a viewset's
+    sync view for one route. ``load(view, request)`` is a coroutine
+    returning the response data, or a ``Response`` whose data is only
+    cached and validated if it is a 200; ``cache_namespace`` matches the action's ``cached_action``, if any.
+    """
+    viewset = fallback.cls
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not wants_json(request):
+            return await sync_to_async(fallback)(request, *args, **kwargs)
+        token = access_token(request)
+        if token is None:
+            return await sync_to_async(fallback)(request, *args, **kwargs)
+
+        drf_request = Request(request)
+        drf_request.accepted_renderer = renderer
+        drf_request.accepted_media_type = JSON
+        # What ViewSetMixin.as_view() sets up before dispatching
+        instance = viewset(**fallback.initkwargs)
+        instance.action_map = fallback.actions
+        for method, action in fallback.actions.items():
+            setattr(instance, method, getattr(instance, action))
+        instance.action = fallback.actions['get']
+        instance.request, instance.args, instance.kwargs = drf_request, args, kwargs
+        instance.format_kwarg = None
+        try:
+            response, validators, key = await sync_to_async(prepare)(instance, drf_request, token, cache_namespace)
+            if response is not None:
+                return response
+            data = await load(instance, drf_request)
+        except (APIException, ObjectDoesNotExist):
+            # Let the sync view produce the error response
+            return await sync_to_async(fallback)(request, *args, **kwargs)
+
+        if isinstance(data, Response):
+            if data.status_code != 200:
+                return finalize(instance, render(drf_request, data.data, data.status_code))
+            data = data.data
+        if key is not None or validators is None:
+            validators = await sync_to_async(store)(instance, drf_request, cache_namespace, key, data, validators)
+        response = render(drf_request, data)
+        if key is not None:
+            response['X-Cache'] = 'MISS'
+        if validators is not None:
+            stamp_validators(response, *validators)
+        return finalize(instance, response)
+
+    # Lets ProfilingMiddleware label it like the viewset's own views
+    view.cls = viewset
+    return view
+
+
+async def load_task_list(view, request):
+    queryset = FastTaskListSerializer.values(view.filter_queryset(view.get_queryset()))
+    page = await view.paginator.apaginate_queryset(queryset, request, view)
+    if page is not None:
+        return view.get_paginated_response(FastTaskListSerializer(page).data).data
+    return FastTaskListSerializer([row async for row in queryset]).data
+
+
+async def load_task(view, request):
+    try:
+        task = await view.filter_queryset(view.get_queryset()).aget(pk=view.kwargs['pk'])
+    except (TypeError, ValueError):
+        raise NotFound
+    view.check_object_permissions(request, task)
+    return view.get_serializer(task).data
+
+
+async def load_analytics(view, request):
+    # Analytics reads rollups and several aggregates; one hop runs them all
+    return await sync_to_async(view.analytics_response)(request)
+
+
+async def load_list(view, request):
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await apaginate_page_number(view.paginator, queryset, request) if view.paginator else None
+    if page is not None:
+        return view.get_paginated_response(view.get_serializer(page, many=True).data).data
+    return view.get_serializer([obj async for obj in queryset], many=True).data
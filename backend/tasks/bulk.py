@@ -0,0 +1,287 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import DataVersion, RecurrenceRule, Role, TaskCategory, Task, TaskStats, Tombstone
+from .serializers import TaskPartialUpdateSerializer
+
+MAX_BULK_OPERATIONS = 500
+
+OPERATIONS = ['create', 'update', 'complete', 'uncomplete', 'move', 'reassign', 'delete']
+
+QUADRANTS = [choice for choice, _ in Task.QUADRANT_CHOICES]
+
+_missing = object()
+
+OCCURRENCE_CONFLICT = 'Another occurrence of this recurring task is already scheduled on this date'
+
+
+def is_id(value):
+    # JSON true/false arrive as bools, which are ints to isinstance()
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def apply_status(task, now):
+    """Keep ``is_completed``/``completed_at`` in step with ``status``, as ``Task.save`` does."""
+    if task.status == 'completed' and not task.is_completed:
+        task.is_completed = True
+        task.completed_at = now
+    elif task.status != 'completed' and task.is_completed:
+        task.is_completed = False
+        task.completed_at = None
+
+
+class BulkTaskProcessor:
+    """Validate and apply a batch of task operations for one user.
+
+    Every item is validated before anything is written; if any item is
+    invalid nothing is applied. Writes use ``bulk_create``, ``bulk_update``
+    and set-based ``UPDATE``/``DELETE`` statements inside one transaction,
+    so ``Task.save`` is bypassed and the affected ``TaskStats`` rows are
+    recounted once at the end. A task moved to another role loses a
+    category of the role it left.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.now = timezone.now()
+
+    def run(self, operations):
+        """Returns ``(results, applied)``."""
+        results = [{'index': index} for index in range(len(operations))]
+        with transaction.atomic():
+            plan = self.validate(operations, results)
+            if any('errors' in result for result in results):
+                for result in results:
+                    result.setdefault('status', 'skipped')
+                    if 'errors' in result:
+                        result['status'] = 'error'
+                transaction.set_rollback(True)
+                return results, False
+            try:
+                with transaction.atomic():
+                    self.apply(plan, results)
+            except IntegrityError:
+                # A concurrent write took an occurrence date validate() saw free
+                for result in results:
+                    result['status'] = 'skipped'
+                for result, _, (task, changed) in plan['update']:
+                    if task.recurrence_rule_id and 'scheduled_date' in changed:
+                        result.update(status='error', errors={'scheduled_date': OCCURRENCE_CONFLICT})
+                transaction.set_rollback(True)
+                return results, False
+        return results, True
+
+    def validate(self, operations, results):
+        task_ids = set()
+        role_ids = set()
+        category_ids = set()
+        for item, result in zip(operations, results):
+            if not isinstance(item, dict) or item.get('op') not in OPERATIONS:
+                result['errors'] = {'op': f"Expected one of {', '.join(OPERATIONS)}"}
+                continue
+            result['op'] = item['op']
+            if item['op'] != 'create':
+                task_id = item.get('id')
+                if not is_id(task_id):
+                    result['errors'] = {'id': 'A task id is required'}
+                    continue
+                if task_id in task_ids:
+                    result['errors'] = {'id': 'Each task may appear only once per request'}
+                    continue
+                task_ids.add(task_id)
+                result['id'] = task_id
+            data = item.get('data') or {}
+            if item['op'] == 'reassign':
+                data = {'role': item.get('role')}
+            if isinstance(data, dict):
+                # Anything else (a list, an object) is reported by build()/reassign
+                if is_id(data.get('role')):
+                    role_ids.add(data['role'])
+                if is_id(data.get('category')):
+                    category_ids.add(data['category'])
+
+        # One query each for ownership of tasks, roles and categories
+        tasks = {
+            task.id: task
+            for task in (Task.objects.select_for_update(of=('self',)).select_related('category')
+                         .filter(owner=self.user, id__in=task_ids))
+        }
+        self.original_roles = {task.id: task.role_id for task in tasks.values()}
+        self.roles = {role.id: role for role in Role.objects.filter(owner=self.user, id__in=role_ids)}
+        self.categories = {
+            category.id: category
+            for category in TaskCategory.objects.filter(owner=self.user, id__in=category_ids)
+        }
+
+        plan = {op: [] for op in OPERATIONS}
+        for item, result in zip(operations, results):
+            if 'errors' in result:
+                continue
+            op = item['op']
+            task = None
+            if op != 'create':
+                task = tasks.get(item['id'])
+                if task is None:
+                    result['errors'] = {'id': 'Not found'}
+                    continue
+
+            if op in ('create', 'update'):
+                built = self.build(task, item.get('data'), result)
+                if built is not None:
+                    plan[op].append((result, task, built))
+            elif op == 'move':
+                quadrant = item.get('quadrant')
+                if quadrant is not None and quadrant not in QUADRANTS:
+                    result['errors'] = {'quadrant': f"Expected one of {', '.join(QUADRANTS)} or null"}
+                    continue
+                plan[op].append((result, task, quadrant))
+            elif op == 'reassign':
+                role = self.roles.get(item.get('role')) if is_id(item.get('role')) else None
+                if role is None:
+                    result['errors'] = {'role': 'Not found'}
+                    continue
+                plan[op].append((result, task, role))
+            else:
+                plan[op].append((result, task, None))
+        self.check_occurrence_dates(plan['update'])
+        return plan
+
+    def check_occurrence_dates(self, updates):
+        """Flag updates that would schedule two occurrences of one recurrence
+        rule on the same date (``task_unique_occurrence``)."""
+        moving = [
+            (result, task) for result, task, (_, changed) in updates
+            if task.recurrence_rule_id and 'scheduled_date' in changed
+        ]
+        if not moving:
+            return
+        rule_ids = {task.recurrence_rule_id for _, task in moving}
+        # Locked so materialization can't add an occurrence meanwhile
+        list(RecurrenceRule.objects.select_for_update().filter(id__in=rule_ids).values_list('id', flat=True))
+        taken = set(
+            Task.objects.filter(recurrence_rule_id__in=rule_ids)
+            .exclude(id__in=[task.id for _, task in moving])
+            .exclude(scheduled_date__isnull=True)
+            .values_list('recurrence_rule_id', 'scheduled_date')
+        )
+        for result, task in moving:
+            if task.scheduled_date is None:
+                continue
+            key = (task.recurrence_rule_id, task.scheduled_date)
+            if key in taken:
+                result['errors'] = {'scheduled_date': OCCURRENCE_CONFLICT}
+            taken.add(key)
+
+    def build(self, task, data, result):
+        """Validate one create/update payload and return the task to write."""
+        if not isinstance(data, dict):
+            result['errors'] = {'data': 'Expected an object'}
+            return None
+        data = dict(data)
+        role_id = data.pop('role', _missing)
+        category_id = data.pop('category', _missing)
+        serializer = TaskPartialUpdateSerializer(task, data=data, partial=True)
+        errors = {} if serializer.is_valid() else dict(serializer.errors)
+
+        role = _missing
+        if role_id is not _missing:
+            role = self.roles.get(role_id) if is_id(role_id) else None
+            if role is None:
+                errors['role'] = 'Not found'
+        elif task is None:
+            errors['role'] = 'Role is required'
+        if task is None and not data.get('title'):
+            errors['title'] = 'Title is required'
+
+        category = _missing
+        if category_id is not _missing:
+            category = self.categories.get(category_id) if is_id(category_id) else None
+            if category_id is not None and category is None:
+                errors['category'] = 'Not found'
+
+        if errors:
+            result['errors'] = errors
+            return None
+
+        target = task or Task(owner=self.user)
+        changed = set(serializer.validated_data)
+        for field, value in serializer.validated_data.items():
+            setattr(target, field, value)
+        if role is not _missing:
+            target.role = role
+            changed.add('role')
+            if category is _missing and target.category is not None and target.category.role_id != role.id:
+                # The task's category belongs to the role it is leaving
+                category = None
+        if category is not _missing:
+            target.category = category
+            changed.add('category')
+        apply_status(target, self.now)
+        if 'status' in changed:
+            changed.update(['is_completed', 'completed_at'])
+        return target, changed
+
+    def apply(self, plan, results):
+        # (owner, role) rollups to recount once all writes are done
+        touched = set()
+
+        def touch(task):
+            touched.add((task.owner_id, task.role_id))
+            if task.id in self.original_roles:
+                touched.add((task.owner_id, self.original_roles[task.id]))
+
+        if plan['delete']:
+            for result, task, _ in plan['delete']:
+                touch(task)
+                result['status'] = 'ok'
+            deleted_ids = [task.id for _, task, _ in plan['delete']]
+            Tombstone.record_tasks(self.user.id, deleted_ids, now=self.now)
+            Task.objects.filter(id__in=deleted_ids).delete()
+
+        if plan['create']:
+            created = Task.objects.bulk_create([task for _, _, (task, _) in plan['create']])
+            for (result, _, _), task in zip(plan['create'], created):
+                touch(task)
+                result.update(id=task.id, status='ok')
+
+        if plan['update']:
+            fields = {'updated_at'}
+            tasks = []
+            for result, _, (task, changed) in plan['update']:
+                task.updated_at = self.now
+                fields.update(changed)
+                tasks.append(task)
+                touch(task)
+                result['status'] = 'ok'
+            Task.objects.bulk_update(tasks, sorted(fields))
+
+        # Tasks already completed keep their completed_at
+        for result, _, _ in (entry for entry in plan['complete'] if entry[1].is_completed):
+            result['status'] = 'ok'
+        self._set_based([entry for entry in plan['complete'] if not entry[1].is_completed], touch,
+                        status='completed', is_completed=True, completed_at=self.now)
+        self._set_based(plan['uncomplete'], touch, status='not_started', is_completed=False, completed_at=None)
+
+        for quadrant in {value for _, _, value in plan['move']}:
+            items = [entry for entry in plan['move'] if entry[2] == quadrant]
+            self._set_based(items, touch, quadrant=quadrant)
+
+        for role in {value for _, _, value in plan['reassign']}:
+            items = [entry for entry in plan['reassign'] if entry[2] == role]
+            touched.update((task.owner_id, role.id) for _, task, _ in items)
+            # Categories belong to a role; ones left behind are cleared
+            leaving = {task.id for _, task, _ in items if task.category is not None and task.category.role_id != role.id}
+            self._set_based([entry for entry in items if entry[1].id not in leaving], touch, role=role)
+            self._set_based([entry for entry in items if entry[1].id in leaving], touch, role=role, category=None)
+
+        for owner_id, role_id in touched:
+            TaskStats.recount(owner_id, role_id, now=self.now)
+        DataVersion.bump(self.user.id, now=self.now)
+
+    def _set_based(self, items, touch, **values):
+        if not items:
+            return
+        for result, task, _ in items:
+            touch(task)
+            result['status'] = 'ok'
+        Task.objects.filter(id__in=[task.id for _, task, _ in items]).update(updated_at=self.now, **values)
@@ -0,0 +1,138 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.response import Response
+
+# Version key for data shared by every user (the Eisenhower matrix)
+GLOBAL = 'global'
+
+
+class VersionedCache:
+    """Read-through cache for API payloads keyed by a data version.
+
+    Every entry key embeds the owner's current version, so a write never
+    has to find and delete entries: bumping the version makes the old ones
+    unreachable and the backend's TTL/``MAX_ENTRIES`` culling evicts them.
+    Per-user versions mirror ``DataVersion`` (loaded from the database on a
+    miss and overwritten after each committed write); the global version is
+    a timestamp. Hits and misses are counted per namespace in this process.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def shared(self):
+        """Whether all processes see the same entries. A per-process
+        ``LocMemCache`` only sees its own process's version bumps."""
+        return not isinstance(self.backend, LocMemCache)
+
+    # Versions
+
+    def version(self, owner, loader):
+        """``(version, changed_at)`` for ``owner``; ``loader()`` reads it from the database."""
+        key = f'version:{owner}'
+        value = self.backend.get(key)
+        if value is None:
+            value = loader()
+            # add(), not set(): a concurrent write's fresher value wins
+            self.backend.add(key, value)
+        return value
+
+    def set_version(self, owner, value):
+        self.backend.set(f'version:{owner}', value)
+
+    def global_version(self):
+        return self.version(GLOBAL, lambda: (time.time_ns(), None))
+
+    def bump_global(self):
+        self.set_version(GLOBAL, (time.time_ns(), None))
+
+    # Entries
+
+    def make_key(self, namespace, owner, version, parts):
+        digest = hashlib.sha1(':'.join(map(str, parts)).encode()).hexdigest()
+        return f'{namespace}:{owner}:{version}:{digest}'
+
+    def get(self, namespace, owner, version, parts):
+        value = self.backend.get(self.make_key(namespace, owner, version, parts))
+        self.count(namespace, 'hits' if value is not None else 'misses')
+        return value
+
+    def set(self, namespace, owner, version, parts, value):
+        self.backend.set(self.make_key(namespace, owner, version, parts), value)
+
+    def count(self, namespace, outcome):
+        with self._lock:
+            self._counters[namespace][outcome] += 1
+
+    def stats(self):
+        """Hit/miss counts per namespace since this process started."""
+        with self._lock:
+            return {namespace: dict(counts) for namespace, counts in self._counters.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
+
+    def metrics(self):
+        """``stats()`` as a collector for ``core.metrics.registry``."""
+        samples = [
+            ({'namespace': namespace, 'outcome': outcome}, count)
+            for namespace, counts in sorted(self.stats().items())
+            for outcome, count in counts.items()
+        ]
+        return [('api_cache_requests_total', 'counter', 'API cache lookups by namespace and outcome', samples)]
+
+
+api_cache = VersionedCache(getattr(settings, 'API_CACHE_ALIAS', 'default'))
+
+
+def cached_action(namespace):
+    """Serve a viewset action's response data from ``api_cache``.
+
+    The view's ``cache_key(request, namespace)`` returns ``(owner, version,
+    parts)``, or ``None`` when the response must not be cached right now.
+    Only 200 responses are stored; ``X-Cache`` reports HIT or MISS.
+    """
+    def decorator(action):
+        @wraps(action)
+        def wrapper(self, request, *args, **kwargs):
+            key = self.cache_key(request, namespace)
+            if key is not None:
+                data = api_cache.get(namespace, *key)
+                if data is not None:
+                    response = Response(data)
+                    response['X-Cache'] = 'HIT'
+                    return response
+
+            response = action(self, request, *args, **kwargs)
+            if key is not None and response.status_code == 200:
+                api_cache.set(namespace, *key, response.data)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+class CachedViewMixin:
+    """Default ``cache_key`` for ``cached_action``: the user's data version
+    and the full request path (filters and pagination included)."""
+
+    def cache_key(self, request, namespace):
+        from .models import DataVersion  # models imports this module
+
+        version, _ = DataVersion.cached(request.user.id)
+        return request.user.id, version, [request.get_full_path()]
@@ -0,0 +1,65 @@
+import hashlib
+from functools import wraps
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import DataVersion
+
+
+def conditional_get(action):
+    """Answer ``If-None-Match``/``If-Modified-Since`` for a viewset action.
+
+    The view's ``conditional_validators(request)`` supplies the ETag key
+    and last-modified time; when the client's copy is current a 304 is
+    returned before ``action`` queries or serializes anything.
+    """
+    @wraps(action)
+    def wrapper(self, request, *args, **kwargs):
+        validators = self.conditional_validators(request)
+        if validators is not None:
+            etag, last_modified = validators
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                stamp_validators(not_modified, etag, last_modified)
+                return not_modified
+
+        response = action(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            # Validators that weren't usable up front (e.g. stale rollups)
+            # are valid again once the action has brought them up to date.
+            validators = validators or self.conditional_validators(request)
+            if validators is not None:
+                stamp_validators(response, *validators)
+        return response
+    return wrapper
+
+
+def stamp_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    # Let browsers keep the body but revalidate it on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization',))
+
+
+class ConditionalGetMixin:
+    """Validators derived from the requesting user's ``DataVersion``."""
+
+    def conditional_validators(self, request, extra=()):
+        """``(etag, last_modified)`` for the current response, or ``None``.
+
+        ``extra`` lists anything besides stored data the response depends on.
+        """
+        version, changed_at = DataVersion.cached(request.user.id)
+        parts = [request.user.id, version, request.accepted_media_type, request.get_full_path(), *extra]
+        etag = 'W/"%s"' % hashlib.sha1(':'.join(map(str, parts)).encode()).hexdigest()
+
+        # Last-Modified has one-second resolution, so a change later in the
+        # same second would go unnoticed; rely on the ETag alone until then.
+        last_modified = None
+        if changed_at is not None and (timezone.now() - changed_at).total_seconds() >= 1:
+            last_modified = int(changed_at.timestamp()) + 1
+        return etag, last_modified
@@ -0,0 +1,68 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+# Fields clients may pass in ?ordering=, optionally prefixed with '-'
+ORDERING_FIELDS = [
+    'created_at', 'updated_at', 'due_date', 'scheduled_date',
+    'priority', 'status', 'quadrant', 'title'
+]
+
+DATE_FIELDS = ['due_date', 'scheduled_date']
+
+
+def parse_ordering(value, default):
+    """Turn ``?ordering=`` into an ``order_by`` list, ignoring unknown fields."""
+    ordering = []
+    for term in (value or '').split(','):
+        term = term.strip()
+        if term.lstrip('-') in ORDERING_FIELDS and term.lstrip('-') not in [o.lstrip('-') for o in ordering]:
+            ordering.append(term)
+    if not ordering:
+        return list(default)
+    # A unique tie-breaker keeps pages stable between requests
+    return ordering + ['-id' if ordering[0].startswith('-') else 'id']
+
+
+def parse_date_bound(name, value, end=False):
+    """Parse a ``start_date``/``end_date`` query parameter.
+
+    Accepts a full ISO datetime, used as-is, or a plain ``YYYY-MM-DD`` date
+    covering that whole day in the current time zone. Returns the aware
+    datetime of the (inclusive) start bound or the (exclusive) end bound.
+    """
+    try:
+        day = parse_date(value)
+        moment = None if day else parse_datetime(value)
+    except ValueError:
+        day = moment = None
+
+    if day is not None:
+        if end:
+            day += timedelta(days=1)
+        return timezone.make_aware(datetime.combine(day, time.min))
+    if moment is None:
+        raise ValidationError({name: 'Expected an ISO date or datetime'})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment + timedelta(microseconds=1) if end else moment
+
+
+def filter_date_window(queryset, field, start, end):
+    """Restrict ``queryset`` to ``start <= field < end`` (either bound optional)."""
+    if field == 'scheduled_date':
+        # DateField: compare against the calendar dates of the bounds
+        if start is not None:
+            queryset = queryset.filter(scheduled_date__gte=timezone.localdate(start, start.tzinfo))
+        if end is not None:
+            last_day = timezone.localdate(end - timedelta(microseconds=1), end.tzinfo)
+            queryset = queryset.filter(scheduled_date__lte=last_day)
+        return queryset
+
+    if start is not None:
+        queryset = queryset.filter(due_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(due_date__lt=end)
+    return queryset
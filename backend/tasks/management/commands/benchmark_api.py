@@ -0,0 +1,263 @@
+import json
+import os
+import platform
+import random
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+
+from tasks.seeding import DEFAULT_PASSWORD, DEFAULT_PREFIX, NOUNS
+
+User = get_user_model()
+
+# name: (weight in the default mix, writes data)
+ENDPOINTS = {
+    'tasks.list': (20, False),
+    'tasks.list_filtered': (10, False),
+    'tasks.list_cursor': (5, False),
+    'tasks.retrieve': (15, False),
+    'tasks.analytics': (8, False),
+    'tasks.board': (5, False),
+    'tasks.search': (5, False),
+    'roles.list': (8, False),
+    'categories.list': (6, False),
+    'sync': (8, False),
+    'tasks.toggle': (8, True),
+    'accounts.token': (2, False),
+}
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(samples, elapsed=None):
+    latencies = sorted(sample['ms'] for sample in samples)
+    queries = [sample['queries'] for sample in samples]
+    summary = {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample['status'] >= 400),
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else None,
+        },
+        'queries_per_request': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+        'cache_hits': sum(1 for sample in samples if sample['cache_hit']),
+    }
+    if elapsed is not None:
+        summary['duration_s'] = round(elapsed, 3)
+        summary['throughput_rps'] = round(len(samples) / elapsed, 2) if elapsed else None
+    return summary
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive the real URLconf (api/tasks/..., api/accounts/token/) in-process '
+        'with concurrent clients as users seeded by seed_load_data, and report '
+        'p50/p95/p99 latency, throughput and queries per request as JSON. The '
+        'request plan is fixed by --seed, so runs are repeatable.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Measured requests')
+        parser.add_argument('--warmup', type=int, default=100, help='Unmeasured requests run first')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--users', type=int, default=10, help='Seeded users to spread requests over')
+        parser.add_argument(
+            '--endpoints',
+            help=f"Comma-separated subset of: {', '.join(ENDPOINTS)} (default: all, weighted)"
+        )
+        parser.add_argument('--read-only', action='store_true', help='Leave out endpoints that write')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default=DEFAULT_PREFIX)
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS')
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+
+    def handle(self, *args, **options):
+        endpoints = self.select_endpoints(options)
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive')
+
+        if connection.vendor == 'sqlite' and any(ENDPOINTS[name][1] for name in endpoints):
+            self.stderr.write(
+                "SQLite allows one writer at a time: concurrent writes can fail with 'database is locked' "
+                "unless the database OPTIONS set transaction_mode to IMMEDIATE. Use --read-only to skip them."
+            )
+
+        users = list(User.objects.filter(username__startswith=f"{options['prefix']}-")
+                     .order_by('id')[:options['users']])
+        if not users:
+            raise CommandError(f"No users named {options['prefix']}-*; run seed_load_data first")
+        client = Client(SERVER_NAME=options['host'], raise_request_exception=False)
+        contexts = [self.user_context(client, user, options['password']) for user in users]
+
+        rng = random.Random(options['seed'])
+        names = list(endpoints)
+        weights = [endpoints[name] for name in names]
+        plan = [
+            self.build_request(rng, name, rng.choice(contexts), options['password'])
+            for name in rng.choices(names, weights, k=options['warmup'] + options['requests'])
+        ]
+        warmup, measured = plan[:options['warmup']], plan[options['warmup']:]
+
+        self.run(warmup, options)
+        started = time.perf_counter()
+        samples = self.run(measured, options)
+        elapsed = time.perf_counter() - started
+
+        by_endpoint = {}
+        for sample in samples:
+            by_endpoint.setdefault(sample['endpoint'], []).append(sample)
+        report = {
+            'benchmark': 'api',
+            'timestamp': datetime.now(dt_timezone.utc).isoformat(),
+            'config': {
+                key: options[key]
+                for key in ('requests', 'warmup', 'concurrency', 'seed', 'prefix', 'read_only')
+            } | {'users': len(contexts), 'endpoints': names},
+            'environment': {
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'cpu_count': os.cpu_count(),
+            },
+            'totals': summarize(samples, elapsed),
+            'endpoints': {name: summarize(by_endpoint[name]) for name in sorted(by_endpoint)},
+        }
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            totals = report['totals']
+            self.stdout.write(
+                f"{totals['requests']} requests in {totals['duration_s']}s "
+                f"({totals['throughput_rps']} req/s), p50 {totals['latency_ms']['p50']} ms, "
+                f"p95 {totals['latency_ms']['p95']} ms, p99 {totals['latency_ms']['p99']} ms, "
+                f"{totals['errors']} errors; report written to {options['output']}"
+            )
+        else:
+            self.stdout.write(output)
+
+    def select_endpoints(self, options):
+        if options['endpoints']:
+            names = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+            unknown = [name for name in names if name not in ENDPOINTS]
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(unknown)}")
+        else:
+            names = list(ENDPOINTS)
+        if options['read_only']:
+            names = [name for name in names if not ENDPOINTS[name][1]]
+        if not names:
+            raise CommandError('No endpoints selected')
+        return {name: ENDPOINTS[name][0] for name in names}
+
+    def user_context(self, client, user, password):
+        response = client.post(
+            '/api/accounts/token/', {'email': user.email, 'password': password}, content_type='application/json'
+        )
+        if response.status_code != 200:
+            raise CommandError(f'Could not log in as {user.email} ({response.status_code}); check --password')
+        return {
+            'email': user.email,
+            'token': response.json()['access'],
+            'role_ids': list(user.roles.order_by('id').values_list('id', flat=True)),
+            'task_ids': list(user.tasks.order_by('id').values_list('id', flat=True)[:1000]),
+        }
+
+    def build_request(self, rng, name, context, password):
+        """``(name, method, path, body, token)``, all decided up front."""
+        task_id = rng.choice(context['task_ids']) if context['task_ids'] else 0
+        role_id = rng.choice(context['role_ids']) if context['role_ids'] else 0
+        token = context['token']
+        if name == 'tasks.list':
+            return name, 'get', f'/api/tasks/tasks/?page={rng.randint(1, 3)}', None, token
+        if name == 'tasks.list_filtered':
+            status = rng.choice(['not_started', 'in_progress', 'completed'])
+            return name, 'get', f'/api/tasks/tasks/?role={role_id}&status={status}', None, token
+        if name == 'tasks.list_cursor':
+            return name, 'get', '/api/tasks/tasks/?cursor=&count=false', None, token
+        if name == 'tasks.retrieve':
+            return name, 'get', f'/api/tasks/tasks/{task_id}/', None, token
+        if name == 'tasks.analytics':
+            return name, 'get', '/api/tasks/tasks/analytics/', None, token
+        if name == 'tasks.board':
+            return name, 'get', '/api/tasks/tasks/board/', None, token
+        if name == 'tasks.search':
+            word = rng.choice(NOUNS).split()[-1]
+            return name, 'get', f'/api/tasks/tasks/search/?q={word[:rng.randint(3, len(word))]}', None, token
+        if name == 'roles.list':
+            return name, 'get', '/api/tasks/roles/', None, token
+        if name == 'categories.list':
+            return name, 'get', '/api/tasks/categories/', None, token
+        if name == 'sync':
+            return name, 'get', '/api/tasks/sync/', None, token
+        if name == 'tasks.toggle':
+            return name, 'post', f'/api/tasks/tasks/{task_id}/toggle_complete/', {}, token
+        return name, 'post', '/api/accounts/token/', {'email': context['email'], 'password': password}, None
+
+    def run(self, plan, options):
+        """Send ``plan`` from ``--concurrency`` threads; returns one sample per request."""
+        samples = []
+        lock = threading.Lock()
+        position = iter(range(len(plan)))
+
+        def worker():
+            client = Client(SERVER_NAME=options['host'], raise_request_exception=False)
+            counter = {'queries': 0}
+
+            def count_queries(execute, sql, params, many, context):
+                counter['queries'] += 1
+                return execute(sql, params, many, context)
+
+            results = []
+            # Connections are per thread, so this only counts this worker's queries
+            with connection.execute_wrapper(count_queries):
+                while True:
+                    with lock:
+                        index = next(position, None)
+                    if index is None:
+                        break
+                    name, method, path, body, token = plan[index]
+                    headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+                    before = counter['queries']
+                    started = time.perf_counter()
+                    if method == 'get':
+                        response = client.get(path, **headers)
+                    else:
+                        response = client.post(path, body, content_type='application/json', **headers)
+                    results.append({
+                        'endpoint': name,
+                        'ms': round((time.perf_counter() - started) * 1000, 3),
+                        'status': response.status_code,
+                        'queries': counter['queries'] - before,
+                        'cache_hit': response.get('X-Cache') == 'HIT',
+                    })
+            connections.close_all()
+            with lock:
+                samples.extend(results)
+
+        threads = [threading.Thread(target=worker) for _ in range(min(options['concurrency'], len(plan)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import platform
+import random
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from asgiref.sync import ThreadSensitiveContext
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.test import AsyncClient, Client, override_settings
+
+from . import benchmark_api
+from .benchmark_api import summarize
+
+User = get_user_model()
+
+# Endpoints tasks.async_views serves under ASGI
+ASYNC_ENDPOINTS = ['tasks.list', 'tasks.list_cursor', 'tasks.retrieve', 'tasks.analytics', 'roles.list', 'categories.list']
+
+MODES = {
+    'wsgi': 'core.urls',
+    'asgi': 'core.urls_async',
+}
+
+
+def queries_from_timing(response):
+    """Query count from the ``Server-Timing`` header ProfilingMiddleware adds."""
+    for metric in response.get('Server-Timing', '').split(','):
+        name, _, params = metric.strip().partition(';')
+        if name == 'db' and 'desc="' in params:
+            return int(params.split('desc="')[1].split()[0])
+    return 0
+
+
+class Command(benchmark_api.Command):
+    help = (
+        'Compare the sync views under WSGI with tasks.async_views under ASGI '
+        'at high concurrency: the same seeded request plan is sent through '
+        "Django's WSGI handler from --concurrency threads and through its ASGI "
+        'handler from --concurrency asyncio tasks, in-process, as users seeded '
+        'by seed_load_data. Reports p50/p95/p99 latency and throughput per '
+        'mode as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(requests=2000, warmup=200, concurrency=64, read_only=True)
+        parser.add_argument('--modes', default='wsgi,asgi', help=f"Comma-separated subset of: {', '.join(MODES)}")
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = [mode for mode in modes if mode not in MODES]
+        if unknown or not modes:
+            raise CommandError(f"Unknown modes: {', '.join(unknown) or '(none)'}")
+        options['endpoints'] = options['endpoints'] or ','.join(ASYNC_ENDPOINTS)
+        endpoints = self.select_endpoints(options)
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive')
+
+        users = list(User.objects.filter(username__startswith=f"{options['prefix']}-")
+                     .order_by('id')[:options['users']])
+        if not users:
+            raise CommandError(f"No users named {options['prefix']}-*; run seed_load_data first")
+        client = Client(SERVER_NAME=options['host'], raise_request_exception=False)
+        contexts = [self.user_context(client, user, options['password']) for user in users]
+
+        rng = random.Random(options['seed'])
+        names = list(endpoints)
+        weights = [endpoints[name] for name in names]
+        plan = [
+            self.build_request(rng, name, rng.choice(contexts), options['password'])
+            for name in rng.choices(names, weights, k=options['warmup'] + options['requests'])
+        ]
+        if any(method != 'get' for _, method, *_ in plan):
+            raise CommandError('Only GET endpoints can be compared')
+        warmup, measured = plan[:options['warmup']], plan[options['warmup']:]
+
+        results = {}
+        for mode in modes:
+            # Server-Timing carries each request's query count in both modes
+            with override_settings(ROOT_URLCONF=MODES[mode], SERVER_TIMING=True):
+                runner = self.run_wsgi if mode == 'wsgi' else self.run_asgi
+                runner(warmup, options)
+                started = time.perf_counter()
+                samples = runner(measured, options)
+                elapsed = time.perf_counter() - started
+            by_endpoint = {}
+            for sample in samples:
+                by_endpoint.setdefault(sample['endpoint'], []).append(sample)
+            results[mode] = {
+                'totals': summarize(samples, elapsed),
+                'endpoints': {name: summarize(by_endpoint[name]) for name in sorted(by_endpoint)},
+            }
+
+        report = {
+            'benchmark': 'asgi',
+            'timestamp': datetime.now(dt_timezone.utc).isoformat(),
+            'config': {
+                key: options[key] for key in ('requests', 'warmup', 'concurrency', 'seed', 'prefix')
+            } | {'users': len(contexts), 'endpoints': names, 'modes': modes},
+            'environment': {
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'cpu_count': os.cpu_count(),
+            },
+            'modes': results,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            for mode, result in results.items():
+                totals = result['totals']
+                self.stdout.write(
+                    f"{mode}: {totals['requests']} requests in {totals['duration_s']}s "
+                    f"({totals['throughput_rps']} req/s), p50 {totals['latency_ms']['p50']} ms, "
+                    f"p95 {totals['latency_ms']['p95']} ms, p99 {totals['latency_ms']['p99']} ms, "
+                    f"{totals['errors']} errors"
+                )
+            self.stdout.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def sample(self, name, response, started):
+        return {
+            'endpoint': name,
+            'ms': round((time.perf_counter() - started) * 1000, 3),
+            'status': response.status_code,
+            'queries': queries_from_timing(response),
+            'cache_hit': response.get('X-Cache') == 'HIT',
+        }
+
+    def run_wsgi(self, plan, options):
+        """Send ``plan`` from ``--concurrency`` threads through the WSGI handler."""
+        samples = []
+        lock = threading.Lock()
+        position = iter(range(len(plan)))
+
+        def worker():
+            client = Client(SERVER_NAME=options['host'], raise_request_exception=False)
+            results = []
+            while True:
+                with lock:
+                    index = next(position, None)
+                if index is None:
+                    break
+                name, _, path, _, token = plan[index]
+                started = time.perf_counter()
+                response = client.get(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+                results.append(self.sample(name, response, started))
+            connections.close_all()
+            with lock:
+                samples.extend(results)
+
+        threads = [threading.Thread(target=worker) for _ in range(min(options['concurrency'], len(plan)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return samples
+
+    def run_asgi(self, plan, options):
+        """Send ``plan`` from ``--concurrency`` asyncio tasks through the ASGI handler."""
+        position = iter(range(len(plan)))
+
+        async def worker(client):
+            results = []
+            for index in position:
+                name, _, path, _, token = plan[index]
+                started = time.perf_counter()
+                # Like ASGIHandler: sync code of one request shares a thread
+                async with ThreadSensitiveContext():
+                    response = await client.get(path, headers={'Authorization': f'Bearer {token}'})
+                results.append(self.sample(name, response, started))
+            return results
+
+        async def main():
+            client = AsyncClient(raise_request_exception=False, headers={'Host': options['host']})
+            workers = [worker(client) for _ in range(min(options['concurrency'], len(plan)))]
+            return [sample for results in await asyncio.gather(*workers) for sample in results]
+
+        samples = asyncio.run(main())
+        connections.close_all()
+        return samples
@@ -0,0 +1,90 @@
+import copy
+import json
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from .benchmark_api import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure per-request database connection overhead on the default '
+        'database: a new connection per request (CONN_MAX_AGE=0), a '
+        'persistent connection (CONN_MAX_AGE>0) and, on PostgreSQL with '
+        'psycopg[pool], a pooled connection. Each simulated request does '
+        "what Django's request_started/request_finished handlers do around "
+        'one small query.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per mode')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--query', default='SELECT 1')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be positive')
+        default = connections['default']
+        base = copy.deepcopy(default.settings_dict)
+        pool_options = base['OPTIONS'].pop('pool', None)
+
+        modes = {
+            'new_connection': dict(base, CONN_MAX_AGE=0),
+            'persistent': dict(base, CONN_MAX_AGE=600),
+        }
+        if default.vendor == 'postgresql':
+            modes['pool'] = dict(base, CONN_MAX_AGE=0, OPTIONS=dict(base['OPTIONS'], pool=pool_options or True))
+
+        report = {'database': default.vendor, 'query': options['query'], 'requests': options['requests'], 'modes': {}}
+        for mode, settings_dict in modes.items():
+            # A separate alias keeps the benchmark's pool apart from the app's
+            wrapper = type(default)(settings_dict, alias=f'benchmark_{mode}')
+            try:
+                self.simulate(wrapper, options['query'], options['warmup'])
+                latencies, connects = self.simulate(wrapper, options['query'], options['requests'])
+            except ImproperlyConfigured as e:
+                self.stderr.write(f'Skipping {mode}: {e}')
+                continue
+            finally:
+                wrapper.close()
+            if mode == 'pool':
+                wrapper.close_pool()
+
+            latencies.sort()
+            report['modes'][mode] = {
+                'mean_ms': round(sum(latencies) / len(latencies), 3),
+                'p50_ms': percentile(latencies, 0.50),
+                'p95_ms': percentile(latencies, 0.95),
+                'p99_ms': percentile(latencies, 0.99),
+                # With a pool these are checkouts, not new server connections
+                'connects': connects,
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self.stdout.write(f"{'mode':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'connects':>10}")
+        for mode, stats in report['modes'].items():
+            self.stdout.write(
+                f"{mode:<16}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}"
+                f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['connects']:>10}"
+            )
+
+    def simulate(self, wrapper, query, requests):
+        """Latency of each simulated request (ms) and how many had to connect."""
+        latencies = []
+        connects = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            wrapper.close_if_unusable_or_obsolete()  # request_started
+            connects += wrapper.connection is None
+            with wrapper.cursor() as cursor:
+                cursor.execute(query)
+                cursor.fetchall()
+            wrapper.close_if_unusable_or_obsolete()  # request_finished
+            latencies.append(round((time.perf_counter() - started) * 1000, 3))
+        return latencies, connects
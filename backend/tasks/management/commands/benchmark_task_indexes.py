@@ -0,0 +1,108 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasks.models import Role, Task
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed throwaway tasks and print query plans for the owner-scoped Task '
+        'access paths with and without the composite indexes. Everything runs '
+        'in one transaction that is rolled back; dropping the indexes holds '
+        'an exclusive lock on the task table until it finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=50000, help='Tasks to seed for the benchmark user')
+        parser.add_argument('--noise-users', type=int, default=20, help='Other users whose tasks share the table')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            owner = self.seed(rng, options['tasks'], options['noise_users'])
+            queries = self.access_paths(owner)
+
+            self.drop_indexes()
+            self.analyze()
+            self.stdout.write(self.style.MIGRATE_HEADING('Before (without indexes)'))
+            self.explain_all(queries)
+
+            self.create_indexes()
+            self.analyze()
+            self.stdout.write(self.style.MIGRATE_HEADING('After (with indexes)'))
+            self.explain_all(queries)
+
+            transaction.set_rollback(True)
+
+    def seed(self, rng, task_count, noise_users):
+        now = timezone.now()
+        owners = []
+        for i in range(noise_users + 1):
+            user = User.objects.create(username=f'index-bench-{i}', email=f'index-bench-{i}@example.com')
+            roles = Role.objects.bulk_create(Role(name=f'Role {r}', owner=user) for r in range(5))
+            owners.append((user, roles))
+
+        tasks = []
+        per_user = max(task_count // (noise_users + 1), 1)
+        for index, (user, roles) in enumerate(owners):
+            count = task_count if index == 0 else per_user
+            for _ in range(count):
+                is_completed = rng.random() < 0.4
+                tasks.append(Task(
+                    title='Benchmark task',
+                    owner=user,
+                    role=rng.choice(roles),
+                    status='completed' if is_completed else rng.choice(['not_started', 'in_progress']),
+                    is_completed=is_completed,
+                    priority=rng.choice([1, 2, 3]),
+                    quadrant=rng.choice(['q1', 'q2', 'q3', 'q4', None]),
+                    due_date=now + timedelta(days=rng.randint(-60, 60)) if rng.random() < 0.7 else None,
+                ))
+        Task.objects.bulk_create(tasks, batch_size=2000)
+        self.analyze()
+        return owners[0][0]
+
+    def access_paths(self, owner):
+        tasks = Task.objects.filter(owner=owner)
+        role_id = owner.roles.values_list('id', flat=True).first()
+        return {
+            'list': tasks.order_by('-created_at', '-id')[:10],
+            'status': tasks.filter(status='in_progress').order_by('-created_at')[:10],
+            'priority': tasks.filter(priority=1).order_by('-created_at')[:10],
+            'quadrant': tasks.filter(quadrant='q1').order_by('-created_at')[:10],
+            'role': tasks.filter(role_id=role_id).order_by('-created_at')[:10],
+            'overdue': tasks.filter(is_completed=False, due_date__lt=timezone.now()).values('id'),
+        }
+
+    def explain_all(self, queries):
+        analyze = connection.vendor == 'postgresql'
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.SQL_KEYWORD(f'-- {name}'))
+            plan = queryset.explain(analyze=True) if analyze else queryset.explain()
+            self.stdout.write(plan)
+            self.stdout.write('')
+
+    # DDL is issued directly because SQLite's schema editor refuses to run
+    # inside an open transaction.
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for index in Task._meta.indexes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+    def create_indexes(self):
+        schema_editor = connection.schema_editor(atomic=False)
+        with connection.cursor() as cursor:
+            for index in Task._meta.indexes:
+                cursor.execute(str(index.create_sql(Task, schema_editor)))
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Task._meta.db_table}')
@@ -0,0 +1,93 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import Role, Task, TaskCategory
+from tasks.serializers import FastTaskListSerializer, TaskListSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare TaskListSerializer with the values()-based FastTaskListSerializer '
+        'on seeded tasks. Seeding runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,100000',
+            help='Comma-separated row counts to benchmark'
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per size; the best time is reported')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options['sizes'].split(','))
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            owner = User.objects.create(username='serializer-bench', email='serializer-bench@example.com')
+            roles = Role.objects.bulk_create(Role(name=f'Role {r}', owner=owner) for r in range(5))
+            categories = TaskCategory.objects.bulk_create(
+                TaskCategory(name=f'Category {c}', owner=owner, role=roles[c % len(roles)]) for c in range(5)
+            )
+
+            self.stdout.write(f"{'rows':>8}  {'serializer ms':>14}  {'fast path ms':>13}  {'speedup':>8}")
+            seeded = 0
+            for size in sizes:
+                self.seed(rng, owner, roles, categories, size - seeded)
+                seeded = size
+                tasks = (Task.objects.filter(owner=owner)
+                         .select_related('role', 'category')
+                         .order_by('-created_at', '-id'))
+
+                slow = self.best_of(options['repeat'], lambda: TaskListSerializer(list(tasks), many=True).data)
+                fast = self.best_of(options['repeat'], lambda: FastTaskListSerializer(
+                    list(FastTaskListSerializer.values(tasks))).data)
+                if slow[1] != fast[1]:
+                    raise CommandError(f'Fast path output differs from TaskListSerializer at {size} rows')
+
+                self.stdout.write(
+                    f'{size:>8}  {slow[0] * 1000:>14.1f}  {fast[0] * 1000:>13.1f}  {slow[0] / fast[0]:>7.1f}x'
+                )
+
+            transaction.set_rollback(True)
+
+    def seed(self, rng, owner, roles, categories, count):
+        now = timezone.now()
+        Task.objects.bulk_create((
+            Task(
+                title=f'Benchmark task {i}',
+                description='Seeded by benchmark_task_serializers',
+                owner=owner,
+                role=rng.choice(roles),
+                category=rng.choice(categories) if rng.random() < 0.6 else None,
+                status=rng.choice(['not_started', 'in_progress', 'completed']),
+                priority=rng.choice([1, 2, 3]),
+                quadrant=rng.choice(['q1', 'q2', 'q3', 'q4', None]),
+                estimated_hours=Decimal(rng.randint(0, 40)) / 4,
+                due_date=now + timedelta(hours=rng.randint(-1000, 1000)) if rng.random() < 0.7 else None,
+            )
+            for i in range(count)
+        ), batch_size=2000)
+
+    def best_of(self, repeat, build):
+        """Fetch-and-serialize time (best of ``repeat``) and the output."""
+        best, data = None, None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            data = build()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, [dict(row) for row in data]
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.recurrence import adopt_recurring_tasks, materialize_occurrences
+
+
+class Command(BaseCommand):
+    help = 'Create recurring task occurrences up to a horizon (safe to re-run and to run concurrently)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='How many days ahead to materialize occurrences'
+        )
+
+    def handle(self, *args, **options):
+        rules = adopt_recurring_tasks()
+        if rules:
+            self.stdout.write(f'Created {len(rules)} recurrence rule(s) from recurring tasks')
+
+        horizon = timezone.localdate() + timedelta(days=options['days'])
+        created = materialize_occurrences(horizon=horizon)
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized {created} occurrence(s) through {horizon.isoformat()}'
+        ))
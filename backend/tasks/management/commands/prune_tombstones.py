@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete sync tombstones older than the retention period; older sync cursors then get a full resync'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30),
+            help='Keep tombstones this many days (should match SYNC_TOMBSTONE_RETENTION_DAYS)'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstone(s) older than {cutoff.isoformat()}'))
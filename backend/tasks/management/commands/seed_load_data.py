@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.seeding import DEFAULT_PASSWORD, DEFAULT_PREFIX, SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Deterministically seed USERS x ROLES x TASKS synthetic tasks (with '
+        'categories, comments and recurrence rules) for load testing. Users '
+        'are named <prefix>-<n>@example.com and share --password.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--roles', type=int, default=4, help='Roles per user')
+        parser.add_argument('--tasks', type=int, default=250, help='Tasks per role')
+        parser.add_argument('--recurring', type=float, default=0.05, help='Share of tasks created by recurrence rules')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default=DEFAULT_PREFIX)
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded users with this prefix first')
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['roles'], options['tasks']) < 1:
+            raise CommandError('--users, --roles and --tasks must be positive')
+        if not 0 <= options['recurring'] <= 1:
+            raise CommandError('--recurring must be between 0 and 1')
+
+        generator = SyntheticDataGenerator(
+            options['users'],
+            options['roles'],
+            options['tasks'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+            password=options['password'],
+            recurring=options['recurring']
+        )
+        existing = generator.existing_users()
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f"Users named {options['prefix']}-* already exist; pass --clear to replace them")
+            deleted, _ = existing.delete()
+            self.stdout.write(f'Deleted {deleted} rows from a previous run')
+
+        def progress(done, counts):
+            if done % 10 == 0 or done == options['users']:
+                self.stdout.write(f"  {done}/{options['users']} users, {counts['tasks']} tasks")
+
+        counts = generator.run(progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded ' + ', '.join(f'{count} {name.replace("_", " ")}' for name, count in counts.items())
+        ))
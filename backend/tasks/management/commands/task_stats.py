@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.utils import timezone
+
+from tasks.analytics import COUNTER_FIELDS, collect_task_stats
+from tasks.models import Task, TaskCategoryStats, TaskStats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify the per-user TaskStats analytics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare the rollups against the task table without writing'
+        )
+        parser.add_argument(
+            '--user',
+            help='Only process the user with this email address'
+        )
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['user']:
+            try:
+                owner = User.objects.get(email=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        if options['verify']:
+            mismatches = self.verify(owner)
+            if mismatches:
+                raise CommandError(f'{mismatches} rollup row(s) out of date')
+            self.stdout.write(self.style.SUCCESS('Task stats are up to date'))
+            return
+
+        rows = TaskStats.rebuild(owner=owner)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(rows)} task stats row(s)'))
+
+    def verify(self, owner):
+        now = timezone.now()
+        tasks = Task.objects.all()
+        stats = TaskStats.objects.all()
+        if owner is not None:
+            tasks = tasks.filter(owner=owner)
+            stats = stats.filter(owner=owner)
+
+        expected = {
+            (row['owner_id'], row['role_id']): row
+            for row in collect_task_stats(tasks, now=now)
+        }
+        mismatches = 0
+        for row in stats:
+            actual = expected.pop((row.owner_id, row.role_id), None)
+            if row.overdue_horizon is not None and row.overdue_horizon <= now:
+                # The next read recounts overdue from the tasks (refresh_overdue),
+                # so the stored count isn't stale; compare the rest without saving
+                row.overdue = actual['overdue'] if actual else 0
+            if actual is None:
+                if any(getattr(row, field) for field in COUNTER_FIELDS):
+                    mismatches += 1
+                    self.stdout.write(f'owner={row.owner_id} role={row.role_id}: no tasks, stale counters')
+                continue
+            diff = {
+                field: (getattr(row, field), actual[field])
+                for field in COUNTER_FIELDS
+                if getattr(row, field) != actual[field]
+            }
+            if diff:
+                mismatches += 1
+                self.stdout.write(f'owner={row.owner_id} role={row.role_id}: {diff}')
+
+        for owner_id, role_id in expected:
+            mismatches += 1
+            self.stdout.write(f'owner={owner_id} role={role_id}: missing rollup row')
+        return mismatches + self.verify_categories(tasks, owner)
+
+    def verify_categories(self, tasks, owner):
+        expected = {
+            (row['owner_id'], row['role_id'], row['category_id']): row['total']
+            for row in (tasks.filter(category__isnull=False).order_by()
+                        .values('owner_id', 'role_id', 'category_id').annotate(total=Count('id')))
+        }
+        stats = TaskCategoryStats.objects.all() if owner is None else TaskCategoryStats.objects.filter(owner=owner)
+        actual = {
+            (row.owner_id, row.role_id, row.category_id): row.total
+            for row in stats if row.total
+        }
+        mismatches = 0
+        for key in sorted(expected.keys() | actual.keys()):
+            if expected.get(key, 0) != actual.get(key, 0):
+                mismatches += 1
+                self.stdout.write(
+                    f'owner={key[0]} role={key[1]} category={key[2]}: '
+                    f'{actual.get(key, 0)} counted, {expected.get(key, 0)} tasks'
+                )
+        return mismatches
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+
+def populate_task_stats(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskStats = apps.get_model('tasks', 'TaskStats')
+    now = timezone.now()
+    rows = (Task.objects.order_by()
+            .values('owner_id', 'role_id')
+            .annotate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(is_completed=True)),
+                not_started=Count('id', filter=Q(status='not_started')),
+                in_progress=Count('id', filter=Q(status='in_progress')),
+                overdue=Count('id', filter=Q(due_date__lt=now, is_completed=False)),
+                priority_high=Count('id', filter=Q(priority=1)),
+                priority_medium=Count('id', filter=Q(priority=2)),
+                priority_low=Count('id', filter=Q(priority=3)),
+                quadrant_q1=Count('id', filter=Q(quadrant='q1')),
+                quadrant_q2=Count('id', filter=Q(quadrant='q2')),
+                quadrant_q3=Count('id', filter=Q(quadrant='q3')),
+                quadrant_q4=Count('id', filter=Q(quadrant='q4')),
+                overdue_horizon=Min('due_date', filter=Q(due_date__gte=now, is_completed=False)),
+            ))
+    TaskStats.objects.bulk_create(TaskStats(**row) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_recurrence_task_scheduled_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('not_started', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('overdue', models.IntegerField(default=0)),
+                ('priority_high', models.IntegerField(default=0)),
+                ('priority_medium', models.IntegerField(default=0)),
+                ('priority_low', models.IntegerField(default=0)),
+                ('quadrant_q1', models.IntegerField(default=0)),
+                ('quadrant_q2', models.IntegerField(default=0)),
+                ('quadrant_q3', models.IntegerField(default=0)),
+                ('quadrant_q4', models.IntegerField(default=0)),
+                ('overdue_horizon', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_stats', to=settings.AUTH_USER_MODEL)),
+                ('role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_stats', to='tasks.role')),
+            ],
+            options={
+                'verbose_name_plural': 'Task Stats',
+                'unique_together': {('owner', 'role')},
+            },
+        ),
+        migrations.RunPython(populate_task_stats, migrations.RunPython.noop),
+    ]
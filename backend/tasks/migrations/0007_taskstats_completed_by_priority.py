@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:13
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_completed_by_priority(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskStats = apps.get_model('tasks', 'TaskStats')
+    rows = (Task.objects.order_by()
+            .filter(is_completed=True)
+            .values('owner_id', 'role_id')
+            .annotate(
+                completed_priority_high=Count('id', filter=Q(priority=1)),
+                completed_priority_medium=Count('id', filter=Q(priority=2)),
+                completed_priority_low=Count('id', filter=Q(priority=3)),
+            ))
+    for row in rows:
+        TaskStats.objects.filter(owner_id=row.pop('owner_id'), role_id=row.pop('role_id')).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_taskstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskstats',
+            name='completed_priority_high',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='taskstats',
+            name='completed_priority_low',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='taskstats',
+            name='completed_priority_medium',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_completed_by_priority, migrations.RunPython.noop),
+    ]
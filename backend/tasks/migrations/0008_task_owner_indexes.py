@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_taskstats_completed_by_priority'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='task_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'status', '-created_at'], name='task_owner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'priority', '-created_at'], name='task_owner_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'quadrant', '-created_at'], name='task_owner_quadrant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'role', '-created_at'], name='task_owner_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['owner', 'due_date'], name='task_owner_open_due_idx'),
+        ),
+    ]
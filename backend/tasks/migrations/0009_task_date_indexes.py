@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_owner_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'due_date'], name='task_owner_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'scheduled_date'], name='task_owner_scheduled_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_date_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurrenceRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('priority', models.IntegerField(default=2)),
+                ('quadrant', models.CharField(blank=True, max_length=2, null=True)),
+                ('estimated_hours', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=10)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('materialized_through', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurrence_rules', to='tasks.taskcategory')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurrence_rules', to=settings.AUTH_USER_MODEL)),
+                ('role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurrence_rules', to='tasks.role')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='recurrence_rule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='tasks.recurrencerule'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('recurrence_rule', 'scheduled_date'), name='task_unique_occurrence'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_recurrencerule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='data_version', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
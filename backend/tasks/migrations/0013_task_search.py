@@ -0,0 +1,91 @@
+from django.db import migrations
+
+from tasks.search import sqlite_fts_triggers
+
+# Full-text search is maintained by the database itself so that every write
+# path (save, bulk_create, queryset updates, raw SQL) keeps it current:
+# generated tsvector columns with GIN indexes on PostgreSQL, external-content
+# FTS5 tables with triggers on SQLite. Other backends fall back to icontains.
+#
+# On SQLite a later migration that alters tasks_task or tasks_taskcomment
+# usually makes Django rebuild the table (create a copy, drop the original),
+# which silently drops these triggers. tasks.apps repairs them after every
+# migrate (tasks.search.repair_sqlite_fts); a migration that needs search
+# current before it finishes should call that itself.
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX task_search_vector_idx ON tasks_task USING gin (search_vector)",
+    """
+    ALTER TABLE tasks_taskcomment ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        to_tsvector('english', coalesce(content, ''))
+    ) STORED
+    """,
+    "CREATE INDEX taskcomment_search_vector_idx ON tasks_taskcomment USING gin (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS taskcomment_search_vector_idx",
+    "ALTER TABLE tasks_taskcomment DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS task_search_vector_idx",
+    "ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def sqlite_fts(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id')",
+        *sqlite_fts_triggers(table, columns),
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+SQLITE_FORWARD = (
+    sqlite_fts('tasks_task', ['title', 'description']) +
+    sqlite_fts('tasks_taskcomment', ['content'])
+)
+
+SQLITE_BACKWARD = [
+    f'{statement} IF EXISTS {name}'
+    for table in ('tasks_task', 'tasks_taskcomment')
+    for statement, name in (
+        ('DROP TRIGGER', f'{table}_fts_ai'),
+        ('DROP TRIGGER', f'{table}_fts_ad'),
+        ('DROP TRIGGER', f'{table}_fts_au'),
+        ('DROP TABLE', f'{table}_fts'),
+    )
+]
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        if schema_editor.connection.vendor == 'sqlite':
+            with schema_editor.connection.cursor() as cursor:
+                cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+                if not cursor.fetchone()[0]:
+                    return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_task_category_stats(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskCategoryStats = apps.get_model('tasks', 'TaskCategoryStats')
+    rows = (Task.objects.filter(category__isnull=False).order_by()
+            .values('owner_id', 'role_id', 'category_id')
+            .annotate(total=Count('id')))
+    TaskCategoryStats.objects.bulk_create(TaskCategoryStats(**row) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_task_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCategoryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_stats', to='tasks.taskcategory')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_category_stats', to=settings.AUTH_USER_MODEL)),
+                ('role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_category_stats', to='tasks.role')),
+            ],
+            options={
+                'verbose_name_plural': 'Task Category Stats',
+                'unique_together': {('owner', 'role', 'category')},
+            },
+        ),
+        migrations.RunPython(populate_task_category_stats, migrations.RunPython.noop),
+    ]
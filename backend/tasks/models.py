@@ -1,18 +1,41 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Case, Count, F, Min, Q, When, Value
 from django.conf import settings
 from django.utils import timezone
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
+from .analytics import PRIORITY_KEYS, collect_task_stats, task_counter_aggregates
+from .cache import api_cache
+
 class Role(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='roles')
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            DataVersion.bump(self.owner_id)
+
+    def delete(self, *args, **kwargs):
+        # Also covers the tasks and categories removed by the cascade
+        with transaction.atomic():
+            now = timezone.now()
+            Tombstone.record_tasks(self.owner_id, Task.objects.filter(role=self).values_list('id', flat=True), now=now)
+            Tombstone.record(self.owner_id, 'category', self.categories.values_list('id', flat=True), now=now)
+            Tombstone.record(self.owner_id, 'role', [self.pk], now=now)
+            # Tasks in other roles lose their category from this role
+            Task.objects.filter(category__role=self).exclude(role=self).update(updated_at=now)
+            result = super().delete(*args, **kwargs)
+            DataVersion.bump(self.owner_id)
+        return result
+
 class EisenhowerMatrix(models.Model):
     URGENCY_CHOICES = [
         ('urgent', 'Urgent'),
@@ -32,6 +55,15 @@ class EisenhowerMatrix(models.Model):
     def __str__(self):
         return f"{self.importance} & {self.urgency}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        transaction.on_commit(api_cache.bump_global)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(api_cache.bump_global)
+        return result
+
 class TaskCategory(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -39,13 +71,104 @@ class TaskCategory(models.Model):
     role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='categories')
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='task_categories')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} ({self.role.name})"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            DataVersion.bump(self.owner_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            now = timezone.now()
+            Tombstone.record(self.owner_id, 'category', [self.pk], now=now)
+            # SET_NULL doesn't touch updated_at; mark the tasks for delta sync
+            self.tasks.update(updated_at=now)
+            result = super().delete(*args, **kwargs)
+            DataVersion.bump(self.owner_id)
+        return result
+
     class Meta:
         verbose_name_plural = "Task Categories"
 
+class RecurrenceRule(models.Model):
+    """Template from which recurring task occurrences are materialized."""
+    FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('monthly', 'Monthly'),
+    ]
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recurrence_rules')
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='recurrence_rules')
+    category = models.ForeignKey(
+        TaskCategory,
+        on_delete=models.SET_NULL,
+        related_name='recurrence_rules',
+        null=True,
+        blank=True
+    )
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    priority = models.IntegerField(default=2)
+    quadrant = models.CharField(max_length=2, null=True, blank=True)
+    estimated_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    # Last occurrence date already written to the task table
+    materialized_through = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.title} ({self.frequency})"
+
+    def occurrence_date(self, n):
+        """Date of the ``n``-th occurrence, counting ``start_date`` as 0."""
+        if self.frequency == 'daily':
+            return self.start_date + timedelta(days=n)
+        elif self.frequency == 'weekly':
+            return self.start_date + timedelta(weeks=n)
+        # Offset from the start each time so the 31st doesn't drift to the 28th
+        return self.start_date + relativedelta(months=n)
+
+    def pending_dates(self, horizon, since=None):
+        """Occurrence dates after ``materialized_through`` up to ``horizon``.
+
+        Dates before ``since`` are skipped rather than back-filled.
+        """
+        last = min(horizon, self.end_date) if self.end_date else horizon
+        n = 0
+        while True:
+            day = self.occurrence_date(n)
+            if day > last:
+                return
+            if ((self.materialized_through is None or day > self.materialized_through)
+                    and (since is None or day >= since)):
+                yield day
+            n += 1
+
+    def build_occurrence(self, day):
+        return Task(
+            title=self.title,
+            description=self.description,
+            status='not_started',
+            priority=self.priority,
+            quadrant=self.quadrant,
+            estimated_hours=self.estimated_hours,
+            scheduled_date=day,
+            recurrence=self.frequency,
+            recurrence_rule=self,
+            owner_id=self.owner_id,
+            role_id=self.role_id,
+            category_id=self.category_id
+        )
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
@@ -99,10 +222,56 @@ class Task(models.Model):
         null=True,
         blank=True
     )
+    recurrence_rule = models.ForeignKey(
+        RecurrenceRule,
+        on_delete=models.SET_NULL,
+        related_name='occurrences',
+        null=True,
+        blank=True
+    )
+
+    STATS_FIELDS = ['owner_id', 'role_id', 'category_id', 'status', 'priority', 'quadrant', 'is_completed', 'due_date']
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-id'], name='task_owner_created_idx'),
+            models.Index(fields=['owner', 'status', '-created_at'], name='task_owner_status_idx'),
+            models.Index(fields=['owner', 'priority', '-created_at'], name='task_owner_priority_idx'),
+            models.Index(fields=['owner', 'quadrant', '-created_at'], name='task_owner_quadrant_idx'),
+            models.Index(fields=['owner', 'role', '-created_at'], name='task_owner_role_idx'),
+            models.Index(fields=['owner', 'due_date'], name='task_owner_due_idx'),
+            models.Index(fields=['owner', 'scheduled_date'], name='task_owner_scheduled_idx'),
+            models.Index(fields=['owner', 'updated_at'], name='task_owner_updated_idx'),
+            # Overdue lookups only ever look at open tasks
+            models.Index(
+                fields=['owner', 'due_date'],
+                condition=Q(is_completed=False),
+                name='task_owner_open_due_idx'
+            ),
+        ]
+        constraints = [
+            # Makes occurrence materialization idempotent across runs
+            models.UniqueConstraint(
+                fields=['recurrence_rule', 'scheduled_date'],
+                name='task_unique_occurrence'
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def _stored_stats_state(self):
+        """Lock this task's row and return the values ``TaskStats`` counted."""
+        if self._state.adding or self.pk is None:
+            return None
+        return (Task.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values(*self.STATS_FIELDS)
+                .first())
+
+    def _stats_state(self):
+        return {field: getattr(self, field) for field in self.STATS_FIELDS}
+
     def save(self, *args, **kwargs):
         if self.status == 'completed' and not self.is_completed:
             self.is_completed = True
@@ -111,32 +280,22 @@ class Task(models.Model):
             self.is_completed = False
             self.completed_at = None
 
-        # Only create recurring tasks if both recurrence and scheduled_date are set
-        if self.recurrence and self.scheduled_date and not self.is_completed:
-            try:
-                if self.recurrence == 'daily':
-                    next_date = self.scheduled_date + timedelta(days=1)
-                elif self.recurrence == 'weekly':
-                    next_date = self.scheduled_date + timedelta(weeks=1)
-                elif self.recurrence == 'monthly':
-                    next_date = self.scheduled_date + relativedelta(months=1)
-                
-                Task.objects.create(
-                    title=self.title,
-                    description=self.description,
-                    status='not_started',
-                    priority=self.priority,
-                    scheduled_date=next_date,
-                    recurrence=self.recurrence,
-                    owner=self.owner,
-                    role=self.role
-                )
-            except Exception as e:
-                print(f"Error creating recurring task: {e}")
-                # Don't prevent saving the original task if recurring creation fails
-                pass
+        # Recurring occurrences are created in bulk by the
+        # materialize_recurrences command, not on every save.
+        with transaction.atomic():
+            old_state = self._stored_stats_state()
+            super().save(*args, **kwargs)
+            TaskStats.record_change(old_state, self._stats_state())
+            DataVersion.bump(self.owner_id)
 
-        super().save(*args, **kwargs)
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            old_state = self._stored_stats_state()
+            Tombstone.record_tasks(self.owner_id, [self.pk])
+            result = super().delete(*args, **kwargs)
+            TaskStats.record_change(old_state, None)
+            DataVersion.bump(self.owner_id)
+        return result
 
     def complete(self):
         self.status = 'completed'
@@ -150,6 +309,66 @@ class Task(models.Model):
         self.completed_at = None
         self.save()
 
+    @classmethod
+    def toggle_completion(cls, task_id, owner_id, now=None):
+        """Flip a task's completion with one conditional ``UPDATE ... RETURNING``.
+
+        Returns the updated task (with ``previous_status`` set), or ``None``
+        if ``owner_id`` has no such task. The new values are computed from
+        the row inside the statement, so concurrent toggles cannot lose an
+        update.
+        """
+        now = now or timezone.now()
+        qn = connection.ops.quote_name
+        table = qn(cls._meta.db_table)
+        columns = ', '.join(f'{table}.{qn(field.column)}' for field in cls._meta.concrete_fields)
+
+        def assignments(source):
+            done = f'{source}.{qn("is_completed")}'
+            return f"""
+                {qn('is_completed')} = NOT {done},
+                {qn('status')} = CASE WHEN {done} THEN 'not_started' ELSE 'completed' END,
+                {qn('completed_at')} = CASE WHEN {done} THEN NULL ELSE %s END,
+                {qn('updated_at')} = %s
+            """
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # The locked sub-select exposes the pre-update status to RETURNING
+                sql = f"""
+                    UPDATE {table} SET {assignments('prev')}
+                    FROM (
+                        SELECT {qn('id')}, {qn('status')}, {qn('is_completed')} FROM {table}
+                        WHERE {qn('id')} = %s AND {qn('owner_id')} = %s FOR UPDATE
+                    ) AS prev
+                    WHERE {table}.{qn('id')} = prev.{qn('id')}
+                    RETURNING prev.{qn('status')} AS previous_status, {columns}
+                """
+                params = [now, now, task_id, owner_id]
+            else:
+                # Backends that can't RETURN columns from a FROM clause (SQLite,
+                # which serialises writers anyway) read the old status first.
+                previous_status = (cls.objects.filter(pk=task_id, owner_id=owner_id)
+                                   .values_list('status', flat=True).first())
+                if previous_status is None:
+                    return None
+                sql = f"""
+                    UPDATE {table} SET {assignments(table)}
+                    WHERE {qn('id')} = %s AND {qn('owner_id')} = %s
+                    RETURNING %s AS previous_status, {columns}
+                """
+                params = [now, now, task_id, owner_id, previous_status]
+
+            updated = list(cls.objects.raw(sql, params))
+            if not updated:
+                return None
+            task = updated[0]
+            new_state = task._stats_state()
+            old_state = dict(new_state, is_completed=not task.is_completed, status=task.previous_status)
+            TaskStats.record_change(old_state, new_state, now=now)
+            DataVersion.bump(owner_id, now=now)
+        return task
+
 class TaskComment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -159,3 +378,299 @@ class TaskComment(models.Model):
 
     def __str__(self):
         return f"Comment by {self.author.username} on {self.task.title}"
+
+    def save(self, *args, **kwargs):
+        # Comments are part of the task detail response
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            DataVersion.bump(self.task.owner_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            Tombstone.record(self.task.owner_id, 'comment', [self.pk])
+            result = super().delete(*args, **kwargs)
+            DataVersion.bump(self.task.owner_id)
+        return result
+
+class TaskStats(models.Model):
+    """Per (owner, role) rollup of the counters served by task analytics."""
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='task_stats')
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='task_stats')
+    total = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    not_started = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    overdue = models.IntegerField(default=0)
+    priority_high = models.IntegerField(default=0)
+    priority_medium = models.IntegerField(default=0)
+    priority_low = models.IntegerField(default=0)
+    completed_priority_high = models.IntegerField(default=0)
+    completed_priority_medium = models.IntegerField(default=0)
+    completed_priority_low = models.IntegerField(default=0)
+    quadrant_q1 = models.IntegerField(default=0)
+    quadrant_q2 = models.IntegerField(default=0)
+    quadrant_q3 = models.IntegerField(default=0)
+    quadrant_q4 = models.IntegerField(default=0)
+    # Earliest due date of an open task that was not yet overdue when
+    # ``overdue`` was last computed; once it passes, the counter is stale.
+    overdue_horizon = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['owner', 'role']
+        verbose_name_plural = "Task Stats"
+
+    def __str__(self):
+        return f"{self.owner} - {self.role.name}"
+
+    @staticmethod
+    def counter_deltas(state, sign, now):
+        """Counter increments contributed by one task ``state``."""
+        deltas = {'total': sign}
+        if state['is_completed']:
+            deltas['completed'] = sign
+        if state['status'] in ('not_started', 'in_progress'):
+            deltas[state['status']] = sign
+        if state['priority'] in PRIORITY_KEYS:
+            deltas[f"priority_{PRIORITY_KEYS[state['priority']]}"] = sign
+            if state['is_completed']:
+                deltas[f"completed_priority_{PRIORITY_KEYS[state['priority']]}"] = sign
+        if state['quadrant']:
+            deltas[f"quadrant_{state['quadrant']}"] = sign
+        if not state['is_completed'] and state['due_date'] and state['due_date'] < now:
+            deltas['overdue'] = sign
+        return deltas
+
+    @classmethod
+    def record_change(cls, old_state, new_state, now=None):
+        """Move a task's contribution from ``old_state`` to ``new_state``.
+
+        Either state may be ``None`` for creates and deletes. Counters are
+        adjusted with ``F()`` expressions so concurrent writers never lose
+        updates; callers run this inside the task write's transaction.
+        """
+        now = now or timezone.now()
+        changes = {}
+        category_changes = {}
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is None:
+                continue
+            key = (state['owner_id'], state['role_id'])
+            deltas = changes.setdefault(key, {})
+            for field, delta in cls.counter_deltas(state, sign, now).items():
+                deltas[field] = deltas.get(field, 0) + delta
+            if state.get('category_id') is not None:
+                key = (state['owner_id'], state['role_id'], state['category_id'])
+                category_changes[key] = category_changes.get(key, 0) + sign
+
+        for (owner_id, role_id, category_id), delta in category_changes.items():
+            if delta:
+                TaskCategoryStats.add(owner_id, role_id, category_id, delta)
+
+        for (owner_id, role_id), deltas in changes.items():
+            updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+            if (new_state and (new_state['owner_id'], new_state['role_id']) == (owner_id, role_id)
+                    and not new_state['is_completed'] and new_state['due_date']
+                    and new_state['due_date'] >= now):
+                due_date = new_state['due_date']
+                updates['overdue_horizon'] = Case(
+                    When(overdue_horizon__isnull=True, then=Value(due_date)),
+                    When(overdue_horizon__gt=due_date, then=Value(due_date)),
+                    default=F('overdue_horizon'),
+                )
+            if not updates:
+                continue
+            stats = cls.objects.filter(owner_id=owner_id, role_id=role_id)
+            if not stats.update(**updates):
+                cls.objects.get_or_create(owner_id=owner_id, role_id=role_id)
+                stats.update(**updates)
+
+    @classmethod
+    def recount(cls, owner_id, role_id, now=None):
+        """Recompute one rollup row after writes that bypassed ``Task.save``."""
+        now = now or timezone.now()
+        with transaction.atomic():
+            cls.objects.get_or_create(owner_id=owner_id, role_id=role_id)
+            stats = cls.objects.select_for_update().get(owner_id=owner_id, role_id=role_id)
+            tasks = Task.objects.filter(owner_id=owner_id, role_id=role_id)
+            counts = tasks.aggregate(
+                overdue_horizon=Min('due_date', filter=Q(due_date__gte=now, is_completed=False)),
+                **task_counter_aggregates(now)
+            )
+            for field, value in counts.items():
+                setattr(stats, field, value)
+            stats.save()
+            TaskCategoryStats.recount(owner_id, role_id)
+        return stats
+
+    @classmethod
+    def rebuild(cls, owner=None, now=None):
+        """Recompute rollups from the task table; returns the rows written."""
+        tasks = Task.objects.all()
+        stats = cls.objects.all()
+        if owner is not None:
+            tasks = tasks.filter(owner=owner)
+            stats = stats.filter(owner=owner)
+
+        with transaction.atomic():
+            rows = [cls(**row) for row in collect_task_stats(tasks, now=now)]
+            stats.delete()
+            cls.objects.bulk_create(rows)
+            TaskCategoryStats.rebuild(tasks, owner=owner)
+        return rows
+
+    def refresh_overdue(self, now=None):
+        """Recount ``overdue`` once ``overdue_horizon`` has passed."""
+        now = now or timezone.now()
+        if self.overdue_horizon is None or self.overdue_horizon > now:
+            return
+
+        with transaction.atomic():
+            locked = TaskStats.objects.select_for_update().get(pk=self.pk)
+            open_tasks = Task.objects.filter(owner_id=self.owner_id, role_id=self.role_id, is_completed=False)
+            counts = open_tasks.aggregate(
+                overdue=Count('id', filter=Q(due_date__lt=now)),
+                overdue_horizon=Min('due_date', filter=Q(due_date__gte=now)),
+            )
+            locked.overdue = counts['overdue']
+            locked.overdue_horizon = counts['overdue_horizon']
+            locked.save(update_fields=['overdue', 'overdue_horizon', 'updated_at'])
+
+        self.overdue = locked.overdue
+        self.overdue_horizon = locked.overdue_horizon
+
+class TaskCategoryStats(models.Model):
+    """Per (owner, task role, category) task counts for the analytics
+    category breakdown, maintained alongside ``TaskStats``. Rows go away
+    with their category or role, as do the counted tasks' categories."""
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='task_category_stats')
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='task_category_stats')
+    category = models.ForeignKey(TaskCategory, on_delete=models.CASCADE, related_name='task_stats')
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['owner', 'role', 'category']
+        verbose_name_plural = "Task Category Stats"
+
+    def __str__(self):
+        return f"{self.owner} - {self.category_id}: {self.total}"
+
+    @classmethod
+    def add(cls, owner_id, role_id, category_id, delta):
+        rows = cls.objects.filter(owner_id=owner_id, role_id=role_id, category_id=category_id)
+        if not rows.update(total=F('total') + delta):
+            cls.objects.get_or_create(owner_id=owner_id, role_id=role_id, category_id=category_id)
+            rows.update(total=F('total') + delta)
+
+    @classmethod
+    def recount(cls, owner_id, role_id):
+        """Recompute the rows of one (owner, role); see ``TaskStats.recount``."""
+        counts = (Task.objects.filter(owner_id=owner_id, role_id=role_id, category__isnull=False)
+                  .order_by().values('category_id').annotate(total=Count('id')))
+        cls.objects.filter(owner_id=owner_id, role_id=role_id).delete()
+        cls.objects.bulk_create([
+            cls(owner_id=owner_id, role_id=role_id, category_id=row['category_id'], total=row['total'])
+            for row in counts
+        ])
+
+    @classmethod
+    def rebuild(cls, tasks, owner=None):
+        rows = cls.objects.all() if owner is None else cls.objects.filter(owner=owner)
+        rows.delete()
+        counts = (tasks.filter(category__isnull=False).order_by()
+                  .values('owner_id', 'role_id', 'category_id').annotate(total=Count('id')))
+        return cls.objects.bulk_create([cls(**row) for row in counts])
+
+    @classmethod
+    def breakdown(cls, owner_id, role_id=None):
+        """``by_category`` analytics entries: task counts per category."""
+        rows = cls.objects.filter(owner_id=owner_id, total__gt=0)
+        if role_id:
+            rows = rows.filter(role_id=role_id)
+        by_category = {}
+        for row in rows.order_by('category_id').values('category_id', 'category__name', 'total'):
+            entry = by_category.setdefault(row['category_id'], {
+                'category_id': row['category_id'],
+                'category__name': row['category__name'],
+                'count': 0
+            })
+            entry['count'] += row['total']
+        return list(by_category.values())
+
+class DataVersion(models.Model):
+    """Per-user counter bumped by every write to that user's roles,
+    categories, tasks or comments; validates conditional GETs."""
+    owner = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='data_version')
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.owner} - v{self.version}"
+
+    @classmethod
+    def bump(cls, owner_id, now=None):
+        """Record a change; callers run this inside the write's transaction."""
+        now = now or timezone.now()
+        versions = cls.objects.filter(owner_id=owner_id)
+        if not versions.update(version=F('version') + 1, changed_at=now):
+            cls.objects.get_or_create(owner_id=owner_id)
+            versions.update(version=F('version') + 1, changed_at=now)
+        # Publish to the cache only once readers can see the new data
+        transaction.on_commit(lambda: api_cache.set_version(owner_id, cls.current(owner_id)))
+
+    @classmethod
+    def current(cls, owner_id):
+        """``(version, changed_at)``; ``(0, None)`` until the user's first write."""
+        return cls.objects.filter(owner_id=owner_id).values_list('version', 'changed_at').first() or (0, None)
+
+    @classmethod
+    def cached(cls, owner_id):
+        """``current()``, served from ``api_cache`` when its backend is shared.
+
+        A per-process cache would keep answering with a version that other
+        processes' writes have since moved past (and so with 304s, cache
+        hits and empty sync deltas for changed data); without a shared
+        backend the version is read from the database, one indexed lookup.
+        """
+        if not api_cache.shared:
+            return cls.current(owner_id)
+        return api_cache.version(owner_id, lambda: cls.current(owner_id))
+
+class Tombstone(models.Model):
+    """A deleted role, category, task or comment, kept so delta sync can
+    tell clients what to drop. Pruned after ``SYNC_TOMBSTONE_RETENTION_DAYS``."""
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('role', 'Role'),
+        ('category', 'Category'),
+        ('comment', 'Comment'),
+    ]
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tombstones')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'deleted_at'], name='tombstone_owner_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted {self.deleted_at}"
+
+    @classmethod
+    def record(cls, owner_id, kind, object_ids, now=None):
+        now = now or timezone.now()
+        cls.objects.bulk_create([
+            cls(owner_id=owner_id, kind=kind, object_id=object_id, deleted_at=now)
+            for object_id in object_ids
+        ])
+
+    @classmethod
+    def record_tasks(cls, owner_id, task_ids, now=None):
+        """Tombstones for tasks about to be deleted and their comments."""
+        task_ids = list(task_ids)
+        comment_ids = TaskComment.objects.filter(task_id__in=task_ids).values_list('id', flat=True)
+        cls.record(owner_id, 'comment', comment_ids, now=now)
+        cls.record(owner_id, 'task', task_ids, now=now)
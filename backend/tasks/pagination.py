@@ -0,0 +1,205 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TaskPagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Passing ``?cursor=`` (empty for the first page) switches to keyset
+    pagination on ``(created_at, id)``, which costs the same at any depth
+    because it seeks on the index instead of using ``OFFSET``. Cursors are
+    opaque; clients follow the ``next``/``previous`` links. Keyset pages are
+    always newest first, so any other ``?ordering=`` is rejected with them.
+    ``?count=false`` skips the ``COUNT(*)`` in either mode.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+    ordering_query_param = 'ordering'
+    # The only ?ordering= keyset pages can follow
+    keyset_ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.begin(request)
+        if self.stock_page:
+            return super().paginate_queryset(queryset, request, view)
+        if not self.use_cursor:
+            return self.paginate_queryset_without_count(queryset, request)
+
+        page_queryset, position, page_size = self.keyset_page(queryset, request)
+        self.count = queryset.count() if self.include_count else None
+        return self.finish_keyset_page(list(page_queryset[:page_size + 1]), position, page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, using the async ORM."""
+        self.begin(request)
+        if self.stock_page:
+            return await apaginate_page_number(self, queryset, request)
+        if not self.use_cursor:
+            page_size, page_number, offset = self.page_window(request)
+            results = [row async for row in queryset[offset:offset + page_size + 1]]
+            return self.finish_numbered_page(results, page_number, page_size)
+
+        page_queryset, position, page_size = self.keyset_page(queryset, request)
+        self.count = await queryset.acount() if self.include_count else None
+        results = [row async for row in page_queryset[:page_size + 1]]
+        return self.finish_keyset_page(results, position, page_size)
+
+    def begin(self, request):
+        self.request = request
+        self.include_count = request.query_params.get(self.count_query_param, '').lower() not in ('0', 'false')
+        self.use_cursor = self.cursor_query_param in request.query_params
+        self.stock_page = self.include_count and not self.use_cursor
+
+    def keyset_page(self, queryset, request):
+        """The queryset for the requested keyset page (one extra row to
+        detect more), the decoded cursor position and the page size."""
+        ordering = request.query_params.get(self.ordering_query_param, '').strip()
+        if ordering and ordering != self.keyset_ordering:
+            raise ValidationError({
+                self.ordering_query_param: f'Cursor pages are ordered by {self.keyset_ordering}; '
+                                           'use page numbers for other orderings'
+            })
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        if position is None:
+            page_queryset = queryset.order_by('-created_at', '-id')
+        else:
+            reverse, created_at, pk = position
+            if reverse:
+                page_queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by('created_at', 'id')
+            else:
+                page_queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                ).order_by('-created_at', '-id')
+        return page_queryset, position, page_size
+
+    def finish_keyset_page(self, results, position, page_size):
+        reverse = position is not None and position[0]
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving forwards there is a previous page unless we started at the
+        # top; moving backwards there is always a next page.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        self.page_results = results
+        return results
+
+    def paginate_queryset_without_count(self, queryset, request):
+        page_size, page_number, offset = self.page_window(request)
+        return self.finish_numbered_page(list(queryset[offset:offset + page_size + 1]), page_number, page_size)
+
+    def page_window(self, request):
+        page_size = self.get_page_size(request)
+        raw = request.query_params.get(self.page_query_param, 1)
+        try:
+            page_number = int(raw)
+        except (TypeError, ValueError):
+            # As PageNumberPagination; 'last' needs the count this mode skips
+            raise NotFound(self.invalid_page_message.format(
+                page_number=raw, message='That page number is not an integer'
+            ))
+        if page_number < 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message='That page number is less than 1'
+            ))
+        return page_size, page_number, (page_number - 1) * page_size
+
+    def finish_numbered_page(self, results, page_number, page_size):
+        self.page_number = page_number
+        self.has_next = len(results) > page_size
+        self.page_results = results[:page_size]
+        return self.page_results
+
+    def get_paginated_response(self, data):
+        if not self.stock_page:
+            response = {}
+            if self.include_count:
+                response['count'] = self.count
+            response['next'] = self.get_next_link()
+            response['previous'] = self.get_previous_link()
+            response['results'] = data
+            return Response(response)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.stock_page:
+            return super().get_next_link()
+        if not self.has_next or not self.page_results:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.use_cursor:
+            return replace_query_param(url, self.page_query_param, self.page_number + 1)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page_results[-1], False))
+
+    def get_previous_link(self):
+        if self.stock_page:
+            return super().get_previous_link()
+        url = self.request.build_absolute_uri()
+        if not self.use_cursor:
+            if self.page_number <= 1:
+                return None
+            if self.page_number == 2:
+                return remove_query_param(url, self.page_query_param)
+            return replace_query_param(url, self.page_query_param, self.page_number - 1)
+        if not self.has_previous or not self.page_results:
+            return None
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page_results[0], True))
+
+    def encode_cursor(self, task, reverse):
+        # Pages hold model instances or, on the list fast path, values() rows
+        created_at, pk = (task['created_at'], task['id']) if isinstance(task, dict) else (task.created_at, task.pk)
+        payload = json.dumps([int(reverse), created_at.isoformat(), pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            reverse, created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return bool(reverse), datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+async def apaginate_page_number(pagination, queryset, request):
+    """``PageNumberPagination.paginate_queryset`` for async views: the count
+    and the page rows are fetched with the async ORM."""
+    pagination.request = request
+    page_size = pagination.get_page_size(request)
+    if not page_size:
+        return None
+
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        number = paginator.validate_number(page_number)
+    except InvalidPage as exc:
+        raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+    # Same bounds as Paginator.page(), including orphans
+    bottom = (number - 1) * paginator.per_page
+    top = bottom + paginator.per_page
+    if top + paginator.orphans >= paginator.count:
+        top = paginator.count
+    results = [obj async for obj in queryset[bottom:top]]
+    pagination.page = paginator._get_page(results, number, paginator)
+    return results
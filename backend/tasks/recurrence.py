@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import DataVersion, RecurrenceRule, Task, TaskStats
+
+
+def adopt_recurring_tasks():
+    """Create a ``RecurrenceRule`` for each series of open tasks that only
+    have the legacy ``recurrence``/``scheduled_date`` fields set.
+
+    The old ``Task.save`` side effect spawned a copy per occurrence, so one
+    series is every legacy task with the same owner, role, title and
+    recurrence. The earliest open one starts the rule. The series' tasks
+    become its occurrences, and the rule counts as materialized through the
+    last of them. A second copy for an already linked date keeps its data
+    but stops recurring. Returns the rules created.
+    """
+    legacy = (Task.objects
+              .filter(recurrence__isnull=False, scheduled_date__isnull=False, recurrence_rule__isnull=True)
+              .exclude(recurrence=''))
+    series = (legacy.filter(is_completed=False).order_by()
+              .values('owner_id', 'role_id', 'title', 'recurrence').distinct())
+    rules = []
+    for key in list(series):
+        with transaction.atomic():
+            # Re-read under lock so concurrent runs adopt each series once
+            tasks = list(legacy.filter(**key).select_for_update(skip_locked=True).order_by('scheduled_date', 'id'))
+            open_tasks = [task for task in tasks if not task.is_completed]
+            if not open_tasks:
+                continue
+            first = open_tasks[0]
+            tasks = [task for task in tasks if task.scheduled_date >= first.scheduled_date]
+            rule = RecurrenceRule.objects.create(
+                owner_id=first.owner_id,
+                role_id=first.role_id,
+                category_id=first.category_id,
+                title=first.title,
+                description=first.description,
+                priority=first.priority,
+                quadrant=first.quadrant,
+                estimated_hours=first.estimated_hours,
+                frequency=first.recurrence,
+                start_date=first.scheduled_date,
+                materialized_through=tasks[-1].scheduled_date
+            )
+            linked, duplicates = {}, []
+            for task in tasks:
+                if task.scheduled_date in linked:
+                    duplicates.append(task.pk)
+                else:
+                    linked[task.scheduled_date] = task.pk
+            # Plain UPDATEs: neither changes any counters
+            Task.objects.filter(pk__in=linked.values()).update(recurrence_rule=rule)
+            if duplicates:
+                Task.objects.filter(pk__in=duplicates).update(recurrence=None, updated_at=timezone.now())
+            DataVersion.bump(first.owner_id)
+            rules.append(rule)
+    return rules
+
+
+def materialize_occurrences(horizon=None, batch_size=500):
+    """Write every pending occurrence from today up to ``horizon``
+    (default: 30 days ahead); past dates are not back-filled.
+
+    Safe to re-run and to run concurrently: each rule is claimed with
+    ``SKIP LOCKED`` and the (rule, scheduled_date) unique constraint makes
+    duplicate inserts no-ops. Returns the number of occurrences created.
+    """
+    today = timezone.localdate()
+    horizon = horizon or today + timedelta(days=30)
+    rules = RecurrenceRule.objects.filter(is_active=True).exclude(materialized_through__gte=horizon)
+    created = 0
+    touched = set()
+
+    for rule_id in rules.values_list('id', flat=True).iterator():
+        with transaction.atomic():
+            rule = (RecurrenceRule.objects.select_for_update(skip_locked=True)
+                    .filter(pk=rule_id, is_active=True)
+                    .first())
+            if rule is None:
+                continue
+            days = list(rule.pending_dates(horizon, since=today))
+            if days:
+                # Dates that already have a task (e.g. adopted ones) are skipped;
+                # with the rule locked, what's left is what gets inserted
+                existing = set(rule.occurrences.filter(scheduled_date__in=days)
+                               .values_list('scheduled_date', flat=True))
+                days = [day for day in days if day not in existing]
+            if days:
+                Task.objects.bulk_create(
+                    [rule.build_occurrence(day) for day in days],
+                    batch_size=batch_size,
+                    ignore_conflicts=True
+                )
+                created += len(days)
+                touched.add((rule.owner_id, rule.role_id))
+            rule.materialized_through = horizon
+            rule.save(update_fields=['materialized_through', 'updated_at'])
+
+    # bulk_create skips Task.save, so bring the affected rollups up to date
+    for owner_id, role_id in touched:
+        TaskStats.recount(owner_id, role_id)
+    for owner_id in {owner_id for owner_id, _ in touched}:
+        DataVersion.bump(owner_id)
+    return created
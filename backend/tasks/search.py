@@ -0,0 +1,175 @@
+import re
+
+from django.db import connection, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Letters and digits only: everything else is a separator, which also keeps
+# user input out of the tsquery / FTS5 query syntax.
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+MAX_SEARCH_TERMS = 8
+
+# Comment matches count for less than matches in the task itself
+COMMENT_WEIGHT = 0.5
+
+_sqlite_fts = None
+
+# External-content FTS5 tables on SQLite (migration 0013) and their columns
+SQLITE_FTS_COLUMNS = {
+    'tasks_task': ['title', 'description'],
+    'tasks_taskcomment': ['content'],
+}
+
+
+def search_terms(query):
+    return [term.lower() for term in TOKEN_RE.findall(query or '')][:MAX_SEARCH_TERMS]
+
+
+def sqlite_fts_triggers(table, columns):
+    """Triggers keeping ``<table>_fts`` in step with every write to ``table``."""
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+        END""",
+    ]
+
+
+def repair_sqlite_fts(using='default'):
+    """Recreate FTS5 triggers missing on SQLite and reindex their tables.
+
+    A migration that makes Django rebuild ``tasks_task`` or
+    ``tasks_taskcomment`` (SQLite can't alter most columns in place) drops
+    the table's triggers with the old copy, after which search would go
+    stale. Run after every ``migrate``; returns the tables repaired.
+    """
+    db = connections[using]
+    if db.vendor != 'sqlite':
+        return []
+    repaired = []
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        names = {name for name, in cursor.fetchall()}
+        for table, columns in SQLITE_FTS_COLUMNS.items():
+            fts = f'{table}_fts'
+            if fts not in names or all(f'{fts}_{suffix}' in names for suffix in ('ai', 'ad', 'au')):
+                continue
+            for statement in sqlite_fts_triggers(table, columns):
+                cursor.execute(statement)
+            # Writes made while the triggers were missing never reached the index
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            repaired.append(table)
+    return repaired
+
+
+def search_backend():
+    """``'postgresql'``, ``'fts5'`` or ``'basic'`` (icontains) for the default database."""
+    global _sqlite_fts
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        if _sqlite_fts is None:
+            # Created by migration 0013 when SQLite was built with FTS5
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'tasks_task_fts'"
+                )
+                _sqlite_fts = bool(cursor.fetchone()[0])
+        if _sqlite_fts:
+            return 'fts5'
+    return 'basic'
+
+
+def search_tasks(queryset, query, include_comments=False):
+    """Filter ``queryset`` to tasks matching every term of ``query`` (the
+    last term as a prefix) and annotate ``search_rank``, highest first.
+
+    With ``include_comments`` a task also matches through its comments.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    backend = search_backend()
+    if backend == 'postgresql':
+        return _search_postgresql(queryset, terms, include_comments)
+    if backend == 'fts5':
+        return _search_fts5(queryset, terms, include_comments)
+    return _search_basic(queryset, terms, include_comments)
+
+
+def _ranked(queryset, match, rank, comment_match, comment_rank, include_comments):
+    condition = Q(match)
+    if include_comments:
+        condition |= Q(comment_match)
+        rank = RawSQL(f'coalesce(({rank.sql}), 0) + {COMMENT_WEIGHT} * coalesce(({comment_rank.sql}), 0)',
+                      rank.params + comment_rank.params, output_field=FloatField())
+    return queryset.filter(condition).annotate(search_rank=rank).order_by('-search_rank', '-id')
+
+
+def _search_postgresql(queryset, terms, include_comments):
+    # Every term must match; the last one may be a prefix of a word
+    tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+    match = RawSQL("tasks_task.search_vector @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField())
+    rank = RawSQL("ts_rank(tasks_task.search_vector, to_tsquery('english', %s))", [tsquery], output_field=FloatField())
+    comment_match = RawSQL(
+        "tasks_task.id IN (SELECT c.task_id FROM tasks_taskcomment c "
+        "WHERE c.search_vector @@ to_tsquery('english', %s))",
+        [tsquery], output_field=BooleanField()
+    )
+    comment_rank = RawSQL(
+        "SELECT max(ts_rank(c.search_vector, to_tsquery('english', %s))) FROM tasks_taskcomment c "
+        "WHERE c.task_id = tasks_task.id AND c.search_vector @@ to_tsquery('english', %s)",
+        [tsquery, tsquery], output_field=FloatField()
+    )
+    return _ranked(queryset, match, rank, comment_match, comment_rank, include_comments)
+
+
+def _search_fts5(queryset, terms, include_comments):
+    fts_query = ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+    match = RawSQL(
+        'tasks_task.id IN (SELECT rowid FROM tasks_task_fts WHERE tasks_task_fts MATCH %s)',
+        [fts_query], output_field=BooleanField()
+    )
+    # bm25() is lower for better matches; weight title over description
+    rank = RawSQL(
+        'SELECT -bm25(tasks_task_fts, 2.0, 1.0) FROM tasks_task_fts '
+        'WHERE tasks_task_fts MATCH %s AND rowid = tasks_task.id',
+        [fts_query], output_field=FloatField()
+    )
+    comment_match = RawSQL(
+        'tasks_task.id IN (SELECT c.task_id FROM tasks_taskcomment_fts '
+        'JOIN tasks_taskcomment c ON c.id = tasks_taskcomment_fts.rowid '
+        'WHERE tasks_taskcomment_fts MATCH %s)',
+        [fts_query], output_field=BooleanField()
+    )
+    # bm25() only works on a plain lookup of the FTS table, not across a join
+    comment_rank = RawSQL(
+        'SELECT max((SELECT -bm25(tasks_taskcomment_fts) FROM tasks_taskcomment_fts '
+        'WHERE tasks_taskcomment_fts MATCH %s AND rowid = c.id)) '
+        'FROM tasks_taskcomment c WHERE c.task_id = tasks_task.id',
+        [fts_query], output_field=FloatField()
+    )
+    return _ranked(queryset, match, rank, comment_match, comment_rank, include_comments)
+
+
+def _search_basic(queryset, terms, include_comments):
+    condition = Q()
+    for term in terms:
+        term_condition = Q(title__icontains=term) | Q(description__icontains=term)
+        if include_comments:
+            term_condition |= Q(comments__content__icontains=term)
+        condition &= term_condition
+    return (queryset.filter(condition).distinct()
+            .annotate(search_rank=Value(0.0, output_field=FloatField()))
+            .order_by('-created_at', '-id'))
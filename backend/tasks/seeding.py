@@ -0,0 +1,184 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .models import DataVersion, RecurrenceRule, Role, Task, TaskCategory, TaskComment, TaskStats
+
+User = get_user_model()
+
+DEFAULT_PREFIX = 'loadtest'
+DEFAULT_PASSWORD = 'loadtest-password'
+
+ROLE_NAMES = ['Work', 'Personal', 'Study', 'Health', 'Family', 'Finance', 'Side project', 'Volunteering']
+CATEGORY_NAMES = ['Planning', 'Meetings', 'Errands', 'Reading', 'Admin', 'Deep work']
+VERBS = ['Write', 'Review', 'Plan', 'Call', 'Fix', 'Prepare', 'Book', 'Send', 'Update', 'Clean up', 'Research', 'Draft']
+NOUNS = [
+    'quarterly report', 'budget', 'presentation', 'dentist appointment', 'project proposal', 'grocery list',
+    'reading notes', 'team retrospective', 'tax documents', 'workout plan', 'blog post', 'travel itinerary',
+    'invoice', 'code review', 'birthday gift', 'meeting agenda'
+]
+COMMENTS = [
+    'Waiting on feedback', 'Moved to next week', 'Half done', 'Blocked by the review',
+    'Need to follow up on this', 'Added the latest numbers', 'Looks good so far', 'Remember to attach the draft'
+]
+COLORS = ['#e74c3c', '#3498db', '#2ecc71', '#f1c40f', '#9b59b6', '#1abc9c']
+
+# (value, weight) pairs for the task fields
+STATUS_WEIGHTS = [('not_started', 45), ('in_progress', 20), ('completed', 35)]
+PRIORITY_WEIGHTS = [(1, 25), (2, 50), (3, 25)]
+QUADRANT_WEIGHTS = [('q1', 15), ('q2', 30), ('q3', 20), ('q4', 10), (None, 25)]
+FREQUENCY_WEIGHTS = [('daily', 30), ('weekly', 55), ('monthly', 15)]
+
+
+def weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+class SyntheticDataGenerator:
+    """Deterministically seed ``users`` × ``roles`` × ``tasks_per_role`` tasks.
+
+    The same arguments and ``seed`` always produce the same rows, with dates
+    placed relative to the time of seeding. Users are
+    named ``<prefix>-<n>`` / ``<prefix>-<n>@example.com`` and share one
+    password. Roughly ``recurring`` of each role's tasks are occurrences of
+    a ``RecurrenceRule``; about 40% of tasks have comments. Rows are written
+    with ``bulk_create`` per user, after which the rollups and data versions
+    are brought up to date.
+    """
+
+    def __init__(self, users, roles, tasks_per_role, seed=0, prefix=DEFAULT_PREFIX,
+                 password=DEFAULT_PASSWORD, recurring=0.05, batch_size=2000):
+        self.users = users
+        self.roles = roles
+        self.tasks_per_role = tasks_per_role
+        self.seed = seed
+        self.prefix = prefix
+        self.password = password
+        self.recurring = recurring
+        self.batch_size = batch_size
+        self.now = timezone.now()
+
+    def existing_users(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}-')
+
+    def run(self, progress=None):
+        """Seed every user; returns the number of rows written per model."""
+        counts = {'users': 0, 'roles': 0, 'categories': 0, 'recurrence_rules': 0, 'tasks': 0, 'comments': 0}
+        # Hashing is deliberately slow, so every user shares one hash
+        password = make_password(self.password)
+        for index in range(self.users):
+            # One generator per user: the rows for user n don't depend on -users
+            rng = random.Random(f'{self.seed}:{index}')
+            with transaction.atomic():
+                self.seed_user(rng, index, password, counts)
+            if progress:
+                progress(index + 1, counts)
+        return counts
+
+    def seed_user(self, rng, index, password, counts):
+        user = User.objects.create(
+            username=f'{self.prefix}-{index}',
+            email=f'{self.prefix}-{index}@example.com',
+            password=password,
+            is_email_verified=True
+        )
+        roles = Role.objects.bulk_create(
+            Role(name=ROLE_NAMES[r] if r < len(ROLE_NAMES) else f'Role {r + 1}',
+                 description='Seeded for load testing', owner=user)
+            for r in range(self.roles)
+        )
+        categories = TaskCategory.objects.bulk_create(
+            TaskCategory(name=name, color=rng.choice(COLORS), role=role, owner=user)
+            for role in roles
+            for name in rng.sample(CATEGORY_NAMES, 3)
+        )
+        by_role = {role.id: [c for c in categories if c.role_id == role.id] for role in roles}
+
+        tasks = []
+        rules = []
+        for role in roles:
+            occurrences = int(self.tasks_per_role * self.recurring)
+            rule_tasks = self.recurring_tasks(rng, user, role, by_role[role.id], occurrences, rules)
+            tasks.extend(rule_tasks)
+            tasks.extend(
+                self.build_task(rng, user, role, by_role[role.id])
+                for _ in range(self.tasks_per_role - len(rule_tasks))
+            )
+        tasks = Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+
+        comments = []
+        for task in tasks:
+            if rng.random() < 0.4:
+                comments.extend(
+                    TaskComment(task=task, author=user, content=rng.choice(COMMENTS))
+                    for _ in range(rng.randint(1, 4))
+                )
+        TaskComment.objects.bulk_create(comments, batch_size=self.batch_size)
+
+        # bulk_create skips Task.save, so recount the rollups once per role
+        for role in roles:
+            TaskStats.recount(user.id, role.id, now=self.now)
+        DataVersion.bump(user.id, now=self.now)
+
+        counts['users'] += 1
+        counts['roles'] += len(roles)
+        counts['categories'] += len(categories)
+        counts['recurrence_rules'] += len(rules)
+        counts['tasks'] += len(tasks)
+        counts['comments'] += len(comments)
+
+    def build_task(self, rng, user, role, categories):
+        status = weighted(rng, STATUS_WEIGHTS)
+        # Mostly due within the next few weeks; a quarter of open tasks are overdue
+        due_date = None
+        if rng.random() < 0.8:
+            due_date = self.now + timedelta(days=rng.gauss(7, 14), hours=rng.randint(0, 23))
+        estimated = Decimal(rng.randint(1, 32)) / 4
+        return Task(
+            title=f'{rng.choice(VERBS)} {rng.choice(NOUNS)}',
+            description=f'{rng.choice(VERBS)} the {rng.choice(NOUNS)} before the {rng.choice(NOUNS)}'
+            if rng.random() < 0.6 else '',
+            status=status,
+            is_completed=status == 'completed',
+            completed_at=self.now - timedelta(days=rng.uniform(0, 30)) if status == 'completed' else None,
+            priority=weighted(rng, PRIORITY_WEIGHTS),
+            quadrant=weighted(rng, QUADRANT_WEIGHTS),
+            due_date=due_date,
+            estimated_hours=estimated,
+            actual_hours=estimated * Decimal(rng.randint(2, 6)) / 4 if status == 'completed' else Decimal(0),
+            owner=user,
+            role=role,
+            category=rng.choice(categories) if categories and rng.random() < 0.6 else None
+        )
+
+    def recurring_tasks(self, rng, user, role, categories, occurrences, rules):
+        """Build rules and their upcoming occurrences (up to ``occurrences`` tasks)."""
+        tasks = []
+        today = timezone.localdate(self.now)
+        while len(tasks) < occurrences:
+            frequency = weighted(rng, FREQUENCY_WEIGHTS)
+            rule = RecurrenceRule.objects.create(
+                owner=user,
+                role=role,
+                category=rng.choice(categories) if categories else None,
+                title=f'{rng.choice(VERBS)} {rng.choice(NOUNS)}',
+                priority=weighted(rng, PRIORITY_WEIGHTS),
+                quadrant=weighted(rng, QUADRANT_WEIGHTS),
+                estimated_hours=Decimal(rng.randint(1, 8)) / 4,
+                frequency=frequency,
+                start_date=today - timedelta(days=rng.randint(0, 6))
+            )
+            horizon = today + timedelta(days=30)
+            days = list(rule.pending_dates(horizon, since=today))[:occurrences - len(tasks)]
+            tasks.extend(rule.build_occurrence(day) for day in days)
+            # The last occurrence written; a later materialize run tops it up
+            rule.materialized_through = days[-1] if days else today
+            rule.save(update_fields=['materialized_through', 'updated_at'])
+            rules.append(rule)
+        return tasks
@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from rest_framework import ISO_8601
+from rest_framework.settings import api_settings
 from .models import Role, EisenhowerMatrix, TaskCategory, Task, TaskComment
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from decimal import Decimal
 
 User = get_user_model()
 
@@ -61,7 +64,7 @@ class TaskCreateUpdateSerializer(serializers.ModelSerializer):
         fields = [
             'title', 'description', 'status', 'priority', 
             'due_date', 'role', 'category', 'quadrant',
-            'estimated_hours', 'actual_hours'
+            'estimated_hours', 'actual_hours', 'scheduled_date', 'recurrence'
         ]
         extra_kwargs = {
             'quadrant': {'required': False, 'allow_null': True},
@@ -106,6 +109,16 @@ class TaskCreateUpdateSerializer(serializers.ModelSerializer):
                 validated_data['completed_at'] = None
         return super().update(instance, validated_data)
 
+class TaskPartialUpdateSerializer(TaskCreateUpdateSerializer):
+    """Validates only the fields present, for bulk partial updates."""
+
+    def validate(self, data):
+        if 'title' in data and not data['title']:
+            raise serializers.ValidationError({'title': 'Title is required'})
+        if 'role' in data and not data['role']:
+            raise serializers.ValidationError({'role': 'Role is required'})
+        return data
+
 class TaskListSerializer(serializers.ModelSerializer):
     role_name = serializers.CharField(source='role.name', read_only=True)
     category_name = serializers.SerializerMethodField()
@@ -136,3 +149,107 @@ class TaskAnalyticsSerializer(serializers.Serializer):
     by_quadrant = serializers.DictField()
     quadrant_percentages = serializers.DictField()
 
+class ValuesSerializer:
+    """Read-only fast path that renders ``.values()`` rows exactly as
+    ``serializer_class(many=True)`` renders model instances.
+
+    The declared fields are compiled once into ``(name, lookup, converter)``
+    triples. Values the database already returns in their output form are
+    passed through; ISO datetimes and string decimals use specialised
+    converters, anything else goes through the DRF field itself.
+    ``SerializerMethodField``s must be mapped to a lookup in ``method_lookups``.
+    """
+    serializer_class = None
+    method_lookups = {}
+
+    # DRF fields whose to_representation is a no-op for values read from the database
+    passthrough_fields = (
+        serializers.BooleanField, serializers.CharField, serializers.ChoiceField,
+        serializers.IntegerField, serializers.ReadOnlyField, serializers.PrimaryKeyRelatedField,
+        serializers.SerializerMethodField,
+    )
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def compiled_fields(cls):
+        if '_compiled_fields' not in cls.__dict__:
+            cls._compiled_fields = [
+                (name, cls.field_lookup(name, field), cls.field_converter(field))
+                for name, field in cls.serializer_class().fields.items()
+            ]
+        return cls._compiled_fields
+
+    @classmethod
+    def field_lookup(cls, name, field):
+        if isinstance(field, serializers.SerializerMethodField):
+            return cls.method_lookups[name]
+        return field.source.replace('.', '__')
+
+    @classmethod
+    def field_converter(cls, field):
+        """A factory returning the value converter for ``field``, or ``None``.
+
+        Factories run once per ``data`` call so per-request state such as
+        the active time zone is looked up once rather than per value.
+        """
+        if isinstance(field, cls.passthrough_fields):
+            return None
+
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            if (output_format or '').lower() == ISO_8601:
+                def datetime_converter():
+                    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+                    if tz is None:
+                        return field.to_representation
+
+                    def convert(value):
+                        if timezone.is_naive(value):
+                            return field.to_representation(value)
+                        value = value.astimezone(tz).isoformat()
+                        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+                    return convert
+                return datetime_converter
+
+        if isinstance(field, serializers.DecimalField) and field.decimal_places is not None \
+                and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING) \
+                and not field.localize:
+            exponent = -field.decimal_places
+
+            def decimal_converter():
+                def convert(value):
+                    # Database decimals normally arrive already quantized
+                    if isinstance(value, Decimal) and value.as_tuple().exponent == exponent:
+                        return f'{value:f}'
+                    return field.to_representation(value)
+                return convert
+            return decimal_converter
+
+        return lambda: field.to_representation
+
+    @classmethod
+    def values(cls, queryset, *extra):
+        """``queryset`` narrowed to the columns this serializer reads (plus ``extra``)."""
+        return queryset.values(*dict.fromkeys(lookup for _, lookup, _ in cls.compiled_fields()), *extra)
+
+    @property
+    def data(self):
+        fields = [
+            (name, lookup, factory() if factory is not None else None)
+            for name, lookup, factory in self.compiled_fields()
+        ]
+        data = []
+        for row in self.rows:
+            item = {}
+            for name, lookup, convert in fields:
+                value = row[lookup]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+class FastTaskListSerializer(ValuesSerializer):
+    """``TaskListSerializer`` output for ``Task.objects.values()`` rows."""
+    serializer_class = TaskListSerializer
+    method_lookups = {'category_name': 'category__name'}
@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Role, TaskCategory, Task, TaskComment, Tombstone
+from .serializers import FastTaskListSerializer, RoleSerializer, TaskCategorySerializer, TaskCommentSerializer
+
+# Rows are matched on updated_at, which is stamped before the writing
+# transaction commits; re-reading this far back catches late commits.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+SYNC_KINDS = ['tasks', 'roles', 'categories', 'comments']
+
+TOMBSTONE_KINDS = {'task': 'tasks', 'role': 'roles', 'category': 'categories', 'comment': 'comments'}
+
+
+def tombstone_retention():
+    return timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def encode_sync_cursor(version, moment):
+    payload = json.dumps([version, moment.isoformat()], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_sync_cursor(cursor):
+    """``(version, moment)`` from a cursor issued by ``encode_sync_cursor``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        version, moment = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        moment = datetime.fromisoformat(moment)
+        if timezone.is_naive(moment):
+            raise ValueError('naive cursor time')
+        return int(version), moment
+    except (TypeError, ValueError):
+        raise ValidationError({'since': 'Invalid cursor'})
+
+
+def parse_sync_kinds(value):
+    """The ``kinds`` query parameter: a comma-separated subset of ``SYNC_KINDS``."""
+    if not value:
+        return list(SYNC_KINDS)
+    kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+    if not kinds or any(kind not in SYNC_KINDS for kind in kinds):
+        raise ValidationError({'kinds': f"Expected a comma-separated subset of {', '.join(SYNC_KINDS)}"})
+    return [kind for kind in SYNC_KINDS if kind in kinds]
+
+
+def empty_delta(cursor, kinds=SYNC_KINDS):
+    return {
+        'cursor': cursor,
+        'full': False,
+        **{kind: [] for kind in kinds},
+        'deleted': {kind: [] for kind in kinds},
+    }
+
+
+def build_delta(user, version, now, since=None, kinds=SYNC_KINDS):
+    """Everything of ``user``'s of the given ``kinds`` changed after
+    ``since`` (all of it when ``since`` is ``None``) plus the ids deleted
+    since then."""
+    querysets = {
+        'tasks': Task.objects.filter(owner=user).order_by('id'),
+        'roles': Role.objects.filter(owner=user).order_by('id'),
+        'categories': TaskCategory.objects.filter(owner=user).order_by('id'),
+        'comments': TaskComment.objects.filter(task__owner=user).select_related('author').order_by('id'),
+    }
+    deleted = {kind: [] for kind in kinds}
+
+    if since is not None:
+        cutoff = since - SYNC_OVERLAP
+        querysets = {kind: queryset.filter(updated_at__gt=cutoff) for kind, queryset in querysets.items()}
+        tombstones = (Tombstone.objects
+                      .filter(owner=user, deleted_at__gt=cutoff,
+                              kind__in=[kind for kind, plural in TOMBSTONE_KINDS.items() if plural in kinds])
+                      .order_by('id')
+                      .values_list('kind', 'object_id'))
+        for kind, object_id in tombstones:
+            deleted[TOMBSTONE_KINDS[kind]].append(object_id)
+
+    serializers = {
+        'tasks': lambda tasks: FastTaskListSerializer(FastTaskListSerializer.values(tasks)).data,
+        'roles': lambda roles: RoleSerializer(roles, many=True).data,
+        'categories': lambda categories: TaskCategorySerializer(categories, many=True).data,
+        'comments': lambda comments: TaskCommentSerializer(comments, many=True).data,
+    }
+    return {
+        'cursor': encode_sync_cursor(version, now),
+        'full': since is None,
+        **{kind: serializers[kind](querysets[kind]) for kind in kinds},
+        'deleted': deleted,
+    }
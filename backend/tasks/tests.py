@@ -1,3 +1,690 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.cache import user_cache
+
+from .analytics import collect_task_stats, compute_task_analytics
+from .bulk import BulkTaskProcessor
+from .cache import api_cache
+from .models import (
+    DataVersion, RecurrenceRule, Role, Task, TaskCategory, TaskCategoryStats, TaskComment, TaskStats, Tombstone,
+)
+from .recurrence import adopt_recurring_tasks, materialize_occurrences
+from .search import repair_sqlite_fts, search_backend, search_tasks
+from .serializers import FastTaskListSerializer, TaskListSerializer
+from .sync import empty_delta, encode_sync_cursor
+
+User = get_user_model()
+
+
+class TaskTestCase(TestCase):
+    """A user with two roles, a category in each and an authenticated client."""
+
+    def setUp(self):
+        caches['api'].clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.work = Role.objects.create(name='Work', owner=self.user)
+        self.home = Role.objects.create(name='Home', owner=self.user)
+        self.reports = TaskCategory.objects.create(name='Reports', role=self.work, owner=self.user)
+        self.chores = TaskCategory.objects.create(name='Chores', role=self.home, owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_task(self, title='Task', role=None, **fields):
+        return Task.objects.create(title=title, owner=self.user, role=role or self.work, **fields)
+
+
+class TaskStatsRollupTests(TaskTestCase):
+    """The rollups follow every write through Task.save/delete."""
+
+    def assert_rollups_exact(self):
+        expected = {(row['owner_id'], row['role_id']): row for row in collect_task_stats(Task.objects.all())}
+        for stats in TaskStats.objects.all():
+            row = expected.pop((stats.owner_id, stats.role_id), None)
+            for field in ('total', 'completed', 'not_started', 'in_progress', 'priority_high', 'quadrant_q1'):
+                self.assertEqual(getattr(stats, field), row[field] if row else 0, field)
+        self.assertEqual(expected, {})
+        categories = {
+            (row.role_id, row.category_id): row.total
+            for row in TaskCategoryStats.objects.all() if row.total
+        }
+        expected_categories = {}
+        for task in Task.objects.filter(category__isnull=False):
+            key = (task.role_id, task.category_id)
+            expected_categories[key] = expected_categories.get(key, 0) + 1
+        self.assertEqual(categories, expected_categories)
+
+    def test_create_update_delete_keep_rollups_exact(self):
+        first = self.make_task(priority=1, quadrant='q1', category=self.reports)
+        second = self.make_task(status='in_progress', category=self.reports)
+        self.make_task(role=self.home, category=self.chores)
+        self.assert_rollups_exact()
+
+        first.status = 'completed'
+        first.save()
+        second.role = self.home
+        second.category = self.chores
+        second.save()
+        self.assert_rollups_exact()
+
+        first.delete()
+        self.assert_rollups_exact()
+
+    def test_toggle_completion_moves_counters(self):
+        task = self.make_task(priority=1, category=self.reports)
+        Task.toggle_completion(task.id, self.user.id)
+        stats = TaskStats.objects.get(owner=self.user, role=self.work)
+        self.assertEqual((stats.completed, stats.completed_priority_high, stats.not_started), (1, 1, 0))
+        Task.toggle_completion(task.id, self.user.id)
+        stats.refresh_from_db()
+        self.assertEqual((stats.completed, stats.not_started), (0, 1))
+        self.assert_rollups_exact()
+
+    def test_deleting_a_category_drops_its_counts(self):
+        self.make_task(category=self.reports)
+        self.reports.delete()
+        self.assertFalse(TaskCategoryStats.objects.exists())
+        self.assert_rollups_exact()
+
+    def test_recount_and_verify_command(self):
+        task = self.make_task(category=self.reports)
+        # Writes that bypass Task.save are repaired by recount
+        Task.objects.filter(pk=task.pk).update(role=self.home, category=self.chores)
+        TaskStats.recount(self.user.id, self.work.id)
+        TaskStats.recount(self.user.id, self.home.id)
+        self.assert_rollups_exact()
+        call_command('task_stats', verify=True, stdout=StringIO())
+
+    def test_verify_does_not_write(self):
+        now = timezone.now()
+        task = self.make_task(due_date=now + timedelta(hours=1))
+        # The task has since become overdue and the rollup is due a recount
+        Task.objects.filter(pk=task.pk).update(due_date=now - timedelta(hours=1))
+        TaskStats.objects.update(overdue_horizon=now - timedelta(minutes=1))
+        before = list(TaskStats.objects.order_by('pk').values())
+        call_command('task_stats', verify=True, stdout=StringIO())
+        self.assertEqual(list(TaskStats.objects.order_by('pk').values()), before)
+
+        TaskStats.objects.update(total=5)
+        with self.assertRaisesMessage(CommandError, '1 rollup row(s) out of date'):
+            call_command('task_stats', verify=True, stdout=StringIO())
+
+    def test_analytics_rollup_matches_direct_aggregation(self):
+        now = timezone.now()
+        self.make_task(priority=1, category=self.reports, due_date=now - timedelta(days=1))
+        self.make_task(status='completed', category=self.reports, due_date=now)
+        self.make_task(role=self.home, category=self.chores, quadrant='q2')
+        self.make_task(role=self.home)
+
+        data = self.client.get('/api/tasks/tasks/analytics/', {'summary': 'true'}).json()
+        expected = compute_task_analytics(Task.objects.filter(owner=self.user))
+        for key in ('total_tasks', 'completed_tasks', 'overdue_tasks', 'by_priority', 'by_quadrant'):
+            self.assertEqual(data[key], expected[key], key)
+        by_category = lambda entries: sorted((entry['category__name'], entry['count']) for entry in entries)
+        self.assertEqual(by_category(data['by_category']), by_category(expected['by_category']))
+        self.assertEqual(by_category(data['by_category']), [('Chores', 1), ('Reports', 2)])
+
+    def test_analytics_role_filter_limits_categories(self):
+        self.make_task(category=self.reports)
+        self.make_task(role=self.home, category=self.chores)
+        data = self.client.get('/api/tasks/tasks/analytics/', {'summary': 'true', 'role': self.home.id}).json()
+        self.assertEqual([entry['category__name'] for entry in data['by_category']], ['Chores'])
+
+
+class KeysetPaginationTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        base = timezone.now()
+        for index in range(7):
+            task = self.make_task(title=f'Task {index}')
+            # Pairs of tasks share a created_at; the id breaks the tie
+            Task.objects.filter(pk=task.pk).update(created_at=base - timedelta(minutes=index // 2))
+        self.expected = list(Task.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def walk(self, url, params=None, direction='next'):
+        pages = []
+        while url:
+            data = self.client.get(url, params).json()
+            params = None
+            pages.append([task['id'] for task in data['results']])
+            url = data[direction]
+        return pages
+
+    def test_forward_pages_cover_every_task_once(self):
+        pages = self.walk('/api/tasks/tasks/', {'cursor': '', 'page_size': 3})
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_first_and_last_page_links(self):
+        first = self.client.get('/api/tasks/tasks/', {'cursor': '', 'page_size': 7}).json()
+        self.assertIsNone(first['previous'])
+        self.assertIsNone(first['next'])
+        self.assertEqual(first['count'], 7)
+
+    def test_previous_links_retrace_the_same_pages(self):
+        data = self.client.get('/api/tasks/tasks/', {'cursor': '', 'page_size': 3}).json()
+        data = self.client.get(data['next']).json()
+        last = self.client.get(data['next']).json()
+        backwards = self.walk(last['previous'], direction='previous')
+        self.assertEqual(backwards, [self.expected[3:6], self.expected[0:3]])
+
+    def test_count_can_be_skipped(self):
+        data = self.client.get('/api/tasks/tasks/', {'cursor': '', 'count': 'false'}).json()
+        self.assertNotIn('count', data)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/api/tasks/tasks/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_page_number_is_not_found(self):
+        for params in ({'page': 'abc'}, {'page': '0'}, {'page': 'abc', 'count': 'false'}, {'page': '0', 'count': 'false'}):
+            response = self.client.get('/api/tasks/tasks/', params)
+            self.assertEqual(response.status_code, 404, params)
+        data = self.client.get('/api/tasks/tasks/', {'page': '2', 'page_size': 3, 'count': 'false'}).json()
+        self.assertEqual(len(data['results']), 3)
+
+    def test_cursor_rejects_other_orderings(self):
+        response = self.client.get('/api/tasks/tasks/', {'cursor': '', 'ordering': 'title'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+        response = self.client.get('/api/tasks/tasks/', {'cursor': '', 'ordering': '-created_at'})
+        self.assertEqual(response.status_code, 200)
+        # Page numbers still follow any ordering
+        response = self.client.get('/api/tasks/tasks/', {'ordering': 'title'})
+        self.assertEqual(response.status_code, 200)
+
+
+class RecurrenceTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+
+    def legacy_chain(self, title='Standup', length=3, **fields):
+        """Tasks as the old save() side effect left them: one per occurrence."""
+        return [
+            self.make_task(title=title, recurrence='daily', scheduled_date=self.today + timedelta(days=n), **fields)
+            for n in range(length)
+        ]
+
+    def test_legacy_chain_becomes_one_rule(self):
+        chain = self.legacy_chain()
+        rules = adopt_recurring_tasks()
+        self.assertEqual(len(rules), 1)
+        rule = rules[0]
+        self.assertEqual((rule.start_date, rule.materialized_through), (self.today, self.today + timedelta(days=2)))
+        self.assertEqual(set(rule.occurrences.values_list('id', flat=True)), {task.id for task in chain})
+        self.assertEqual(adopt_recurring_tasks(), [])
+
+    def test_materializing_an_adopted_chain_adds_no_duplicates(self):
+        self.legacy_chain()
+        adopt_recurring_tasks()
+        created = materialize_occurrences(horizon=self.today + timedelta(days=5))
+        self.assertEqual(created, 3)
+        dates = list(Task.objects.values_list('scheduled_date', flat=True))
+        self.assertEqual(sorted(dates), [self.today + timedelta(days=n) for n in range(6)])
+
+    def test_materialize_counts_only_inserted_rows(self):
+        rule = RecurrenceRule.objects.create(
+            owner=self.user, role=self.work, title='Review', frequency='daily', start_date=self.today
+        )
+        # An occurrence already written (e.g. by an earlier, interrupted run)
+        Task.objects.create(title='Review', owner=self.user, role=self.work,
+                            recurrence_rule=rule, scheduled_date=self.today + timedelta(days=1))
+        created = materialize_occurrences(horizon=self.today + timedelta(days=3))
+        self.assertEqual(created, 3)
+        self.assertEqual(rule.occurrences.count(), 4)
+        self.assertEqual(materialize_occurrences(horizon=self.today + timedelta(days=3)), 0)
+
+        out = StringIO()
+        call_command('materialize_recurrences', days=3, stdout=out)
+        self.assertIn('Materialized 0 occurrence(s)', out.getvalue())
+
+    def test_duplicate_dates_in_a_series_stop_recurring(self):
+        self.legacy_chain(length=2)
+        copy = self.make_task(title='Standup', recurrence='daily', scheduled_date=self.today)
+        adopt_recurring_tasks()
+        copy.refresh_from_db()
+        self.assertIsNone(copy.recurrence_rule_id)
+        self.assertIsNone(copy.recurrence)
+        self.assertEqual(RecurrenceRule.objects.count(), 1)
+
+    def test_separate_series_get_separate_rules(self):
+        self.legacy_chain(title='Standup', length=2)
+        self.legacy_chain(title='Standup', length=2, role=self.home)
+        self.legacy_chain(title='Workout', length=2)
+        self.assertEqual(len(adopt_recurring_tasks()), 3)
+
+    def test_materialized_occurrences_are_counted_in_rollups(self):
+        RecurrenceRule.objects.create(
+            owner=self.user, role=self.work, category=self.reports, title='Review',
+            frequency='daily', start_date=self.today
+        )
+        materialize_occurrences(horizon=self.today + timedelta(days=1))
+        self.assertEqual(TaskStats.objects.get(owner=self.user, role=self.work).total, 2)
+        self.assertEqual(TaskCategoryStats.objects.get(category=self.reports).total, 2)
+
+
+class BulkOperationTests(TaskTestCase):
+    def bulk(self, *operations):
+        return self.client.post('/api/tasks/tasks/bulk/', {'operations': list(operations)}, format='json')
+
+    def test_operations_apply_together(self):
+        task = self.make_task(category=self.reports)
+        response = self.bulk(
+            {'op': 'create', 'data': {'title': 'New', 'role': self.home.id}},
+            {'op': 'complete', 'id': task.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.json()['results']], ['ok', 'ok'])
+        task.refresh_from_db()
+        self.assertTrue(task.is_completed)
+        self.assertEqual(TaskStats.objects.get(owner=self.user, role=self.home).total, 1)
+        self.assertEqual(TaskStats.objects.get(owner=self.user, role=self.work).completed, 1)
+
+    def test_one_invalid_item_rejects_the_batch(self):
+        task = self.make_task()
+        response = self.bulk({'op': 'complete', 'id': task.id}, {'op': 'delete', 'id': 999999})
+        self.assertEqual(response.status_code, 400)
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['skipped', 'error'])
+        self.assertEqual(results[1]['errors'], {'id': 'Not found'})
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+    def test_booleans_are_not_ids(self):
+        task = self.make_task()
+        response = self.bulk(
+            {'op': 'complete', 'id': True},
+            {'op': 'reassign', 'id': task.id, 'role': True},
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = [result.get('errors') for result in response.json()['results']]
+        self.assertEqual(errors, [{'id': 'A task id is required'}, {'role': 'Not found'}])
+
+    def test_lists_and_objects_are_not_ids(self):
+        task = self.make_task()
+        other = self.make_task()
+        response = self.bulk(
+            {'op': 'create', 'data': {'title': 'New', 'role': [self.work.id]}},
+            {'op': 'reassign', 'id': task.id, 'role': {'x': 1}},
+            {'op': 'update', 'id': other.id, 'data': {'category': [self.reports.id]}},
+            {'op': 'delete', 'id': [task.id]},
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = [result.get('errors') for result in response.json()['results']]
+        self.assertEqual(errors, [
+            {'role': 'Not found'}, {'role': 'Not found'}, {'category': 'Not found'}, {'id': 'A task id is required'},
+        ])
+
+    def test_complete_keeps_completed_at_of_completed_tasks(self):
+        done = self.make_task(status='completed')
+        completed_at = Task.objects.get(pk=done.pk).completed_at
+        task = self.make_task()
+        response = self.bulk({'op': 'complete', 'id': done.id}, {'op': 'complete', 'id': task.id})
+        self.assertEqual([result['status'] for result in response.json()['results']], ['ok', 'ok'])
+        done.refresh_from_db()
+        task.refresh_from_db()
+        self.assertEqual(done.completed_at, completed_at)
+        self.assertIsNotNone(task.completed_at)
+        self.assertEqual(TaskStats.objects.get(owner=self.user, role=self.work).completed, 2)
+
+    def test_repeated_task_is_rejected(self):
+        task = self.make_task()
+        response = self.bulk({'op': 'complete', 'id': task.id}, {'op': 'delete', 'id': task.id})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('id', response.json()['results'][1]['errors'])
+
+    def test_reassign_clears_a_category_of_the_old_role(self):
+        leaving = self.make_task(category=self.reports)
+        staying = self.make_task(category=self.chores)
+        response = self.bulk(
+            {'op': 'reassign', 'id': leaving.id, 'role': self.home.id},
+            {'op': 'reassign', 'id': staying.id, 'role': self.home.id},
+        )
+        self.assertEqual(response.status_code, 200)
+        leaving.refresh_from_db()
+        staying.refresh_from_db()
+        self.assertEqual((leaving.role_id, leaving.category_id), (self.home.id, None))
+        self.assertEqual((staying.role_id, staying.category_id), (self.home.id, self.chores.id))
+        self.assertEqual(TaskCategoryStats.objects.get(category=self.chores).total, 1)
+        self.assertFalse(TaskCategoryStats.objects.filter(category=self.reports, total__gt=0).exists())
+
+    def test_update_role_clears_a_category_of_the_old_role(self):
+        task = self.make_task(category=self.reports)
+        self.bulk({'op': 'update', 'id': task.id, 'data': {'role': self.home.id}})
+        task.refresh_from_db()
+        self.assertEqual((task.role_id, task.category_id), (self.home.id, None))
+
+    def test_occurrence_date_conflict_is_reported_per_item(self):
+        today = timezone.localdate()
+        rule = RecurrenceRule.objects.create(
+            owner=self.user, role=self.work, title='Review', frequency='daily', start_date=today
+        )
+        materialize_occurrences(horizon=today + timedelta(days=1))
+        first, second = rule.occurrences.order_by('scheduled_date')
+        response = self.bulk({'op': 'update', 'id': second.id, 'data': {'scheduled_date': today.isoformat()}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('scheduled_date', response.json()['results'][0]['errors'])
+
+        # Swapping dates within one request is fine
+        response = self.bulk(
+            {'op': 'update', 'id': first.id, 'data': {'scheduled_date': (today + timedelta(days=2)).isoformat()}},
+            {'op': 'update', 'id': second.id, 'data': {'scheduled_date': today.isoformat()}},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_occurrence_conflict_found_only_on_write_is_reported(self):
+        today = timezone.localdate()
+        rule = RecurrenceRule.objects.create(
+            owner=self.user, role=self.work, title='Review', frequency='daily', start_date=today
+        )
+        materialize_occurrences(horizon=today + timedelta(days=1))
+        second = rule.occurrences.get(scheduled_date=today + timedelta(days=1))
+        # As if a concurrent write had taken the date after validation
+        with mock.patch.object(BulkTaskProcessor, 'check_occurrence_dates'):
+            response = self.bulk({'op': 'update', 'id': second.id, 'data': {'scheduled_date': today.isoformat()}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['results'][0]['status'], 'error')
+        second.refresh_from_db()
+        self.assertEqual(second.scheduled_date, today + timedelta(days=1))
+
+
+class ConditionalGetTests(TaskTestCase):
+    def get(self, path, etag=None):
+        headers = {'If-None-Match': etag} if etag else {}
+        return self.client.get(path, headers=headers)
+
+    def test_not_modified_until_a_write(self):
+        first = self.get('/api/tasks/tasks/')
+        etag = first['ETag']
+        self.assertEqual(self.get('/api/tasks/tasks/', etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_task(title='New')
+        response = self.get('/api/tasks/tasks/', etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.get('/api/tasks/tasks/', response['ETag']).status_code, 304)
+
+    def test_write_in_another_process_is_seen(self):
+        etag = self.get('/api/tasks/roles/')['ETag']
+        # Another worker's write: the version moves in the database, but
+        # this process's cache never hears about it
+        with self.captureOnCommitCallbacks(execute=False):
+            Role.objects.create(name='Elsewhere', owner=self.user)
+        response = self.get('/api/tasks/roles/', etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Elsewhere', [role['name'] for role in response.json()['results']])
+
+    def test_cached_responses_follow_writes(self):
+        self.assertEqual(self.get('/api/tasks/categories/')['X-Cache'], 'MISS')
+        self.assertEqual(self.get('/api/tasks/categories/')['X-Cache'], 'HIT')
+        with self.captureOnCommitCallbacks(execute=False):
+            TaskCategory.objects.create(name='Errands', role=self.home, owner=self.user)
+        response = self.get('/api/tasks/categories/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn('Errands', [category['name'] for category in response.json()['results']])
+
+    def test_versions_come_from_a_shared_cache(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'api': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }):
+            self.assertTrue(api_cache.shared)
+            version = DataVersion.cached(self.user.id)
+            with self.assertNumQueries(0):
+                self.assertEqual(DataVersion.cached(self.user.id), version)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.make_task()
+            self.assertEqual(DataVersion.cached(self.user.id)[0], version[0] + 1)
+        self.assertFalse(api_cache.shared)
+
+
+class ToggleCompleteTests(TaskTestCase):
+    def toggle(self, task_id):
+        return self.client.post(f'/api/tasks/tasks/{task_id}/toggle_complete/')
+
+    def test_toggle_flips_completion_both_ways(self):
+        task = self.make_task(status='in_progress', priority=1)
+        response = self.toggle(task.id)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['task']['status'], data['task']['is_completed']), ('completed', True))
+        self.assertEqual(data['analytics']['completed_tasks'], 1)
+        self.assertEqual(data['analytics']['completed_by_priority']['high'], 1)
+        task.refresh_from_db()
+        self.assertIsNotNone(task.completed_at)
+
+        data = self.toggle(task.id).json()
+        self.assertEqual((data['task']['status'], data['task']['is_completed']), ('not_started', False))
+        task.refresh_from_db()
+        self.assertIsNone(task.completed_at)
+        stats = TaskStats.objects.get(owner=self.user, role=self.work)
+        self.assertEqual((stats.completed, stats.in_progress, stats.not_started), (0, 0, 1))
+
+    def test_toggle_returns_the_previous_status(self):
+        task = self.make_task(status='in_progress')
+        updated = Task.toggle_completion(task.id, self.user.id)
+        self.assertEqual(updated.previous_status, 'in_progress')
+        self.assertEqual(Task.toggle_completion(task.id, self.user.id).previous_status, 'completed')
+
+    def test_toggle_is_one_statement_for_the_task(self):
+        task = self.make_task()
+        with CaptureQueriesContext(connection) as queries:
+            Task.toggle_completion(task.id, self.user.id)
+        task_writes = [
+            query['sql'] for query in queries if query['sql'].lstrip().startswith('UPDATE "tasks_task"')
+        ]
+        self.assertEqual(len(task_writes), 1)
+        self.assertIn('RETURNING', task_writes[0])
+
+    def test_other_users_tasks_are_not_found(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        task = Task.objects.create(title='Theirs', owner=other, role=Role.objects.create(name='R', owner=other))
+        self.assertEqual(self.toggle(task.id).status_code, 404)
+        self.assertEqual(self.toggle('abc').status_code, 404)
+        task.refresh_from_db()
+        self.assertFalse(task.is_completed)
+
+
+class FastTaskListSerializerTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.make_task(title='Plain')
+        self.make_task(
+            title='Detailed', description='Notes', status='in_progress', priority=1, quadrant='q1',
+            category=self.reports, estimated_hours='2.50', actual_hours='0.25',
+            due_date=timezone.now() + timedelta(days=1, microseconds=7),
+        )
+        self.make_task(title='At home', role=self.home, category=self.chores, status='completed', estimated_hours='10')
+
+    def assert_same_output(self):
+        queryset = Task.objects.filter(owner=self.user).select_related('role', 'category').order_by('id')
+        expected = TaskListSerializer(queryset, many=True).data
+        self.assertEqual(FastTaskListSerializer(FastTaskListSerializer.values(queryset)).data, expected)
+
+    def test_matches_task_list_serializer(self):
+        self.assert_same_output()
+
+    def test_matches_in_another_time_zone(self):
+        with timezone.override('Asia/Karachi'):
+            self.assert_same_output()
+
+    def test_list_endpoint_renders_the_same_fields(self):
+        response = self.client.get('/api/tasks/tasks/', {'ordering': 'created_at'})
+        results = response.json()
+        results = results.get('results', results)
+        queryset = Task.objects.filter(owner=self.user).select_related('role', 'category').order_by('created_at')
+        self.assertEqual(results, TaskListSerializer(queryset, many=True).data)
+
+
+class SyncTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_task(title='Report', category=self.reports)
+        self.other = self.make_task(title='Dishes', role=self.home, category=self.chores)
+        self.comment = TaskComment.objects.create(task=self.task, author=self.user, content='Draft sent')
+
+    def sync(self, since=None):
+        response = self.client.get('/api/tasks/sync/', {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def age_everything(self):
+        """Push every row out of the overlap window so a delta shows only new writes."""
+        earlier = timezone.now() - timedelta(hours=1)
+        for model in (Task, Role, TaskCategory, TaskComment):
+            model.objects.update(updated_at=earlier)
+
+    def test_first_sync_is_full(self):
+        data = self.sync()
+        self.assertTrue(data['full'])
+        self.assertEqual([task['id'] for task in data['tasks']], [self.task.id, self.other.id])
+        self.assertEqual([role['id'] for role in data['roles']], [self.work.id, self.home.id])
+        self.assertEqual(len(data['categories']), 2)
+        self.assertEqual([comment['id'] for comment in data['comments']], [self.comment.id])
+
+    def test_unchanged_cursor_returns_an_empty_delta(self):
+        cursor = self.sync()['cursor']
+        self.assertEqual(self.sync(cursor), empty_delta(cursor))
+
+    def test_delta_contains_only_changed_rows(self):
+        self.age_everything()
+        cursor = self.sync()['cursor']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.title = 'Report v2'
+            self.task.save()
+        data = self.sync(cursor)
+        self.assertFalse(data['full'])
+        self.assertEqual([task['title'] for task in data['tasks']], ['Report v2'])
+        self.assertEqual((data['roles'], data['categories'], data['comments']), ([], [], []))
+        self.assertNotEqual(data['cursor'], cursor)
+        self.assertEqual(self.sync(data['cursor'])['tasks'], [])
+
+    def test_deletions_are_reported_as_tombstones(self):
+        self.age_everything()
+        cursor = self.sync()['cursor']
+        expected = {
+            'tasks': [self.other.id],
+            'roles': [self.home.id],
+            'categories': [self.chores.id],
+            'comments': [self.comment.id],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.comment.delete()
+            self.home.delete()
+        data = self.sync(cursor)
+        self.assertEqual(data['deleted'], expected)
+        self.assertEqual(data['tasks'], [])
+
+    def test_deleting_a_task_reports_its_comments(self):
+        cursor = self.sync()['cursor']
+        task_id, comment_id = self.task.id, self.comment.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        deleted = self.sync(cursor)['deleted']
+        self.assertEqual((deleted['tasks'], deleted['comments']), ([task_id], [comment_id]))
+
+    def test_deleting_a_category_marks_its_tasks_changed(self):
+        self.age_everything()
+        cursor = self.sync()['cursor']
+        category_id = self.reports.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reports.delete()
+        data = self.sync(cursor)
+        self.assertEqual(data['deleted']['categories'], [category_id])
+        self.assertEqual([(task['id'], task['category']) for task in data['tasks']], [(self.task.id, None)])
+
+    def test_cursor_older_than_tombstone_retention_gets_a_full_sync(self):
+        version, _ = DataVersion.current(self.user.id)
+        cursor = encode_sync_cursor(version - 1, timezone.now() - timedelta(days=31))
+        self.assertTrue(self.sync(cursor)['full'])
+
+    def test_kinds_limits_the_collections(self):
+        data = self.client.get('/api/tasks/sync/', {'kinds': 'roles,categories'}).json()
+        self.assertEqual(set(data) - {'cursor', 'full', 'deleted'}, {'roles', 'categories'})
+        self.assertEqual(set(data['deleted']), {'roles', 'categories'})
+        cursor, category_id = data['cursor'], self.chores.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+            self.chores.delete()
+        data = self.client.get('/api/tasks/sync/', {'since': cursor, 'kinds': 'roles,categories'}).json()
+        self.assertEqual(data['deleted'], {'roles': [], 'categories': [category_id]})
+        self.assertNotIn('tasks', data)
+        response = self.client.get('/api/tasks/sync/', {'kinds': 'roles,users'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/tasks/sync/', {'since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('since', response.json())
+
+    def test_other_users_deletions_are_not_reported(self):
+        cursor = self.sync()['cursor']
+        other = User.objects.create_user(username='other', email='other@example.com', password='pw')
+        role = Role.objects.create(name='Theirs', owner=other)
+        role.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_task(title='New')
+        self.assertEqual(self.sync(cursor)['deleted']['roles'], [])
+
+    def test_prune_tombstones_removes_expired_ones(self):
+        self.comment.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=40))
+        task_id = self.other.id
+        self.other.delete()
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('kind', 'object_id')), [('task', task_id)])
+
+
+class BoardTests(TaskTestCase):
+    def test_board_ranks_and_counts_each_quadrant(self):
+        for priority in (3, 1, 2):
+            self.make_task(title=f'P{priority}', quadrant='q1', priority=priority)
+        self.make_task(title='Done', quadrant='q1', status='completed')
+        self.make_task(title='Q2', quadrant='q2')
+        data = self.client.get('/api/tasks/tasks/board/', {'limit': 2}).json()
+        self.assertEqual(data['q1']['count'], 3)
+        self.assertEqual([task['title'] for task in data['q1']['tasks']], ['P1', 'P2'])
+        self.assertEqual((data['q2']['count'], data['q3']['count']), (1, 0))
+
+    def test_completed_tasks_are_included_on_request(self):
+        self.make_task(title='Done', quadrant='q1', status='completed', priority=1)
+        self.make_task(title='Open', quadrant='q1', priority=3)
+        data = self.client.get('/api/tasks/tasks/board/', {'include_completed': 'true'}).json()
+        self.assertEqual(data['q1']['count'], 2)
+        self.assertEqual([task['title'] for task in data['q1']['tasks']], ['Open', 'Done'])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 triggers are SQLite only')
+class SqliteSearchTriggerTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        if search_backend() != 'fts5':
+            self.skipTest('SQLite was built without FTS5')
+
+    def test_dropped_triggers_are_recreated_and_the_index_rebuilt(self):
+        task = self.make_task(title='Quarterly report')
+        with connection.cursor() as cursor:
+            # As a table rebuild by a later migration would
+            cursor.execute('DROP TRIGGER tasks_task_fts_au')
+        Task.objects.filter(pk=task.pk).update(title='Annual budget')
+        self.assertFalse(search_tasks(Task.objects.all(), 'budget').exists())
+
+        self.assertEqual(repair_sqlite_fts(), ['tasks_task'])
+        self.assertEqual(list(search_tasks(Task.objects.all(), 'budget').values_list('pk', flat=True)), [task.pk])
+        Task.objects.filter(pk=task.pk).update(title='Annual plan')
+        self.assertTrue(search_tasks(Task.objects.all(), 'plan').exists())
+        self.assertEqual(repair_sqlite_fts(), [])
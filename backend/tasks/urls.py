@@ -11,5 +11,6 @@ router.register(r'categories', views.TaskCategoryViewSet, basename='category')
 router.register(r'tasks', views.TaskViewSet, basename='task')
 
 urlpatterns = [
+    path('sync/', views.SyncView.as_view(), name='sync'),
     path('', include(router.urls)),
 ]
@@ -0,0 +1,32 @@
+from django.urls import include, path, re_path
+
+from . import async_views, views
+from .urls import router
+
+app_name = 'tasks'
+
+# Router routes (by URL name) served by tasks.async_views: (load, cache namespace)
+ASYNC_READ_ROUTES = {
+    'role-list': (async_views.load_list, 'roles'),
+    'category-list': (async_views.load_list, 'categories'),
+    'task-list': (async_views.load_task_list, None),
+    'task-analytics': (async_views.load_analytics, 'analytics'),
+    'task-detail': (async_views.load_task, None),
+}
+
+
+def async_route(pattern):
+    """``pattern`` with its view swapped for the async one, if it has one.
+    Format-suffix variants (``tasks.json``) stay sync."""
+    if pattern.name not in ASYNC_READ_ROUTES or 'format' in pattern.pattern.regex.groupindex:
+        return pattern
+    load, cache_namespace = ASYNC_READ_ROUTES[pattern.name]
+    view = async_views.read_view(pattern.callback, load, cache_namespace)
+    return re_path(pattern.pattern.regex.pattern, view, name=pattern.name)
+
+
+# Same routes, in the same order, as tasks.urls
+urlpatterns = [
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    path('', include([async_route(pattern) for pattern in router.urls])),
+]
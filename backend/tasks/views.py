@@ -1,12 +1,30 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound, ValidationError
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Avg, Q, F
+from django.db.models import Count, Avg, Q, F, Min, Prefetch, Window, prefetch_related_objects
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from datetime import timedelta
-
-from .models import Role, EisenhowerMatrix, TaskCategory, Task, TaskComment
+import logging
+
+from .models import Role, EisenhowerMatrix, TaskCategory, Task, TaskCategoryStats, TaskComment, TaskStats, DataVersion
+from .cache import GLOBAL, CachedViewMixin, api_cache, cached_action
+from .conditional import ConditionalGetMixin, conditional_get
+from .pagination import TaskPagination
+from .bulk import MAX_BULK_OPERATIONS, BulkTaskProcessor
+from .filters import DATE_FIELDS, filter_date_window, parse_date_bound, parse_ordering
+from .search import search_tasks
+from .sync import build_delta, decode_sync_cursor, empty_delta, parse_sync_kinds, tombstone_retention
+from .analytics import (
+    QUADRANT_KEYS,
+    TOGGLE_ANALYTICS_FIELDS,
+    aggregate_due_today_by_role,
+    compute_rollup_analytics,
+    compute_task_analytics
+)
 from .serializers import (
     RoleSerializer,
     EisenhowerMatrixSerializer, 
@@ -15,16 +33,36 @@ from .serializers import (
     TaskCreateUpdateSerializer,
     TaskListSerializer,
     TaskCommentSerializer,
-    TaskAnalyticsSerializer
+    TaskAnalyticsSerializer,
+    FastTaskListSerializer
 )
 
-class RoleViewSet(viewsets.ModelViewSet):
+logger = logging.getLogger(__name__)
+
+# Widest window the by_day action will bucket
+MAX_DAY_WINDOW = 62
+# Most tasks per quadrant the board action will return
+MAX_BOARD_LIMIT = 100
+# Actions that serialize tasks with TaskSerializer, which nests comments
+TASK_DETAIL_ACTIONS = ['retrieve']
+
+
+def comments_prefetch():
+    """Prefetch for ``TaskSerializer.comments`` including each comment's author."""
+    return Prefetch('comments', queryset=TaskComment.objects.select_related('author').order_by('created_at', 'id'))
+
+class RoleViewSet(ConditionalGetMixin, CachedViewMixin, viewsets.ModelViewSet):
     serializer_class = RoleSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Role.objects.filter(owner=self.request.user)
 
+    @conditional_get
+    @cached_action('roles')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
@@ -33,22 +71,40 @@ class EisenhowerMatrixViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = EisenhowerMatrixSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class TaskCategoryViewSet(viewsets.ModelViewSet):
+    def cache_key(self, request, namespace):
+        # Shared by every user; versioned globally
+        version, _ = api_cache.global_version()
+        return GLOBAL, version, [request.get_full_path()]
+
+    @cached_action('eisenhower_matrix')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+class TaskCategoryViewSet(ConditionalGetMixin, CachedViewMixin, viewsets.ModelViewSet):
     serializer_class = TaskCategorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return TaskCategory.objects.filter(owner=self.request.user)
 
+    @conditional_get
+    @cached_action('categories')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, CachedViewMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskPagination
 
     def get_queryset(self):
-        queryset = Task.objects.filter(owner=self.request.user).select_related('role')
+        # role_name and category_name are read for every serialized task
+        queryset = Task.objects.filter(owner=self.request.user).select_related('role', 'category')
+        if self.action in TASK_DETAIL_ACTIONS:
+            queryset = queryset.prefetch_related(comments_prefetch())
         
         # Apply filters
         role = self.request.query_params.get('role')
@@ -65,7 +121,18 @@ class TaskViewSet(viewsets.ModelViewSet):
         if quadrant:
             queryset = queryset.filter(quadrant=quadrant)
 
-        return queryset.order_by('-created_at')
+        # Date window on due_date (default) or scheduled_date
+        date_field = self.request.query_params.get('date_field', 'due_date')
+        if date_field not in DATE_FIELDS:
+            raise ValidationError({'date_field': f"Expected one of {', '.join(DATE_FIELDS)}"})
+        start_date = self.request.query_params.get('start_date')
+        end_date = self.request.query_params.get('end_date')
+        start = parse_date_bound('start_date', start_date) if start_date else None
+        end = parse_date_bound('end_date', end_date, end=True) if end_date else None
+        queryset = filter_date_window(queryset, date_field, start, end)
+
+        ordering = parse_ordering(self.request.query_params.get('ordering'), ['-created_at', '-id'])
+        return queryset.order_by(*ordering)
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -77,6 +144,54 @@ class TaskViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        # Read-only fast path: same rows as TaskListSerializer, built from values()
+        queryset = FastTaskListSerializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(FastTaskListSerializer(page).data)
+        return Response(FastTaskListSerializer(queryset).data)
+
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def conditional_validators(self, request, extra=()):
+        if self.action != 'analytics':
+            return super().conditional_validators(request, extra)
+        clock = self.analytics_clock(request)
+        if clock is None:
+            return None
+        # Last-Modified can't express changes that come from the clock
+        etag, _ = super().conditional_validators(request, [*extra, *clock])
+        return etag, None
+
+    def cache_key(self, request, namespace):
+        owner, version, parts = super().cache_key(request, namespace)
+        if namespace == 'analytics':
+            clock = self.analytics_clock(request)
+            if clock is None:
+                return None
+            parts.extend(clock)
+        return owner, version, parts
+
+    def analytics_clock(self, request):
+        """What analytics depend on besides stored data, or ``None`` if they
+        must be recomputed: due-today counts change at midnight and overdue
+        counts once the rollups' overdue horizon passes."""
+        now = timezone.now()
+        version, _ = DataVersion.cached(request.user.id)
+        cached = api_cache.get('overdue_horizon', request.user.id, version, [])
+        if cached is None:
+            horizon = TaskStats.objects.filter(owner=request.user).aggregate(horizon=Min('overdue_horizon'))['horizon']
+            api_cache.set('overdue_horizon', request.user.id, version, [], (horizon,))
+        else:
+            horizon, = cached
+        if horizon is not None and horizon <= now:
+            return None
+        return [timezone.localdate(now), horizon]
+
     @action(detail=True, methods=['post'])
     def add_comment(self, request, pk=None):
         task = self.get_object()
@@ -90,7 +205,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
         task = self.get_object()
-        comments = task.comments.all()
+        comments = task.comments.select_related('author')
         serializer = TaskCommentSerializer(comments, many=True)
         return Response(serializer.data)
 
@@ -103,82 +218,197 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def toggle_complete(self, request, pk=None):
+        """Flip completion in one statement and return the task together with
+        the analytics counters the flip can change."""
         try:
-            task = self.get_object()
-            if task.is_completed:
-                task.uncomplete()
+            task_id = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound()
+        now = timezone.now()
+        task = Task.toggle_completion(task_id, request.user.id, now=now)
+        if task is None:
+            raise NotFound()
+        prefetch_related_objects([task], 'role', 'category', comments_prefetch())
+
+        analytics_data = compute_rollup_analytics(
+            self.rollup_stats(now=now),
+            [],
+            aggregate_due_today_by_role(Task.objects.filter(owner=request.user), now=now)
+        )
+        return Response({
+            'task': TaskSerializer(task).data,
+            'analytics': {field: analytics_data[field] for field in TOGGLE_ANALYTICS_FIELDS},
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Apply many create/update/complete/uncomplete/move/reassign/delete
+        operations in one transaction; all or nothing."""
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            raise ValidationError({'operations': 'Expected a non-empty list'})
+        if len(operations) > MAX_BULK_OPERATIONS:
+            raise ValidationError({'operations': f'At most {MAX_BULK_OPERATIONS} operations per request'})
+
+        results, applied = BulkTaskProcessor(request.user).run(operations)
+        return Response(
+            {'results': results},
+            status=status.HTTP_200_OK if applied else status.HTTP_400_BAD_REQUEST
+        )
+
+    def summary_only(self):
+        # ?summary=true drops the unpaginated task list from analytics
+        return self.request.query_params.get('summary', '').lower() in ('1', 'true')
+
+    def rollup_stats(self, role=None, now=None):
+        """The user's ``TaskStats`` rows with overdue counts brought up to date."""
+        stats = TaskStats.objects.filter(owner=self.request.user).select_related('role')
+        if role:
+            stats = stats.filter(role_id=role)
+        stats = list(stats)
+        for row in stats:
+            row.refresh_overdue(now=now)
+        return stats
+
+    def compute_analytics(self, tasks):
+        # The TaskStats rollups are keyed by (owner, role), so they can only
+        # answer requests that filter on nothing finer than the role.
+        params = self.request.query_params
+        if any(params.get(name) for name in ('status', 'priority', 'quadrant', 'start_date', 'end_date')):
+            return compute_task_analytics(tasks)
+
+        now = timezone.now()
+        stats = self.rollup_stats(role=params.get('role'), now=now)
+        if not params.get('role'):
+            # The rows are fresh now; let analytics_clock see the new horizon
+            version, _ = DataVersion.cached(self.request.user.id)
+            horizons = [row.overdue_horizon for row in stats if row.overdue_horizon is not None]
+            api_cache.set('overdue_horizon', self.request.user.id, version, [], (min(horizons, default=None),))
+        # Category counts come from their own rollup; the due-today breakdown
+        # is a range scan of today's tasks on the (owner, due_date) index, so
+        # neither grows with the total number of tasks
+        return compute_rollup_analytics(
+            stats,
+            TaskCategoryStats.breakdown(self.request.user.id, params.get('role')),
+            aggregate_due_today_by_role(tasks, now=now)
+        )
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Full-text search: ``?q=`` terms all match, the last as a prefix.
+        Accepts the list filters (role, status, ...); ``comments=true``
+        also matches comment content. Ordered by relevance, paged by number."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'A search query is required'})
+        if self.paginator and self.paginator.cursor_query_param in request.query_params:
+            # Keyset pages follow (created_at, id), not relevance
+            raise ValidationError({'cursor': 'Search results are paged by page number'})
+        include_comments = request.query_params.get('comments', '').lower() in ('1', 'true')
+        tasks = search_tasks(self.get_queryset(), query, include_comments=include_comments)
+
+        rows = FastTaskListSerializer.values(tasks, 'search_rank')
+        page = self.paginate_queryset(rows)
+        data = FastTaskListSerializer(page if page is not None else rows).data
+        for item, row in zip(data, page if page is not None else rows):
+            item['rank'] = row['search_rank']
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def by_day(self, request):
+        """Tasks in a start_date/end_date window bucketed per calendar day."""
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        if not start_date or not end_date:
+            raise ValidationError({'detail': 'start_date and end_date are required'})
+        start = parse_date_bound('start_date', start_date)
+        end = parse_date_bound('end_date', end_date, end=True)
+        if end <= start or end - start > timedelta(days=MAX_DAY_WINDOW):
+            raise ValidationError({'detail': f'The window must span 1 to {MAX_DAY_WINDOW} days'})
+
+        date_field = request.query_params.get('date_field', 'due_date')
+        tasks = self.get_queryset()
+        if not request.query_params.get('ordering'):
+            tasks = tasks.order_by(date_field, 'id')
+        tasks = list(tasks)
+
+        # Bucket in the time zone the client expressed its window in
+        tz = start.tzinfo
+        first_day = timezone.localdate(start, tz)
+        last_day = timezone.localdate(end - timedelta(microseconds=1), tz)
+        days = {
+            first_day + timedelta(days=offset): []
+            for offset in range((last_day - first_day).days + 1)
+        }
+        for task, data in zip(tasks, TaskListSerializer(tasks, many=True).data):
+            if date_field == 'scheduled_date':
+                day = task.scheduled_date
             else:
-                task.complete()
-            serializer = self.get_serializer(task)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response(
-                {'error': str(e)}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+                day = timezone.localdate(task.due_date, tz)
+            if day in days:
+                days[day].append(data)
+
+        return Response([
+            {'date': day.isoformat(), 'tasks': day_tasks}
+            for day, day_tasks in days.items()
+        ])
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """Top ``limit`` open tasks per Eisenhower quadrant, plus per-quadrant totals.
+
+        With ``include_completed=true`` completed tasks are ranked after the
+        open ones and counted in the totals.
+        """
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), MAX_BOARD_LIMIT)
+        except ValueError:
+            raise ValidationError({'limit': 'Expected an integer'})
+        include_completed = request.query_params.get('include_completed', '').lower() in ('1', 'true')
+
+        tasks = self.get_queryset().filter(quadrant__isnull=False)
+        order_by = [F('priority').asc(), F('due_date').asc(nulls_last=True), F('id').asc()]
+        if include_completed:
+            order_by.insert(0, F('is_completed').asc())
+        else:
+            tasks = tasks.filter(is_completed=False)
+        partition = {'partition_by': [F('quadrant')]}
+        ranked = (tasks
+                  .annotate(
+                      quadrant_rank=Window(RowNumber(), order_by=order_by, **partition),
+                      quadrant_total=Window(Count('id'), **partition),
+                  )
+                  .filter(quadrant_rank__lte=limit)
+                  .order_by('quadrant', 'quadrant_rank'))
+        tasks = list(ranked)
+
+        board = {quadrant: {'count': 0, 'tasks': []} for quadrant in QUADRANT_KEYS}
+        for task, data in zip(tasks, TaskListSerializer(tasks, many=True).data):
+            board[task.quadrant]['count'] = task.quadrant_total
+            board[task.quadrant]['tasks'].append(data)
+        return Response(board)
 
     @action(detail=False, methods=['get'])
+    @conditional_get
+    @cached_action('analytics')
     def analytics(self, request):
+        return self.analytics_response(request)
+
+    def analytics_response(self, request):
+        # The action without its validators and caching; tasks.async_views
+        # applies those itself
         try:
             tasks = self.get_queryset()
-            now = timezone.now()
-
-            # Basic counts
-            total_tasks = tasks.count() or 1
-            completed_tasks = tasks.filter(is_completed=True).count()
-            in_progress = tasks.filter(status='in_progress').count()
-            overdue = tasks.filter(
-                Q(due_date__lt=now) & 
-                Q(is_completed=False)
-            ).count()
-
-            # Priority stats
-            priority_stats = {
-                'high': tasks.filter(priority=1).count(),
-                'medium': tasks.filter(priority=2).count(),
-                'low': tasks.filter(priority=3).count()
-            }
-
-            # Role stats
-            role_stats = list(tasks.values('role__name')
-                             .annotate(count=Count('id'))
-                             .exclude(role__name__isnull=True))
-
-            # Quadrant stats
-            quadrant_counts = {
-                'q1': tasks.filter(quadrant='q1').count(),
-                'q2': tasks.filter(quadrant='q2').count(),
-                'q3': tasks.filter(quadrant='q3').count(),
-                'q4': tasks.filter(quadrant='q4').count()
-            }
-
-            # Calculate percentages
-            total_quadrant = sum(quadrant_counts.values()) or 1
-            quadrant_percentages = {
-                k: round((v / total_quadrant * 100), 1)
-                for k, v in quadrant_counts.items()
-            }
-
-            # Prepare response data
-            response_data = {
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'in_progress_tasks': in_progress,
-                'overdue_tasks': overdue,
-                'completion_rate': round((completed_tasks / total_tasks * 100), 1),
-                'by_priority': priority_stats,
-                'by_role': role_stats,
-                'by_quadrant': quadrant_counts,
-                'quadrant_percentages': quadrant_percentages,
-                'tasks': TaskListSerializer(tasks, many=True).data  # Use TaskListSerializer instead
-            }
+            response_data = self.compute_analytics(tasks)
+            if not self.summary_only():
+                response_data['tasks'] = FastTaskListSerializer(FastTaskListSerializer.values(tasks)).data
 
             return Response(response_data)
 
         except Exception as e:
-            print(f"Analytics Error: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.exception('Analytics failed for user %s', request.user.id)
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -189,7 +419,7 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return TaskComment.objects.filter(task__owner=self.request.user)
+        return TaskComment.objects.filter(task__owner=self.request.user).select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -217,7 +447,7 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
         task = self.get_object()
-        comments = task.comments.all()
+        comments = task.comments.select_related('author')
         serializer = TaskCommentSerializer(comments, many=True)
         return Response(serializer.data)
 
@@ -248,52 +478,9 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
     def analytics(self, request):
         try:
             tasks = self.get_queryset()
-            now = timezone.now()
-            total_tasks = tasks.count() or 1  # Prevent division by zero
-
-            # Calculate quadrant counts
-            q1_count = tasks.filter(quadrant='q1').count()
-            q2_count = tasks.filter(quadrant='q2').count()
-            q3_count = tasks.filter(quadrant='q3').count()
-            q4_count = tasks.filter(quadrant='q4').count()
-
-            # Calculate percentages
-            total_with_quadrant = max(q1_count + q2_count + q3_count + q4_count, 1)
-            q1_percentage = (q1_count / total_with_quadrant * 100)
-            q2_percentage = (q2_count / total_with_quadrant * 100)
-            q3_percentage = (q3_count / total_with_quadrant * 100)
-            q4_percentage = (q4_count / total_with_quadrant * 100)
-
-            completed_tasks = tasks.filter(is_completed=True).count()
-            in_progress_tasks = tasks.filter(status='in_progress').count()
-            overdue_tasks = tasks.filter(due_date__lt=now, is_completed=False).count()
-
-            analytics_data = {
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'in_progress_tasks': in_progress_tasks,
-                'overdue_tasks': overdue_tasks,
-                'completion_rate': (completed_tasks / total_tasks) * 100,
-                'by_priority': {
-                    'high': tasks.filter(priority=1).count(),
-                    'medium': tasks.filter(priority=2).count(),
-                    'low': tasks.filter(priority=3).count(),
-                },
-                'by_role': tasks.values('role__name').annotate(count=Count('id')),
-                'by_quadrant': {
-                    'q1': q1_count,
-                    'q2': q2_count,
-                    'q3': q3_count,
-                    'q4': q4_count,
-                },
-                'quadrant_percentages': {
-                    'q1': round(q1_percentage, 1),
-                    'q2': round(q2_percentage, 1),
-                    'q3': round(q3_percentage, 1),
-                    'q4': round(q4_percentage, 1),
-                },
-                'tasks': TaskSerializer(tasks, many=True).data
-            }
+            analytics_data = compute_task_analytics(tasks)
+            if request.query_params.get('summary', '').lower() not in ('1', 'true'):
+                analytics_data['tasks'] = TaskSerializer(tasks, many=True).data
 
             return Response(analytics_data)
         except Exception as e:
@@ -307,7 +494,33 @@ class TaskCommentViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return TaskComment.objects.filter(task__owner=self.request.user)
+        return TaskComment.objects.filter(task__owner=self.request.user).select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
+
+class SyncView(APIView):
+    """Delta sync: ``GET ?since=<cursor>`` returns the tasks, roles,
+    categories and comments changed since the cursor was issued and the ids
+    deleted since then. Without a cursor, or with one older than the
+    tombstone retention, everything is returned with ``full: true`` and
+    the client should replace its copy. Always store the returned cursor.
+    ``kinds=roles,categories`` limits the response to those collections.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        now = timezone.now()
+        kinds = parse_sync_kinds(request.query_params.get('kinds'))
+        version, _ = DataVersion.cached(request.user.id)
+        since = request.query_params.get('since')
+        if since:
+            since_version, since_moment = decode_sync_cursor(since)
+            if since_version == version:
+                # Nothing written since; answered without touching the database
+                return Response(empty_delta(since, kinds))
+            if since_moment < now - tombstone_retention():
+                since_moment = None
+        else:
+            since_moment = None
+        return Response(build_delta(request.user, version, now, since=since_moment, kinds=kinds))
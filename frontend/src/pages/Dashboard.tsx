@@ -41,7 +41,6 @@ import { taskService } from '../services/api';
 import { TaskAnalytics } from '../types/task';
 import { CheckCircleOutline, CheckCircle, Today as TodayIcon } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
-import { format, parseISO, isToday } from 'date-fns';
 import { useTheme } from '@mui/material/styles';
 
 const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042'];
@@ -73,8 +72,8 @@ const Dashboard: React.FC = () => {
     const handleToggleComplete = async (taskId: number) => {
         try {
             const response = await taskService.toggleTaskComplete(taskId);
-            // Update both task and analytics data
-            setAnalytics(response.analytics);
+            // Merge the changed counters into the current analytics
+            setAnalytics(prev => prev ? { ...prev, ...response.analytics } : prev);
         } catch (error) {
             console.error('Error toggling task completion:', error);
             setError('Failed to update task');
@@ -116,19 +115,19 @@ const Dashboard: React.FC = () => {
             {
                 name: 'High Priority',
                 tasks: analytics.by_priority.high,
-                completed: analytics.tasks.filter(t => t.priority === 1 && t.is_completed).length,
+                completed: analytics.completed_by_priority.high,
                 color: theme.palette.error.main
             },
             {
                 name: 'Medium Priority',
                 tasks: analytics.by_priority.medium,
-                completed: analytics.tasks.filter(t => t.priority === 2 && t.is_completed).length,
+                completed: analytics.completed_by_priority.medium,
                 color: theme.palette.warning.main
             },
             {
                 name: 'Low Priority',
                 tasks: analytics.by_priority.low,
-                completed: analytics.tasks.filter(t => t.priority === 3 && t.is_completed).length,
+                completed: analytics.completed_by_priority.low,
                 color: theme.palette.info.main
             }
         ];
@@ -184,39 +183,6 @@ const Dashboard: React.FC = () => {
     const chartData = getChartData();
     if (!chartData) return null;
 
-    // Add this helper function at the component level to get unique roles with their tasks
-    const getUniqueRolesWithTasks = (analytics: TaskAnalytics) => {
-        // Get unique roles
-        const uniqueRoles = Array.from(new Set(
-            analytics.by_role.map(role => role.role__name)
-        )).map(roleName => {
-            const roleData = analytics.by_role.find(r => r.role__name === roleName);
-            return {
-                role_id: roleData?.role_id || 0,
-                role__name: roleName,
-                count: roleData?.count || 0
-            };
-        });
-
-        // Get unique tasks for each role
-        const roleTasksMap = uniqueRoles.map(role => {
-            const uniqueTasks = Array.from(
-                new Map(
-                    analytics.tasks
-                        .filter(task => task.role_name === role.role__name)
-                        .map(task => [task.id, task])
-                ).values()
-            );
-
-            return {
-                ...role,
-                tasks: uniqueTasks
-            };
-        });
-
-        return roleTasksMap;
-    };
-
     return (
         <Container maxWidth="lg" sx={{ py: { xs: 2, sm: 3, md: 4 } }}>
             <Typography 
@@ -547,36 +513,12 @@ const Dashboard: React.FC = () => {
                         <Box sx={{ width: '100%', height: 'calc(100% - 60px)' }}>
                             <ResponsiveContainer width="100%" height={400}>
                                 <BarChart
-                                    data={analytics.tasks
-                                        .filter(task => task.due_date && isToday(parseISO(task.due_date)))
-                                        .reduce((acc, task) => {
-                                            const roleKey = task.role_name || 'Unassigned';
-                                            const existingRole = acc.find(item => item.name === roleKey);
-                                            
-                                            if (existingRole) {
-                                                existingRole.total += 1;
-                                                if (task.is_completed) existingRole.completed += 1;
-                                            } else {
-                                                acc.push({
-                                                    name: roleKey,
-                                                    total: 1,
-                                                    completed: task.is_completed ? 1 : 0,
-                                                    completionRate: 0
-                                                });
-                                            }
-                                            
-                                            return acc;
-                                        }, [] as Array<{
-                                            name: string;
-                                            total: number;
-                                            completed: number;
-                                            completionRate: number;
-                                        }>)
-                                        .map(item => ({
-                                            ...item,
-                                            completionRate: (item.completed / item.total) * 100
-                                        }))
-                                    }
+                                    data={analytics.due_today_by_role.map(role => ({
+                                        name: role.role__name || 'Unassigned',
+                                        total: role.total,
+                                        completed: role.completed,
+                                        completionRate: (role.completed / role.total) * 100
+                                    }))}
                                     margin={{ top: 20, right: 30, left: 20, bottom: 20 }}
                                 >
                                     <CartesianGrid strokeDasharray="3 3" />
@@ -692,8 +634,8 @@ const Dashboard: React.FC = () => {
                             Roles Overview
                         </Typography>
                         <Grid container spacing={{ xs: 3, sm: 4, md: 5 }}>
-                            {getUniqueRolesWithTasks(analytics).map((roleData, index) => {
-                                const taskCount = roleData.tasks.length;
+                            {analytics.by_role.map((roleData, index) => {
+                                const taskCount = roleData.count;
 
                                 return taskCount > 0 ? (
                                     <Grid item xs={12} sm={6} md={4} key={roleData.role_id}>
@@ -755,7 +697,7 @@ const Dashboard: React.FC = () => {
                                                         Completed
                                                     </Typography>
                                                     <Typography variant="h6" color="success.main">
-                                                        {roleData.tasks.filter(t => t.is_completed).length}
+                                                        {roleData.completed}
                                                     </Typography>
                                                 </Box>
                                                 <Box>
@@ -763,7 +705,7 @@ const Dashboard: React.FC = () => {
                                                         In Progress
                                                     </Typography>
                                                     <Typography variant="h6" color="info.main">
-                                                        {roleData.tasks.filter(t => t.status === 'in_progress').length}
+                                                        {roleData.in_progress}
                                                     </Typography>
                                                 </Box>
                                                 <Box>
@@ -771,7 +713,7 @@ const Dashboard: React.FC = () => {
                                                         Pending
                                                     </Typography>
                                                     <Typography variant="h6" color="warning.main">
-                                                        {roleData.tasks.filter(t => t.status === 'not_started').length}
+                                                        {roleData.not_started}
                                                     </Typography>
                                                 </Box>
                                             </Box>
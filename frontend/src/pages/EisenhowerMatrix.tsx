@@ -21,14 +21,16 @@ import {
 } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
 import { taskService } from '../services/api';
-import { Task } from '../types/task';
+import { EisenhowerBoard, Task } from '../types/task';
 import { ResponsiveContainer, PieChart, Pie, Cell, Legend } from 'recharts';
 
 interface QuadrantBoxProps {
     title: string;
     description: string;
     tasks: Task[];
+    total: number;
     quadrant: string;
+    onShowAll: (quadrant: string) => void;
     onMoveTask: (taskId: number, newQuadrant: string) => void;
     onDeleteTask: (taskId: number) => void;
 }
@@ -37,7 +39,9 @@ const QuadrantBox: React.FC<QuadrantBoxProps> = ({
     title,
     description,
     tasks,
+    total,
     quadrant,
+    onShowAll,
     onMoveTask,
     onDeleteTask
 }) => (
@@ -80,6 +84,7 @@ const QuadrantBox: React.FC<QuadrantBoxProps> = ({
             }>
                 {title}
             </Typography>
+            <Chip label={total} size="small" variant="outlined" />
         </Box>
         <Typography variant="body2" color="textSecondary" sx={{ mb: 2 }}>
             {description}
@@ -172,11 +177,30 @@ const QuadrantBox: React.FC<QuadrantBoxProps> = ({
                 </Typography>
             )}
         </Box>
+        {tasks.length < total && (
+            <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mt: 1 }}>
+                <Typography variant="caption" color="textSecondary">
+                    Showing {tasks.length} of {total}
+                </Typography>
+                <Button size="small" onClick={() => onShowAll(quadrant)}>
+                    Show all
+                </Button>
+            </Box>
+        )}
     </Paper>
 );
 
+const emptyBoard = (): EisenhowerBoard => ({
+    q1: { count: 0, tasks: [] },
+    q2: { count: 0, tasks: [] },
+    q3: { count: 0, tasks: [] },
+    q4: { count: 0, tasks: [] }
+});
+
 const EisenhowerMatrix: React.FC = () => {
-    const [tasks, setTasks] = useState<Task[]>([]);
+    const [board, setBoard] = useState<EisenhowerBoard>(emptyBoard);
+    // Quadrants the user expanded past the board's top tasks
+    const [expanded, setExpanded] = useState<string[]>([]);
     const [loading, setLoading] = useState(true);
     const navigate = useNavigate();
 
@@ -187,11 +211,11 @@ const EisenhowerMatrix: React.FC = () => {
     const fetchTasks = async () => {
         try {
             setLoading(true);
-            const response = await taskService.getTasks();
-            if (Array.isArray(response.data)) {
-                console.log('Fetched tasks:', response.data);
-                setTasks(response.data);
-            }
+            const next = await taskService.getBoard();
+            await Promise.all(expanded.map(async (quadrant) => {
+                next[quadrant as keyof EisenhowerBoard] = await fetchQuadrant(quadrant);
+            }));
+            setBoard(next);
         } catch (error) {
             console.error('Error fetching tasks:', error);
         } finally {
@@ -199,18 +223,25 @@ const EisenhowerMatrix: React.FC = () => {
         }
     };
 
-    const quadrantTasks = React.useMemo(() => ({
-        q1: tasks.filter(task => task.quadrant === 'q1'),
-        q2: tasks.filter(task => task.quadrant === 'q2'),
-        q3: tasks.filter(task => task.quadrant === 'q3'),
-        q4: tasks.filter(task => task.quadrant === 'q4')
-    }), [tasks]);
+    // Every task of one quadrant, open ones first as on the board
+    const fetchQuadrant = async (quadrant: string) => {
+        const { data } = await taskService.getAllTasks({ quadrant, ordering: 'priority,due_date' });
+        const tasks = [...data.filter(task => !task.is_completed), ...data.filter(task => task.is_completed)];
+        return { count: tasks.length, tasks };
+    };
 
-    const handleMoveTask = async (taskId: number, newQuadrant: string) => {
+    const handleShowAll = async (quadrant: string) => {
         try {
-            const task = tasks.find(t => t.id === taskId);
-            if (!task) return;
+            const quadrantBoard = await fetchQuadrant(quadrant);
+            setBoard(prev => ({ ...prev, [quadrant]: quadrantBoard }));
+            setExpanded(prev => (prev.includes(quadrant) ? prev : [...prev, quadrant]));
+        } catch (error) {
+            console.error('Error fetching quadrant tasks:', error);
+        }
+    };
 
+    const handleMoveTask = async (taskId: number, newQuadrant: string) => {
+        try {
             await taskService.updateTask(taskId, {
                 quadrant: newQuadrant
             });
@@ -259,8 +290,10 @@ const EisenhowerMatrix: React.FC = () => {
                     <QuadrantBox
                         title="Urgent & Important"
                         description="Do these tasks immediately"
-                        tasks={quadrantTasks.q1}
+                        tasks={board.q1.tasks}
+                        total={board.q1.count}
                         quadrant="q1"
+                        onShowAll={handleShowAll}
                         onMoveTask={handleMoveTask}
                         onDeleteTask={handleDeleteTask}
                     />
@@ -269,8 +302,10 @@ const EisenhowerMatrix: React.FC = () => {
                     <QuadrantBox
                         title="Not Urgent & Important"
                         description="Schedule these tasks"
-                        tasks={quadrantTasks.q2}
+                        tasks={board.q2.tasks}
+                        total={board.q2.count}
                         quadrant="q2"
+                        onShowAll={handleShowAll}
                         onMoveTask={handleMoveTask}
                         onDeleteTask={handleDeleteTask}
                     />
@@ -279,8 +314,10 @@ const EisenhowerMatrix: React.FC = () => {
                     <QuadrantBox
                         title="Urgent & Not Important"
                         description="Delegate these tasks"
-                        tasks={quadrantTasks.q3}
+                        tasks={board.q3.tasks}
+                        total={board.q3.count}
                         quadrant="q3"
+                        onShowAll={handleShowAll}
                         onMoveTask={handleMoveTask}
                         onDeleteTask={handleDeleteTask}
                     />
@@ -289,8 +326,10 @@ const EisenhowerMatrix: React.FC = () => {
                     <QuadrantBox
                         title="Not Urgent & Not Important"
                         description="Eliminate these tasks"
-                        tasks={quadrantTasks.q4}
+                        tasks={board.q4.tasks}
+                        total={board.q4.count}
                         quadrant="q4"
+                        onShowAll={handleShowAll}
                         onMoveTask={handleMoveTask}
                         onDeleteTask={handleDeleteTask}
                     />
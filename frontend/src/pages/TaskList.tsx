@@ -130,12 +130,12 @@ const TaskList: React.FC = () => {
         try {
             const weekFilters = {
                 ...filters,
-                start_date: format(weekStart, 'yyyy-MM-dd'),
-                end_date: format(weekEnd, 'yyyy-MM-dd')
+                start_date: startOfWeek(weekStart, { weekStartsOn: 1 }).toISOString(),
+                end_date: endOfWeek(weekEnd, { weekStartsOn: 1 }).toISOString()
             };
 
             const [tasksRes, rolesRes, categoriesRes] = await Promise.all([
-                taskService.getTasks(weekFilters),
+                taskService.getAllTasks(weekFilters),
                 taskService.getRoles(),
                 taskService.getCategories(),
             ]);
@@ -163,21 +163,10 @@ const TaskList: React.FC = () => {
         }
     };
 
-    const handleFilterChange = async (event: React.ChangeEvent<HTMLInputElement>) => {
+    const handleFilterChange = (event: React.ChangeEvent<HTMLInputElement>) => {
         const { name, value } = event.target;
-        const newFilters = { ...filters, [name]: value };
-        setFilters(newFilters);
-        
-        try {
-            setLoading(true);
-            const response = await taskService.getTasks(newFilters);
-            setTasks(response.data);
-        } catch (error) {
-            console.error('Error fetching tasks:', error);
-            setError('Failed to fetch tasks');
-        } finally {
-            setLoading(false);
-        }
+        // fetchData reloads the week's tasks when the filters change
+        setFilters({ ...filters, [name]: value });
     };
 
     const handleStatusChange = async (taskId: number, newStatus: string) => {
@@ -218,9 +207,6 @@ const TaskList: React.FC = () => {
                 'Task marked as incomplete' : 
                 'Task marked as complete!'
             );
-
-            // Refresh the task list to ensure consistency
-            fetchData();
         } catch (error: any) {
             console.error('Error toggling task completion:', error);
             setError(error.response?.data?.detail || 'Failed to update task status');
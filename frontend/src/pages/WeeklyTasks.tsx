@@ -22,8 +22,8 @@ import { LocalizationProvider } from '@mui/x-date-pickers/LocalizationProvider';
 import { DateCalendar } from '@mui/x-date-pickers/DateCalendar';
 import { DateTimePicker } from '@mui/x-date-pickers/DateTimePicker';
 import { taskService } from '../services/api';
-import { Task, Role } from '../types/task';
-import { format, startOfWeek, addDays, parseISO } from 'date-fns';
+import { Task, TaskDay, Role } from '../types/task';
+import { format, startOfWeek, endOfWeek, addDays } from 'date-fns';
 import { 
     Add as AddIcon, 
     Delete as DeleteIcon, 
@@ -43,7 +43,7 @@ interface NewTask {
 
 const WeeklyTasks: React.FC = () => {
     const [selectedDate, setSelectedDate] = useState<Date>(new Date());
-    const [tasks, setTasks] = useState<Task[]>([]);
+    const [days, setDays] = useState<TaskDay[]>([]);
     const [roles, setRoles] = useState<Role[]>([]);
     const [openDialog, setOpenDialog] = useState(false);
     const [weekDays, setWeekDays] = useState<Date[]>([]);
@@ -69,17 +69,20 @@ const WeeklyTasks: React.FC = () => {
     const fetchData = async () => {
         try {
             setLoading(true);
-            const [tasksRes, rolesRes] = await Promise.all([
-                taskService.getTasks(),
+            // Local times with their offset, so the server buckets by our days
+            const bound = "yyyy-MM-dd'T'HH:mm:ss.SSSxxx";
+            const [taskDays, rolesRes] = await Promise.all([
+                taskService.getTasksByDay(
+                    format(startOfWeek(selectedDate), bound),
+                    format(endOfWeek(selectedDate), bound)
+                ),
                 taskService.getRoles(),
             ]);
-            const tasksData = Array.isArray(tasksRes.data) ? tasksRes.data : [];
-            console.log('Fetched tasks:', tasksData);
-            setTasks(tasksData);
+            setDays(taskDays);
             setRoles(rolesRes.data);
         } catch (error) {
             console.error('Error fetching data:', error);
-            setTasks([]);
+            setDays([]);
             setRoles([]);
         } finally {
             setLoading(false);
@@ -119,8 +122,11 @@ const WeeklyTasks: React.FC = () => {
 
     const handleToggleComplete = async (taskId: number) => {
         try {
-            await taskService.toggleTaskComplete(taskId);
-            fetchData();
+            const { task } = await taskService.toggleTaskComplete(taskId);
+            setDays(prevDays => prevDays.map(day => ({
+                ...day,
+                tasks: day.tasks.map(t => (t.id === taskId ? task : t))
+            })));
         } catch (error) {
             console.error('Error toggling task completion:', error);
         }
@@ -136,15 +142,8 @@ const WeeklyTasks: React.FC = () => {
     };
 
     const getTasksForDay = (date: Date) => {
-        if (!Array.isArray(tasks)) {
-            console.error('Tasks is not an array:', tasks);
-            return [];
-        }
-        return tasks.filter(task => {
-            if (!task.due_date) return false;
-            const taskDate = new Date(task.due_date);
-            return format(taskDate, 'yyyy-MM-dd') === format(date, 'yyyy-MM-dd');
-        });
+        const key = format(date, 'yyyy-MM-dd');
+        return days.find(day => day.date === key)?.tasks ?? [];
     };
 
     const handleMoveTask = async (task: Task, targetDate: Date) => {
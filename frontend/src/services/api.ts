@@ -1,5 +1,6 @@
 import axios, { AxiosError } from 'axios';
-import { Role, Task, TaskCategory, TaskAnalytics, User } from '../types/task';
+import { Role, Task, TaskCategory, TaskAnalytics, EisenhowerBoard, SyncDelta, TaskDay, TaskSearchPage, TaskToggleResult, User } from '../types/task';
+import { createSyncStore } from './sync';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000/api';
 
@@ -32,22 +33,21 @@ api.interceptors.response.use(
     }
 );
 
-interface ApiResponse<T> {
-    data: T[];
-    results: T[];
-    count?: number;
-    next?: string | null;
-    previous?: string | null;
-}
+// Roles and categories are read from a local copy refreshed via delta
+// sync; tasks are paginated through getTasks and aren't synced
+export const syncStore = createSyncStore(['roles', 'categories'], async (since, kinds) => {
+    const response = await api.get<SyncDelta>('/tasks/sync/', {
+        params: { kinds: kinds.join(','), ...(since ? { since } : {}) }
+    });
+    return response.data;
+});
 
 export const taskService = {
     // Roles
     getRoles: async () => {
         try {
-            const response = await api.get<ApiResponse<Role>>('/tasks/roles/');
-            return {
-                data: response.data.results || response.data || []
-            };
+            const { roles } = await syncStore.sync();
+            return { data: roles ?? [] };
         } catch (error) {
             console.error('Error fetching roles:', error);
             return { data: [] };
@@ -78,7 +78,54 @@ export const taskService = {
             return { data: [] };
         }
     },
+    // Every task matching filters: follows the list's next links rather
+    // than stopping at the first page
+    getAllTasks: async (filters?: Record<string, string>) => {
+        const tasks: Task[] = [];
+        let url: string | null = '/tasks/tasks/';
+        // The next links carry these on to later pages
+        let params: Record<string, string> | undefined = {
+            ordering: 'due_date',
+            ...filters,
+            page_size: '100',
+            count: 'false'
+        };
+        while (url) {
+            const response: { data: { results: Task[]; next: string | null } } = await api.get(url, { params });
+            tasks.push(...response.data.results);
+            url = response.data.next;
+            params = undefined;
+        }
+        return { data: tasks };
+    },
+    // Ranked full-text search; filters are the same as getTasks (role, status, ...)
+    searchTasks: async (q: string, filters?: Record<string, string>, includeComments = false) => {
+        const response = await api.get<TaskSearchPage>('/tasks/tasks/search/', {
+            params: {
+                ...filters,
+                q,
+                ...(includeComments ? { comments: 'true' } : {})
+            }
+        });
+        return response.data;
+    },
+    // Every task due in [start, end] grouped per day, empty days included;
+    // unpaginated, so the window is limited to 62 days
+    getTasksByDay: async (start: string, end: string, filters?: Record<string, string>) => {
+        const response = await api.get<TaskDay[]>('/tasks/tasks/by_day/', {
+            params: { ...filters, start_date: start, end_date: end }
+        });
+        return response.data;
+    },
     getTask: (id: number) => api.get(`/tasks/tasks/${id}/`),
+    // Top tasks per quadrant with each quadrant's total; completed tasks
+    // rank after open ones when included
+    getBoard: async (limit = 50, includeCompleted = true) => {
+        const response = await api.get<EisenhowerBoard>('/tasks/tasks/board/', {
+            params: { limit, ...(includeCompleted ? { include_completed: 'true' } : {}) }
+        });
+        return response.data;
+    },
     createTask: async (data: Partial<Task>) => {
         try {
             const taskData: any = { ...data };
@@ -141,7 +188,9 @@ export const taskService = {
     },
     getAnalytics: async () => {
         try {
-            const response = await api.get<TaskAnalytics>('/tasks/tasks/analytics/');
+            const response = await api.get<TaskAnalytics>('/tasks/tasks/analytics/', {
+                params: { summary: true }
+            });
             console.log('Raw analytics response:', response); // Debug log
             return response;
         } catch (error) {
@@ -153,10 +202,8 @@ export const taskService = {
     // Categories
     getCategories: async () => {
         try {
-            const response = await api.get<ApiResponse<TaskCategory>>('/tasks/categories/');
-            return {
-                data: response.data.data || []
-            };
+            const { categories } = await syncStore.sync();
+            return { data: categories ?? [] };
         } catch (error) {
             console.error('Error fetching categories:', error);
             return { data: [] };
@@ -176,27 +223,10 @@ export const taskService = {
 
     toggleTaskComplete: async (id: number) => {
         try {
-            // First get the current task state
-            const currentTask = await api.get<Task>(`/tasks/tasks/${id}/`);
-            
-            // Prepare update data while preserving existing task data
-            const updateData = {
-                ...currentTask.data,  // Keep all existing task data
-                is_completed: !currentTask.data.is_completed,
-                completed_at: !currentTask.data.is_completed ? new Date().toISOString() : null,
-                status: !currentTask.data.is_completed ? 'completed' : 'not_started'
-            };
-
-            const response = await api.patch<Task>(`/tasks/tasks/${id}/`, updateData);
-            
-            // After successful update, fetch fresh analytics
-            const analyticsResponse = await api.get<TaskAnalytics>('/tasks/tasks/analytics/');
-            
-            // Return both updated task and analytics
-            return {
-                task: response.data,
-                analytics: analyticsResponse.data
-            };
+            // The server flips completion atomically and returns the updated
+            // task with the analytics counters that changed
+            const response = await api.post<TaskToggleResult>(`/tasks/tasks/${id}/toggle_complete/`);
+            return response.data;
         } catch (error: any) {
             console.error('Error toggling task completion:', error.response?.data || error.message);
             throw error;
@@ -0,0 +1,73 @@
+import { SyncCollection, SyncDelta, SyncSnapshot } from '../types/task';
+
+// The signed-in user's id from the access token's user_id claim; unlike
+// the token itself it stays the same across token refreshes
+const currentUserId = (): number | null => {
+    const token = localStorage.getItem('token');
+    try {
+        const payload = token?.split('.')[1];
+        if (!payload) return null;
+        const claims = JSON.parse(atob(payload.replace(/-/g, '+').replace(/_/g, '/')));
+        return typeof claims.user_id === 'number' ? claims.user_id : null;
+    } catch {
+        return null;
+    }
+};
+
+// In-memory copy of the user's collections of the given kinds kept current
+// through the delta sync endpoint: the first call downloads all of them,
+// later calls only what changed (usually nothing) since the stored cursor.
+export const createSyncStore = (
+    kinds: SyncCollection[],
+    fetchDelta: (since: string | null, kinds: SyncCollection[]) => Promise<SyncDelta>
+) => {
+    let cursor: string | null = null;
+    let owner: number | null = null;
+    let inflight: Promise<SyncSnapshot> | null = null;
+    const items = Object.fromEntries(
+        kinds.map(kind => [kind, new Map<number, { id: number }>()])
+    ) as Record<SyncCollection, Map<number, { id: number }>>;
+
+    const reset = () => {
+        cursor = null;
+        kinds.forEach(kind => items[kind].clear());
+    };
+
+    const apply = (delta: SyncDelta) => {
+        if (delta.full) {
+            reset();
+        }
+        kinds.forEach(kind => {
+            (delta[kind] ?? []).forEach(item => items[kind].set(item.id, item));
+            (delta.deleted[kind] ?? []).forEach(id => items[kind].delete(id));
+        });
+        cursor = delta.cursor;
+    };
+
+    const snapshot = () => Object.fromEntries(
+        kinds.map(kind => [kind, Array.from(items[kind].values())])
+    ) as unknown as SyncSnapshot;
+
+    return {
+        sync: (): Promise<SyncSnapshot> => {
+            // A different login must not see the previous user's data
+            const userId = currentUserId();
+            if (userId !== owner) {
+                reset();
+                owner = userId;
+            }
+            if (!inflight) {
+                inflight = fetchDelta(cursor, kinds)
+                    .then(delta => {
+                        apply(delta);
+                        return snapshot();
+                    })
+                    .finally(() => {
+                        inflight = null;
+                    });
+            }
+            return inflight;
+        },
+        reset,
+    };
+};
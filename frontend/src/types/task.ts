@@ -43,6 +43,34 @@ export interface Task {
     actual_hours: number;
 }
 
+export interface TaskSearchResult extends Task {
+    rank: number;
+}
+
+export interface TaskSearchPage {
+    count: number;
+    next: string | null;
+    previous: string | null;
+    results: TaskSearchResult[];
+}
+
+export interface TaskDay {
+    date: string;
+    tasks: Task[];
+}
+
+export interface QuadrantBoard {
+    count: number;
+    tasks: Task[];
+}
+
+export interface EisenhowerBoard {
+    q1: QuadrantBoard;
+    q2: QuadrantBoard;
+    q3: QuadrantBoard;
+    q4: QuadrantBoard;
+}
+
 export interface TaskComment {
     id: number;
     task: number;
@@ -56,6 +84,22 @@ interface RoleAnalytics {
     role__name: string;
     role_id: number;
     count: number;
+    completed: number;
+    in_progress: number;
+    not_started: number;
+}
+
+interface CategoryAnalytics {
+    category__name: string;
+    category_id: number;
+    count: number;
+}
+
+interface RoleDueTodayAnalytics {
+    role__name: string;
+    role_id: number;
+    total: number;
+    completed: number;
 }
 
 export interface TaskAnalytics {
@@ -69,7 +113,14 @@ export interface TaskAnalytics {
         medium: number;
         low: number;
     };
+    completed_by_priority: {
+        high: number;
+        medium: number;
+        low: number;
+    };
     by_role: RoleAnalytics[];
+    by_category: CategoryAnalytics[];
+    due_today_by_role: RoleDueTodayAnalytics[];
     by_quadrant: {
         q1: number;
         q2: number;
@@ -82,5 +133,39 @@ export interface TaskAnalytics {
         q3: number;
         q4: number;
     };
-    tasks: Task[];
-} 
\ No newline at end of file
+    tasks?: Task[];
+} 
+
+// Counters returned by toggle_complete; merge them into the last TaskAnalytics
+export type ToggleAnalytics = Pick<
+    TaskAnalytics,
+    'total_tasks' | 'completed_tasks' | 'in_progress_tasks' | 'overdue_tasks' |
+    'completion_rate' | 'completed_by_priority' | 'by_role' | 'due_today_by_role'
+>;
+
+export interface TaskToggleResult {
+    task: Task;
+    analytics: ToggleAnalytics;
+}
+
+export type SyncCollection = 'tasks' | 'roles' | 'categories' | 'comments';
+
+// Response of GET /tasks/sync/?since=<cursor>&kinds=<kinds>; only the
+// requested kinds are present
+export interface SyncDelta {
+    cursor: string;
+    full: boolean;
+    tasks?: Task[];
+    roles?: Role[];
+    categories?: TaskCategory[];
+    comments?: TaskComment[];
+    deleted: Partial<Record<SyncCollection, number[]>>;
+}
+
+// The synced kinds of a sync store
+export interface SyncSnapshot {
+    tasks?: Task[];
+    roles?: Role[];
+    categories?: TaskCategory[];
+    comments?: TaskComment[];
+}